@@ -0,0 +1,264 @@
+"""
+Exportul actelor parsate în JSON, CSV și NDJSON
+Alternativa la raportul HTML pentru instrumentele care prelucrează actele:
+înregistrările sunt scrise pe măsură ce monitoarele sunt parsate, doar cu
+câmpurile cerute (implicit fără text_complet, al cărui text nu mai e nici decodat).
+Actele unui monitor sunt codificate pe coloane (act_columns): fiecare câmp
+e convertit într-o singură trecere, iar înregistrările sunt compuse dintr-un
+număr constant de operații pe coloană, fără un dict și un json.dumps per act.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from json.encoder import encode_basestring
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from mo_parser_v4 import ACT_FIELDS, Act, act_columns
+
+# Câmpurile exportabile: cele ale actului, plus toate operațiunile (id-uri, cea principală prima)
+EXPORT_FIELDS = ACT_FIELDS + ('operatiuni',)
+# Câmpurile implicite: toate, fără textul actului (de câteva ori mai mare decât restul înregistrării)
+DEFAULT_EXPORT_FIELDS = tuple(name for name in EXPORT_FIELDS if name != 'text_complet')
+# Separatorul valorilor din listele unei celule CSV
+CSV_LIST_SEPARATOR = ';'
+
+# Tipul valorilor fiecărui câmp; restul sunt text
+_INTS = frozenset({'nr_act', 'nr_monitor', 'rank', 'ca', 'operatiuni_mask'})
+_BOOLS = frozenset({'in_top', 'is_noise', 'is_high_interest'})
+_OPTIONAL_TEXT = frozenset({'cui', 'nr_orc', 'euid'})
+_INT_LISTS = frozenset({'capital_social'})
+_TEXT_LISTS = frozenset({'date_mentionate', 'operatiuni'})
+# Câmpurile codificate direct, fără tabel de valori: cele cu valori aproape mereu
+# distincte și cele bool (codificarea lor e deja o căutare într-un dict)
+_DIRECT = frozenset({'nr_act', 'denumire', 'text_complet'}) | _BOOLS
+_JSON_BOOLS = {True: 'true', False: 'false'}
+# Caracterele pentru care csv.writer pune o celulă între ghilimele
+_CSV_SPECIAL = re.compile(r'[",\r\n]')
+
+
+def parse_fields(spec: Optional[str]) -> Tuple[str, ...]:
+    """Câmpurile din `fields=a,b,c` (DEFAULT_EXPORT_FIELDS, dacă lipsește); ValueError pentru câmpuri necunoscute."""
+    if not spec:
+        return DEFAULT_EXPORT_FIELDS
+    fields = tuple(name.strip() for name in spec.split(',') if name.strip())
+    unknown = [name for name in fields if name not in EXPORT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Câmpuri necunoscute: {', '.join(unknown) or '(niciunul)'}; "
+                         f"disponibile: {', '.join(EXPORT_FIELDS)}")
+    return fields
+
+
+def _json_text_list(values: Tuple[str, ...]) -> str:
+    return '[' + ','.join(map(encode_basestring, values)) + ']'
+
+
+def _json_encoder(name: str) -> Callable[[object], str]:
+    """Codificarea JSON a valorilor câmpului (ca json.dumps cu ensure_ascii=False)."""
+    if name in _INTS:
+        return str
+    if name == 'scor_top':
+        return float.__repr__
+    if name in _BOOLS:
+        return _JSON_BOOLS.__getitem__
+    if name in _OPTIONAL_TEXT:
+        return lambda value: 'null' if value is None else encode_basestring(value)
+    if name in _INT_LISTS:
+        return lambda values: '[' + ','.join(map(str, values)) + ']'
+    if name in _TEXT_LISTS:
+        return _json_text_list
+    return encode_basestring
+
+
+def _csv_quote(text: str) -> str:
+    """Ca csv.writer (QUOTE_MINIMAL): între ghilimele doar dacă e nevoie."""
+    if _CSV_SPECIAL.search(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _csv_encoder(name: str) -> Callable[[object], str]:
+    """Celula CSV a valorilor câmpului: listele unite cu CSV_LIST_SEPARATOR, lipsă = celulă goală."""
+    if name in _INTS or name in _BOOLS or name == 'scor_top':
+        return str
+    if name in _INT_LISTS or name in _TEXT_LISTS:
+        return lambda values: _csv_quote(CSV_LIST_SEPARATOR.join(map(str, values)))
+    return lambda value: '' if value is None else _csv_quote(value)
+
+
+def _encode_column(name: str, column: list, encode: Callable[[object], str]) -> List[str]:
+    """
+    Coloana codificată; valorile care se repetă sunt codificate o singură dată.
+    Tabelul de valori costă mai mult decât câștigă dacă majoritatea valorilor sunt
+    distincte (CUI-uri, numere ORC), deci atunci coloana e codificată direct.
+    """
+    if name in _DIRECT:
+        return list(map(encode, column))
+    values = set(column)
+    if 2 * len(values) > len(column):
+        return list(map(encode, column))
+    table = dict(zip(values, map(encode, values)))
+    return list(map(table.__getitem__, column))
+
+
+def _interleave(columns: List[List[str]], separators: Sequence[str], end: str) -> str:
+    """
+    Înregistrările compuse din coloane deja codificate: separators[j] precede
+    valoarea din coloana j, `end` încheie înregistrarea. Bucățile sunt așezate
+    prin atribuiri pe slice-uri și unite o singură dată, fără o buclă per act.
+    """
+    count = len(columns[0])
+    step = 2 * len(columns) + 1
+    pieces = [end] * (count * step)
+    for j, column in enumerate(columns):
+        pieces[2 * j::step] = [separators[j]] * count
+        pieces[2 * j + 1::step] = column
+    return ''.join(pieces)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class ExportWriter(ABC):
+    """
+    Textul unui export, produs în bucăți: start(), apoi pentru fiecare monitor
+    acts() și monitor() (sau error() pentru un monitor neprocesat), apoi end().
+    """
+
+    mimetype = 'text/plain'
+    extension = 'txt'
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+
+    def start(self) -> str:
+        return ''
+
+    @abstractmethod
+    def acts(self, acts: List[Act]) -> str:
+        """Înregistrările actelor unui monitor."""
+
+    def monitor(self, info: dict) -> str:
+        return ''
+
+    def error(self, filename: str, message: str, skipped: bool = False) -> str:
+        return ''
+
+    def end(self) -> str:
+        return ''
+
+
+class _JsonRecords(ExportWriter):
+    """Actele ca obiecte JSON `{prefix"câmp":valoare,...}`, una după alta (fără separator între ele)."""
+
+    # Începutul fiecărei înregistrări și câmpurile puse înaintea celor cerute
+    opening = '{'
+    prefix = ''
+    end_record = '}'
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(fields)
+        keys = [encode_basestring(name) + ':' for name in self.fields]
+        self._separators = [self.opening + self.prefix + keys[0]] + [',' + key for key in keys[1:]]
+        self._encoders = [_json_encoder(name) for name in self.fields]
+
+    def _records(self, acts: List[Act]) -> str:
+        columns = act_columns(acts, self.fields)
+        encoded = [_encode_column(name, columns[name], encode) for name, encode in zip(self.fields, self._encoders)]
+        return _interleave(encoded, self._separators, self.end_record)
+
+
+class JsonWriter(_JsonRecords):
+    """Un obiect {"acts": [...], "monitors": [...], "errors": [...], "monitors_skipped": [...], "partial": ...}."""
+
+    mimetype = 'application/json'
+    extension = 'json'
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(fields)
+        self._first = True
+        self._monitors: List[dict] = []
+        self._errors: List[dict] = []
+        self._skipped: List[str] = []
+
+    def start(self) -> str:
+        return '{"acts":['
+
+    # Fiecare act e precedat de virgulă, cu excepția primului din export
+    opening = ',{'
+
+    def acts(self, acts: List[Act]) -> str:
+        if not acts:
+            return ''
+        text = self._records(acts)
+        if self._first:
+            self._first = False
+            return text[1:]
+        return text
+
+    def monitor(self, info: dict) -> str:
+        self._monitors.append(info)
+        return ''
+
+    def error(self, filename: str, message: str, skipped: bool = False) -> str:
+        self._errors.append({'filename': filename, 'error': message})
+        if skipped:
+            self._skipped.append(filename)
+        return ''
+
+    def end(self) -> str:
+        return (f'],"monitors":{_dumps(self._monitors)},"errors":{_dumps(self._errors)},'
+                f'"monitors_skipped":{_dumps(self._skipped)},"partial":{_dumps(bool(self._skipped))}}}\n')
+
+
+class NdjsonWriter(_JsonRecords):
+    """
+    Câte o linie per act ({"type": "act", ...}), apoi una per monitor
+    ({"type": "monitor", ...}) sau ({"type": "error", ...}), ca /analyze/batch.
+    """
+
+    mimetype = 'application/x-ndjson'
+    extension = 'ndjson'
+    prefix = '"type":"act",'
+    end_record = '}\n'
+
+    def acts(self, acts: List[Act]) -> str:
+        return self._records(acts) if acts else ''
+
+    def monitor(self, info: dict) -> str:
+        return _dumps({'type': 'monitor', **info}) + '\n'
+
+    def error(self, filename: str, message: str, skipped: bool = False) -> str:
+        return _dumps({'type': 'error', 'filename': filename, 'error': message, 'skipped': skipped}) + '\n'
+
+
+class CsvWriter(ExportWriter):
+    """
+    Un rând per act, cu antet; listele sunt unite cu CSV_LIST_SEPARATOR, iar
+    valorile lipsă sunt celule goale. Monitoarele neprocesate nu apar în CSV.
+    """
+
+    mimetype = 'text/csv'
+    extension = 'csv'
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(fields)
+        self._separators = [''] + [','] * (len(self.fields) - 1)
+        self._encoders = [_csv_encoder(name) for name in self.fields]
+
+    def start(self) -> str:
+        return ','.join(map(_csv_quote, self.fields)) + '\r\n'
+
+    def acts(self, acts: List[Act]) -> str:
+        if not acts:
+            return ''
+        columns = act_columns(acts, self.fields)
+        encoded = [_encode_column(name, columns[name], encode) for name, encode in zip(self.fields, self._encoders)]
+        if len(encoded) == 1:
+            # Un rând cu o singură celulă goală ar fi o linie goală
+            encoded[0] = [cell or '""' for cell in encoded[0]]
+        return _interleave(encoded, self._separators, '\r\n')
+
+
+EXPORT_FORMATS: Dict[str, type] = {'json': JsonWriter, 'csv': CsvWriter, 'ndjson': NdjsonWriter}
@@ -0,0 +1,189 @@
+"""
+Segmentarea monitoarelor în acte
+Antetele de companie sunt găsite de un tokenizer HTML incremental, în timp
+liniar: între antete se sare direct la următorul <strong> sau comentariu,
+tagurile și comentariile sunt delimitate cu find(), iar pozițiile deja citite
+nu mai sunt parcurse (nici când documentul vine pe bucăți), deci un upload
+malformat nu poate ține workerul ocupat mai mult decât unul corect.
+Un antet e un <strong> al cărui text, inclusiv cel din tagurile inline
+imbricate (<em>, <span>...), conține o formă juridică. Funcționează la fel
+peste str, bytes și mmap.
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Textul unui antet mai lung de atât nu e o denumire de companie
+MAX_HEADER_CHARS = 1000
+# Câte caractere de după '<' sunt citite pentru numele tagului
+MAX_TAG_NAME = 16
+
+# Tagurile care pot apărea în textul unui antet; oricare altul îl întrerupe
+INLINE_TAGS = frozenset({
+    'a', 'abbr', 'b', 'big', 'br', 'em', 'font', 'i', 'mark', 's', 'small',
+    'span', 'strike', 'sub', 'sup', 'u', 'wbr',
+})
+
+# Aceleași condiții ca în COMPANY_PATTERN: forma juridică după cel puțin un
+# caracter al denumirii, prefixul „Societatea” nu face parte din denumire
+_LEGAL_FORM = r'S\.R\.L\.|SRL|S\.A\.|SA|S\.C\.S\.|SCS'
+_SOCIETATEA = r'Societatea\s+'
+_TAG_NAME = r'(/?)([A-Za-z][A-Za-z0-9]*)'
+_TAG_START = r'/?[A-Za-z]|[!?]'
+# Următorul loc interesant din afara unui antet: un antet simplu (doar text,
+# recunoscut direct), un alt <strong> sau un comentariu. Textul e limitat și
+# posesiv, deci fiecare caracter e citit de un număr constant de ori.
+_NEXT_HEADER = rf'<strong>([^<]{{1,{MAX_HEADER_CHARS}}}+)</strong>|<(?:!--|strong(?=[\s>/]))'
+# Cât timp nu e găsit, sfârșitul bufferului poate conține un început de "<strong"
+_NEXT_HEADER_LOOKBACK = len('<strong')
+
+Text = Union[str, bytes]
+
+
+class _Syntax:
+    """Delimitatorii și expresiile, în varianta str sau bytes."""
+
+    def __init__(self, binary: bool):
+        encode = (lambda s: s.encode('ascii')) if binary else (lambda s: s)
+        self.lt, self.gt, self.comment, self.comment_end, self.space, self.empty = (
+            encode(s) for s in ('<', '>', '<!--', '-->', ' ', ''))
+        self.legal_form = re.compile(encode(_LEGAL_FORM), re.IGNORECASE)
+        self.societatea = re.compile(encode(_SOCIETATEA), re.IGNORECASE)
+        self.tag_name = re.compile(encode(_TAG_NAME))
+        self.tag_start = re.compile(encode(_TAG_START))
+        self.next_header = re.compile(encode(_NEXT_HEADER), re.IGNORECASE)
+        self.strong = encode('strong')
+        self.br = encode('br')
+        self.inline = frozenset(encode(tag) for tag in INLINE_TAGS)
+
+
+_STR = _Syntax(False)
+_BYTES = _Syntax(True)
+
+
+def header_company(header: Text) -> Optional[Text]:
+    """Denumirea din textul unui antet (fără „Societatea”), sau None dacă nu are formă juridică."""
+    syntax = _BYTES if isinstance(header, bytes) else _STR
+    prefix = syntax.societatea.match(header)
+    if prefix and syntax.legal_form.search(header, prefix.end() + 1):
+        return header[prefix.end():]
+    if syntax.legal_form.search(header, 1):
+        return header
+    return None
+
+
+class HeaderScanner:
+    """
+    Antetele de companie dintr-un document dat întreg sau pe bucăți.
+
+    scan(buf) continuă de unde a rămas și produce (început, sfârșit, denumire):
+    pozițiile <strong> și </strong> în buf și denumirea brută (str sau bytes,
+    ca buf). Fără `final`, se oprește înaintea unui tag încă incomplet; după ce
+    apelantul taie începutul bufferului, shift() mută pozițiile reținute.
+    """
+
+    def __init__(self, binary: bool = False):
+        self._syntax = _BYTES if binary else _STR
+        self.pos = 0
+        # Începutul <strong>-ului deschis, dacă există
+        self.header_start: Optional[int] = None
+        self._parts: List[Text] = []
+        self._length = 0
+        # Unde continuă căutarea sfârșitului unui tag / comentariu încă deschis
+        self._search_from = 0
+
+    def shift(self, offset: int) -> None:
+        self.pos -= offset
+        if self.header_start is not None:
+            self.header_start -= offset
+        self._search_from = max(self._search_from - offset, 0)
+
+    def _text(self, buf, start: int, stop: int) -> None:
+        if self.header_start is None or stop <= start:
+            return
+        self._length += stop - start
+        if self._length > MAX_HEADER_CHARS:
+            self._drop()
+        else:
+            self._parts.append(buf[start:stop])
+
+    def _drop(self) -> None:
+        self.header_start = None
+        self._parts = []
+        self._length = 0
+
+    def scan(self, buf, final: bool = False) -> Iterator[Tuple[int, int, Text]]:
+        syntax = self._syntax
+        end = len(buf)
+        pos = self.pos
+        while pos < end:
+            if self.header_start is None:
+                match = syntax.next_header.search(buf, pos)
+                if match is None:
+                    pos = end if final else max(pos, end - _NEXT_HEADER_LOOKBACK)
+                    break
+                if match.group(1) is not None:
+                    pos = match.end()
+                    company = header_company(match.group(1))
+                    if company is not None:
+                        self.pos = pos
+                        yield match.start(), pos, company
+                    continue
+                lt = match.start()
+            else:
+                lt = buf.find(syntax.lt, pos)
+                if lt == -1:
+                    self._text(buf, pos, end)
+                    pos = end
+                    break
+                self._text(buf, pos, lt)
+            pos = lt
+            if lt + 4 > end and not final:
+                break
+            if buf[lt:lt + 4] == syntax.comment:
+                close = buf.find(syntax.comment_end, max(lt + 4, self._search_from))
+                if close == -1:
+                    if not final:
+                        self._search_from = max(lt + 4, end - 2)
+                        break
+                    pos = end
+                    break
+                self._search_from = 0
+                pos = close + 3
+                continue
+            if not syntax.tag_start.match(buf[lt + 1:lt + 3]):
+                # '<' care nu începe un tag ("a < b") e text
+                self._text(buf, lt, lt + 1)
+                pos = lt + 1
+                continue
+            gt = buf.find(syntax.gt, max(lt + 1, self._search_from))
+            if gt == -1:
+                if not final:
+                    self._search_from = end
+                    break
+                self._text(buf, lt, end)
+                pos = end
+                break
+            self._search_from = 0
+            pos = gt + 1
+            tag = syntax.tag_name.match(buf[lt + 1:min(gt, lt + 1 + MAX_TAG_NAME)])
+            if tag is None:
+                continue
+            closing, name = tag.group(1), tag.group(2).lower()
+            if name == syntax.strong:
+                if not closing:
+                    self._drop()
+                    self.header_start = lt
+                elif self.header_start is not None:
+                    start = self.header_start
+                    company = header_company(syntax.empty.join(self._parts))
+                    self._drop()
+                    if company is not None:
+                        self.pos = pos
+                        yield start, pos, company
+            elif self.header_start is not None:
+                if name not in syntax.inline:
+                    self._drop()
+                elif name == syntax.br:
+                    self._parts.append(syntax.space)
+        self.pos = pos
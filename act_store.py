@@ -0,0 +1,298 @@
+"""
+Arhiva actelor parsate (SQLite)
+Fiecare monitor procesat e salvat, cu actele lui, cheiat după (an, nr_monitor, nr_act):
+numerotarea MO IV reîncepe în fiecare an, deci anul publicării face parte din
+cheie. Astfel interogările pe perioade lungi ("majorările de capital ale companiilor TOP
+din trimestrul acesta") și rapoartele să nu mai ceară reuploadarea monitoarelor.
+Un monitor deja salvat, cu același conținut, nu mai e scris a doua oară.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import inspect
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from mo_parser_v4 import ACT_FIELDS, Act
+from patterns_relaxed import OPERATION_BITS
+
+# Fișierul arhivei; gol = arhiva dezactivată
+ACT_STORE_DB = os.environ.get('ACT_STORE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'acte.sqlite'))
+
+_ACT_FIELDS = list(ACT_FIELDS)
+_NR_MONITOR = _ACT_FIELDS.index('nr_monitor')
+# Câmpurile Act de tip listă sunt salvate ca JSON, cele bool ca 0/1
+_JSON_FIELDS = {'capital_social', 'date_mentionate'}
+_BOOL_FIELDS = {'in_top', 'is_noise', 'is_high_interest'}
+# Valorile implicite, pentru coloanele adăugate după ce actul a fost salvat
+_DEFAULTS = {
+    name: param.default for name, param in inspect.signature(Act).parameters.items()
+    if name in ACT_FIELDS and param.default is not param.empty
+}
+
+_INDEXES = {
+    'acte_cui': 'cui',
+    'acte_operatiune': 'tip_operatiune_id',
+    'acte_rank': 'rank',
+    'acte_categorie_ca': 'categorie_ca',
+    'acte_data': 'data_publicare',
+}
+# Câte rânduri citește iter_acts() dintr-o dată
+ITER_CHUNK_ROWS = 1000
+
+
+def _operation_bit(op_id: str) -> int:
+    if op_id not in OPERATION_BITS:
+        raise ValueError(f'operațiune necunoscută: {op_id}')
+    return OPERATION_BITS[op_id]
+
+
+# Filtrele acceptate de iter_acts() și count(): nume -> (condiție SQL, conversie)
+FILTERS = {
+    'cui': ('cui = ?', str),
+    'tip_operatiune_id': ('tip_operatiune_id = ?', str),
+    'operatiune': ('operatiuni_mask & ? != 0', _operation_bit),
+    'categorie_ca': ('categorie_ca = ?', str),
+    'nr_monitor': ('nr_monitor = ?', int),
+    'an': ('an = ?', int),
+    'in_top': ('in_top = ?', lambda v: int(str(v).lower() in ('1', 'true'))),
+    'is_high_interest': ('is_high_interest = ?', lambda v: int(str(v).lower() in ('1', 'true'))),
+    'rank_max': ('rank BETWEEN 1 AND ?', int),
+    'de_la': ('data_publicare >= ?', str),
+    'pana_la': ('data_publicare <= ?', str),
+}
+
+
+def iso_date(data_mo: str) -> str:
+    """'15.01.2026' -> '2026-01-15' (ordinea lexicografică = ordinea cronologică)."""
+    parts = data_mo.split('.')
+    if len(parts) != 3:
+        return ''
+    day, month, year = parts
+    return f'{year}-{int(month):02d}-{int(day):02d}'
+
+
+def publication_year(data_publicare: str) -> int:
+    """Anul dintr-o dată AAAA-LL-ZZ; 0 pentru monitoarele fără dată."""
+    return int(data_publicare[:4]) if data_publicare[:4].isdigit() else 0
+
+
+class ActStore:
+    """Monitoarele și actele salvate într-o bază SQLite, partajată de workeri."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = None
+        self._db_pid = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexiunea procesului curent (după fork se deschide alta)."""
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._migrate_year_key(db)
+            self._create_tables(db)
+            # Câmpuri adăugate în Act după crearea bazei
+            existing = {row[1] for row in db.execute('PRAGMA table_info(acte)')}
+            for name in _ACT_FIELDS:
+                if name not in existing:
+                    db.execute(f'ALTER TABLE acte ADD COLUMN {name}')
+            for index, column in _INDEXES.items():
+                db.execute(f'CREATE INDEX IF NOT EXISTS {index} ON acte({column})')
+            db.commit()
+            self._db = db
+            self._db_pid = os.getpid()
+        return self._db
+
+    @staticmethod
+    def _create_tables(db: sqlite3.Connection) -> None:
+        db.execute('CREATE TABLE IF NOT EXISTS monitoare ('
+                   'an INTEGER, nr_monitor INTEGER, data_mo TEXT, data_publicare TEXT, '
+                   'content_hash TEXT, nr_acte INTEGER, salvat REAL, PRIMARY KEY (an, nr_monitor))')
+        columns = ', '.join(_ACT_FIELDS)
+        db.execute(f'CREATE TABLE IF NOT EXISTS acte ({columns}, data_publicare TEXT, an INTEGER, '
+                   'PRIMARY KEY (an, nr_monitor, nr_act))')
+        db.execute('CREATE INDEX IF NOT EXISTS monitoare_hash ON monitoare(content_hash)')
+
+    def _migrate_year_key(self, db: sqlite3.Connection) -> None:
+        """
+        Bazele create când cheia era doar (nr_monitor, nr_act): tabelele sunt
+        refăcute cu anul din data publicării, o singură dată (primul worker).
+        """
+        def needs_migration() -> bool:
+            columns = {row[1] for row in db.execute('PRAGMA table_info(monitoare)')}
+            return bool(columns) and 'an' not in columns
+
+        if not needs_migration():
+            return
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            if needs_migration():
+                for table in ('monitoare', 'acte'):
+                    db.execute(f'ALTER TABLE {table} RENAME TO {table}_vechi')
+                self._create_tables(db)
+                year = "CAST(substr(data_publicare, 1, 4) AS INTEGER)"
+                db.execute(f'INSERT INTO monitoare SELECT {year}, nr_monitor, data_mo, data_publicare, '
+                           'content_hash, nr_acte, salvat FROM monitoare_vechi')
+                old = {row[1] for row in db.execute('PRAGMA table_info(acte_vechi)')}
+                columns = ', '.join(name for name in _ACT_FIELDS + ['data_publicare'] if name in old)
+                db.execute(f'INSERT INTO acte ({columns}, an) SELECT {columns}, {year} FROM acte_vechi')
+                db.execute('DROP TABLE acte_vechi')
+                db.execute('DROP TABLE monitoare_vechi')
+                print("[INFO] Arhiva de acte migrată: anul publicării face parte din cheia monitoarelor")
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+
+    def ingest(self, nr_monitor: int, data_mo: str, acts: List[Act], content_hash: str) -> bool:
+        """
+        Salvează monitorul și actele lui. Returnează False dacă monitorul era deja
+        salvat cu același conținut; un conținut nou îl înlocuiește pe cel vechi
+        din același an (monitorul cu același număr din alt an rămâne).
+        """
+        data_publicare = iso_date(data_mo)
+        with self._lock:
+            try:
+                return self._ingest(nr_monitor, data_mo, data_publicare, acts, content_hash)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Monitorul {nr_monitor} nu a putut fi salvat în arhivă: {e}")
+                return False
+
+    def _ingest(self, nr_monitor: int, data_mo: str, data_publicare: str, acts: List[Act], content_hash: str) -> bool:
+        db = self._connection()
+        year = publication_year(data_publicare)
+        row = db.execute('SELECT content_hash FROM monitoare WHERE an = ? AND nr_monitor = ?',
+                         (year, nr_monitor)).fetchone()
+        if row and row[0] == content_hash:
+            return False
+        if row:
+            print(f"[INFO] Monitorul {nr_monitor}/{year} din arhivă e înlocuit cu un conținut nou")
+        rows = []
+        for act in acts:
+            values = []
+            for name in _ACT_FIELDS:
+                value = getattr(act, name)
+                if name in _JSON_FIELDS:
+                    value = json.dumps(list(value))
+                elif name in _BOOL_FIELDS:
+                    value = int(value)
+                values.append(value)
+            values[_ACT_FIELDS.index('nr_monitor')] = nr_monitor
+            values += [data_publicare, year]
+            rows.append(values)
+        placeholders = ', '.join('?' * (len(_ACT_FIELDS) + 2))
+        with db:
+            db.execute('DELETE FROM acte WHERE an = ? AND nr_monitor = ?', (year, nr_monitor))
+            db.executemany(f'INSERT INTO acte ({", ".join(_ACT_FIELDS)}, data_publicare, an) '
+                           f'VALUES ({placeholders})', rows)
+            db.execute('INSERT OR REPLACE INTO monitoare (an, nr_monitor, data_mo, data_publicare, content_hash, '
+                       'nr_acte, salvat) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (year, nr_monitor, data_mo, data_publicare, content_hash, len(acts), time.time()))
+        return True
+
+    def _where(self, filters: Dict[str, str]) -> Tuple[str, list]:
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if name not in FILTERS or value in (None, ''):
+                continue
+            clause, convert = FILTERS[name]
+            clauses.append(clause)
+            params.append(convert(value))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _act(self, row: tuple) -> Act:
+        values = dict(zip(_ACT_FIELDS, row))
+        for name, default in _DEFAULTS.items():
+            if values[name] is None:
+                values[name] = default
+        for name in _JSON_FIELDS:
+            values[name] = json.loads(values[name]) if values[name] else []
+        for name in _BOOL_FIELDS:
+            values[name] = bool(values[name])
+        return Act(**values)
+
+    def _iter_rows(self, filters: Dict[str, str], limit: Optional[int] = None, offset: int = 0) -> Iterator[tuple]:
+        """
+        Rândurile actelor care îndeplinesc filtrele (câmpurile din ACT_FIELDS, apoi
+        anul), cronologic: după an, număr de monitor și număr de act.
+        Rândurile sunt citite câte ITER_CHUNK_ROWS, pe o conexiune proprie (WAL
+        permite citiri în paralel cu scrierile), deci memoria nu crește cu
+        arhiva și celelalte operații nu așteaptă după parcurgere.
+        """
+        where, params = self._where(filters)
+        sql = f'SELECT {", ".join(_ACT_FIELDS)}, an FROM acte{where} ORDER BY an, nr_monitor, nr_act'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+        with self._lock:
+            # Creează schema, dacă baza e nouă
+            self._connection()
+        db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        try:
+            cursor = db.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(ITER_CHUNK_ROWS)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            db.close()
+
+    def iter_acts(self, filters: Dict[str, str], limit: Optional[int] = None, offset: int = 0) -> Iterator[Act]:
+        """Actele care îndeplinesc filtrele (vezi FILTERS), cronologic (vezi _iter_rows)."""
+        for row in self._iter_rows(filters, limit, offset):
+            yield self._act(row)
+
+    def iter_monitors(self, filters: Dict[str, str]) -> Iterator[Tuple[int, int, str, List[Act]]]:
+        """
+        Actele care îndeplinesc filtrele, grupate pe monitoare, cronologic:
+        (an, nr_monitor, data_mo, acte). Monitoarele cu același număr din ani
+        diferiți sunt grupuri separate.
+        """
+        data_mo = {(m['an'], m['nr_monitor']): m['data_mo'] for m in self.monitors()}
+        for (year, nr_monitor), rows in groupby(self._iter_rows(filters), key=itemgetter(-1, _NR_MONITOR)):
+            yield year, nr_monitor, data_mo.get((year, nr_monitor), ''), [self._act(row) for row in rows]
+
+    def acts_by_content(self, content_hash: str) -> Optional[List[Act]]:
+        """
+        Actele monitorului salvat cu acest conținut (cheia din cache-ul de parsare,
+        care include versiunea parserului), sau None: un monitor deja arhivat nu
+        mai trebuie parsat.
+        """
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    'SELECT an, nr_monitor, nr_acte FROM monitoare WHERE content_hash = ?', (content_hash,)).fetchone()
+            if row is None:
+                return None
+            year, nr_monitor, nr_acte = row
+            acts = list(self.iter_acts({'an': year, 'nr_monitor': nr_monitor}))
+        except sqlite3.Error as e:
+            print(f"[WARNING] Arhiva de acte indisponibilă: {e}")
+            return None
+        # Monitorul a fost înlocuit între timp
+        return acts if len(acts) == nr_acte else None
+
+    def count(self, filters: Dict[str, str]) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self._connection().execute(f'SELECT COUNT(*) FROM acte{where}', params).fetchone()[0]
+
+    def monitors(self) -> List[dict]:
+        """Monitoarele salvate, cronologic (după an și număr)."""
+        with self._lock:
+            rows = self._connection().execute(
+                'SELECT nr_monitor, an, data_mo, nr_acte, salvat FROM monitoare ORDER BY an, nr_monitor').fetchall()
+        return [{'nr_monitor': nr, 'an': year, 'data_mo': data_mo, 'nr_acte': nr_acte, 'salvat': salvat}
+                for nr, year, data_mo, nr_acte, salvat in rows]
+
+
+ACT_STORE = ActStore(ACT_STORE_DB) if ACT_STORE_DB else None
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Benchmark MO IV Analyzer
+Măsoară viteza etapelor de analiză pe monitoare reale sau pe un corpus de probă
+
+Utilizare:
+    python benchmark.py                      # corpus de probă
+    python benchmark.py monitor_129.html ... # acte din monitoare reale
+    python benchmark.py --suite [--sizes 100,1000,10000,50000] [--output rezultate.json]
+                                             # etapele pe monitoare sintetice, salvate JSON
+    python benchmark.py --batch              # /analyze/batch vs apeluri /analyze separate
+    python benchmark.py --memory             # vârful RSS la parsarea uploadurilor mari
+    python benchmark.py --segmenter          # segmentarea pe HTML patologic: timp liniar în mărime
+    python benchmark.py --compression        # gzip / br ale raportului HTML, după mărimea lui
+    python benchmark.py --export             # exportul JSON / CSV / NDJSON față de raportul HTML
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from patterns_relaxed import (
+    detect_operation, detect_operation_reference,
+    detect_operations, OPERATION_BITS,
+    OPERATION_NAMES, OPERATION_CATEGORIES, NOISE_OPERATIONS, HIGH_INTEREST_OPERATIONS
+)
+
+
+# Fragmente tipice de acte din MO IV, folosite când nu se dau monitoare
+SAMPLE_ACTS = [
+    "Hotărârea nr. 3 din 12.01.2026 a adunării generale a asociaților privind "
+    "majorarea capitalului social de la 200 lei la 3.533.200 lei prin conversia "
+    "creanței asociatului. CUI 12345678, J40/1234/2010.",
+    "Decizia asociatului unic nr. 1 din 05.01.2026: schimbarea sediului social "
+    "din municipiul Pitești în comuna Ghimpați, județul Giurgiu.",
+    "Act adițional: cesiunea a 10 părți sociale de la POPESCU ION către IONESCU "
+    "MARIA, retragerea din societate a asociatului POPESCU ION.",
+    "Se aprobă contractarea unui credit de 5.000.000 lei și constituirea de "
+    "garanții ipotecare asupra imobilelor societății.",
+    "Actualizarea obiectului de activitate conform CAEN Rev. 3 prin declarație "
+    "pe propria răspundere; codurile se recodifică.",
+    "Numirea în funcția de administrator a domnului IONESCU VASILE pentru un "
+    "mandat de 4 ani, începând cu data de 15.01.2026.",
+    "Dizolvarea și lichidarea societății fără lichidator, conform art. 235.",
+    "Hotărârea adunării generale a acționarilor nr. 1 privind aprobarea "
+    "situațiilor financiare anuale.",
+    "Completarea obiectului secundar de activitate cu codurile 4120 și 4399.",
+    "Prelungirea mandatului administratorului unic până la 31.12.2029.",
+]
+
+
+def load_texts(paths: List[str]) -> List[str]:
+    """Textele actelor din monitoarele date sau, implicit, corpusul de probă."""
+    if not paths:
+        return SAMPLE_ACTS * 500
+
+    from mo_parser_v4 import parse_monitor
+
+    texts = []
+    for i, path in enumerate(paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(act.text_complet for act in parse_monitor(f.read(), i + 1))
+    return texts
+
+
+def acts_per_second(func: Callable[[str], object], texts: List[str], repeat: int = 5) -> float:
+    """Cel mai bun debit (acte/secundă) din `repeat` treceri prin corpus."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best if best else float('inf')
+
+
+def bench_detect_operation(texts: List[str]) -> None:
+    """Compară detecția prin automat cu evaluarea directă a regulilor."""
+    mismatches = sum(1 for t in texts if detect_operation(t) != detect_operation_reference(t))
+    if mismatches:
+        print(f"[WARNING] {mismatches} acte detectate diferit față de referință")
+
+    before = acts_per_second(detect_operation_reference, texts)
+    after = acts_per_second(detect_operation, texts)
+    multi = acts_per_second(detect_operations, texts)
+    print(f"detect_operation pe {len(texts):,} acte")
+    print(f"  evaluare directă (ref.):   {before:>12,.0f} acte/s")
+    print(f"  automat + bitset:          {after:>12,.0f} acte/s")
+    print(f"  toate operațiunile (mască): {multi:>11,.0f} acte/s")
+    print(f"  accelerare: {after / before:.2f}x")
+
+
+
+def make_acts(count: int, seed: int = 0) -> Tuple[list, Dict[int, str]]:
+    """Acte sintetice pentru raport: operațiuni aleatoare, ~30% companii TOP, 4 monitoare."""
+    from mo_parser_v4 import Act, TOP_COMPANII, get_ca_category
+
+    rng = random.Random(seed)
+    op_ids = list(OPERATION_NAMES)
+    top_cuis = list(TOP_COMPANII)
+    monitors_info = {nr: "15.01.2026" for nr in range(129, 133)}
+    acts = []
+    for i in range(count):
+        op_id = rng.choice(op_ids)
+        act = Act(
+            nr_act=i + 1,
+            denumire=f"SOCIETATEA {i} S.R.L.",
+            tip_operatiune=OPERATION_NAMES[op_id],
+            tip_operatiune_id=op_id,
+            categorie_operatiune=OPERATION_CATEGORIES[op_id],
+            nr_monitor=rng.choice(list(monitors_info)),
+            is_noise=op_id in NOISE_OPERATIONS,
+            is_high_interest=op_id in HIGH_INTEREST_OPERATIONS,
+            operatiuni_mask=OPERATION_BITS[op_id],
+        )
+        if top_cuis and rng.random() < 0.3:
+            info = TOP_COMPANII[rng.choice(top_cuis)]
+            act.in_top = True
+            act.rank = info['rank']
+            act.ca = info['ca']
+            act.categorie_ca, _ = get_ca_category(info['ca'])
+        acts.append(act)
+    return acts, monitors_info
+
+
+def bench_report(counts: List[int]) -> None:
+    """Raportul construit ca un singur șir vs transmis în bucăți: timp până la primul byte și memorie."""
+    from mo_parser_v4 import generate_html_report, iter_html_report
+
+    print("raport HTML (ttfb = timp până la primul byte)")
+    for count in counts:
+        acts, monitors_info = make_acts(count)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        report = generate_html_report(acts, monitors_info)
+        full_time = time.perf_counter() - start
+        full_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size = len(report.encode('utf-8'))
+        del report
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        chunks: Iterator[str] = iter_html_report(acts, monitors_info)
+        next(chunks)
+        ttfb = time.perf_counter() - start
+        for _ in chunks:
+            pass
+        stream_time = time.perf_counter() - start
+        stream_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"  {count:>7,} acte, {size / 1e6:6.1f} MB | "
+              f"șir: ttfb {full_time * 1e3:8.1f} ms, vârf {full_peak / 1e6:6.1f} MB | "
+              f"stream: ttfb {ttfb * 1e3:6.2f} ms, total {stream_time * 1e3:8.1f} ms, vârf {stream_peak / 1e6:6.1f} MB")
+
+
+def bench_batch(monitors: int, acts_per_monitor: int) -> None:
+    """
+    /analyze/batch (un singur NDJSON) vs câte un apel /analyze per monitor,
+    prin clientul de test Flask (fără rețea), cu cache-ul de parsare și arhiva de acte oprite.
+    """
+    import json
+    import main
+    import parse_cache
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import company_db
+
+    main.PARSE_CACHE.max_bytes = 0
+    main.PARSE_CACHE.db_path = ''
+    # Fără arhiva de acte: monitoarele deja arhivate nu ar mai fi parsate
+    main.ACT_STORE = parse_cache.ACT_STORE = None
+    client = main.app.test_client()
+    bodies = [
+        json.dumps({'html': generate_monitor(acts_per_monitor, nr_monitor=i, seed=i,
+                                             top_companies=company_db().companies), 'monitor': i})
+        for i in range(monitors)
+    ]
+    batch = ('\n'.join(bodies) + '\n').encode('utf-8')
+
+    def separate():
+        for body in bodies:
+            client.post('/analyze', data=body, content_type='application/json').get_json()
+
+    def batched():
+        client.post('/analyze/batch', data=batch, content_type='application/x-ndjson').get_data()
+
+    repeat = 3
+    single = best_time(separate, repeat)
+    both = best_time(batched, repeat)
+    print(f"  {monitors} monitoare x {acts_per_monitor} acte: {monitors} apeluri {single * 1e3:8.1f} ms "
+          f"({monitors / single:6.1f} monitoare/s) | batch {both * 1e3:8.1f} ms ({monitors / both:6.1f} monitoare/s)")
+
+
+def _proc_status_kb(field: str) -> int:
+    with open('/proc/self/status', 'r') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+
+def peak_rss_growth(func: Callable[[], object]) -> float:
+    """
+    Cu cât crește vârful RSS (MB) cât rulează `func`, măsurat într-un proces
+    copil (fork) al cărui vârf e resetat înainte de start (Linux).
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context('fork')
+    receiver, sender = ctx.Pipe(duplex=False)
+
+    def run():
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')  # resetează VmHWM la RSS-ul curent
+        before = _proc_status_kb('VmRSS')
+        func()
+        sender.send((_proc_status_kb('VmHWM') - before) / 1024)
+
+    child = ctx.Process(target=run)
+    child.start()
+    growth = receiver.recv()
+    child.join()
+    return growth
+
+
+def bench_upload_memory(counts: List[int]) -> None:
+    """
+    Vârful RSS al parsării unui upload: citire + decodare integrală (vechiul
+    drum) vs fișier scris pe disc și mapat, cu decodare per act. Actele sunt
+    doar numărate, ca să se vadă memoria segmentării, nu a rezultatului.
+    """
+    import tempfile
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import TOP_COMPANII, get_fuzzy_index, iter_acts
+    from upload_spool import close_upload, spool_upload
+
+    # Indexul fuzzy e construit înainte de fork, ca în workerii gunicorn
+    get_fuzzy_index()
+    for count in counts:
+        with tempfile.NamedTemporaryFile(suffix='.html') as f:
+            f.write(generate_monitor(count, seed=count, top_companies=TOP_COMPANII).encode('utf-8'))
+            f.flush()
+            size = f.tell()
+
+            def read_and_decode():
+                with open(f.name, 'rb') as upload:
+                    html = upload.read().decode('utf-8')
+                sum(1 for _ in iter_acts(html, 1))
+
+            def spooled():
+                with open(f.name, 'rb') as upload:
+                    content = spool_upload(upload)
+                try:
+                    sum(1 for _ in iter_acts(content, 1))
+                finally:
+                    close_upload(content)
+
+            before = peak_rss_growth(read_and_decode)
+            after = peak_rss_growth(spooled)
+        print(f"  {count:>7,} acte, {size / 1024 / 1024:6.1f} MB | citire + decodare: vârf RSS +{before:7.1f} MB "
+              f"| spool + mmap: vârf RSS +{after:6.1f} MB")
+
+
+def bench_act_memory(count: int) -> None:
+    """Memoria ocupată de actele parsate (heap Python) și mărimea lor serializată în cache."""
+    import gc
+    import pickle
+    import zlib
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import TOP_COMPANII, get_fuzzy_index, parse_monitor
+
+    get_fuzzy_index()
+    html = generate_monitor(count, seed=1, top_companies=TOP_COMPANII)
+    gc.collect()
+    tracemalloc.start()
+    acts = parse_monitor(html, 1)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    blob = pickle.dumps(acts, pickle.HIGHEST_PROTOCOL)
+    print(f"  {len(acts):,} acte: {size / 1024 / 1024:.2f} MB în memorie ({size / len(acts):.0f} B/act) | "
+          f"cache: {len(zlib.compress(blob, 1)) / 1024:.0f} KB comprimat")
+
+
+def bench_segmenter(sizes: List[int], reference_sizes: List[int]) -> bool:
+    """
+    Acordul cu COMPANY_PATTERN pe monitoare bine formate, apoi timpul segmentării
+    și al parsării pe HTML patologic de mărimi crescătoare. Exponentul de creștere
+    (log t / log mărime) e ~1 pentru timp liniar; expresia veche e măsurată doar pe
+    mărimile mici, fiindcă pe cele mari crește pătratic. Returnează True dacă
+    toate cazurile scalează liniar.
+    """
+    import re
+    from act_segmenter import HeaderScanner
+    from mo_generator import PATHOLOGICAL_HTML, generate_monitor
+    from mo_parser_v4 import COMPANY_PATTERN, parse_monitor
+
+    whitespace = re.compile(r'\s+')
+    headers = 0
+    agree = True
+    for seed in range(5):
+        html = generate_monitor(2000, seed=seed)
+        reference = [(m.start(), m.end(), whitespace.sub(' ', m.group(1).strip()))
+                     for m in COMPANY_PATTERN.finditer(html)]
+        found = [(start, end, whitespace.sub(' ', name.strip()))
+                 for start, end, name in HeaderScanner().scan(html, final=True)]
+        agree = agree and found == reference
+        headers += len(reference)
+    print(f"  acord cu COMPANY_PATTERN pe monitoare bine formate: {'da' if agree else 'NU'} ({headers:,} antete)")
+
+    def exponent(times: List[float], measured: List[int]) -> float:
+        return math.log(max(times[-1], 1e-9) / max(times[0], 1e-9)) / math.log(measured[-1] / measured[0])
+
+    linear = agree
+    for case, make in PATHOLOGICAL_HTML.items():
+        scan_times = []
+        parse_times = []
+        for size in sizes:
+            html = make(size)
+            scan_times.append(best_time(lambda: sum(1 for _ in HeaderScanner().scan(html, final=True)), 3))
+            parse_times.append(best_time(lambda: parse_monitor(html, 1), 3))
+        regex_times = []
+        for size in reference_sizes:
+            html = make(size)
+            regex_times.append(best_time(lambda: sum(1 for _ in COMPANY_PATTERN.finditer(html)), 1))
+        scan_exp = exponent(scan_times, sizes)
+        parse_exp = exponent(parse_times, sizes)
+        ok = scan_exp < 1.3 and parse_exp < 1.3
+        linear = linear and ok
+        print(f"  {case:<34} | {sizes[-1] // 1024:>5} KB: segmentare {scan_times[-1] * 1000:7.1f} ms "
+              f"(exp {scan_exp:4.2f}), parsare {parse_times[-1] * 1000:7.1f} ms (exp {parse_exp:4.2f}) "
+              f"| regex {reference_sizes[-1] // 1024} KB: {regex_times[-1] * 1000:7.1f} ms "
+              f"(exp {exponent(regex_times, reference_sizes):4.2f}) {'✓' if ok else '✗ NELINIAR'}")
+    return linear
+
+
+def bench_compression(counts: List[int]) -> None:
+    """
+    Compresia raportului HTML, după mărimea lui: dimensiunea și timpul pentru
+    fiecare codificare la nivelul din mers (/api/process) și la cel folosit o
+    singură dată (rapoartele joburilor), față de timpul generării raportului.
+    """
+    from http_compress import ENCODINGS, STORED_LEVELS, STREAM_LEVELS, iter_compressed, compress
+    from mo_parser_v4 import iter_html_report
+    from main import coalesce_chunks
+
+    for count in counts:
+        acts, monitors_info = make_acts(count)
+        repeat = max(1, min(5, 20_000 // count))
+        chunks = list(coalesce_chunks(iter_html_report(acts, monitors_info)))
+        data = ''.join(chunks).encode('utf-8')
+        render = best_time(lambda: sum(1 for _ in coalesce_chunks(iter_html_report(acts, monitors_info))), repeat)
+        print(f"  {count:>7,} acte, raport {len(data) / 1e6:6.2f} MB, generare {render * 1e3:7.1f} ms")
+        for encoding in ENCODINGS:
+            streamed = b''.join(iter_compressed(chunks, encoding))
+            stream_time = best_time(lambda: sum(1 for _ in iter_compressed(chunks, encoding)), repeat)
+            stored = compress(data, encoding, STORED_LEVELS[encoding])
+            stored_time = best_time(lambda: compress(data, encoding, STORED_LEVELS[encoding]), repeat)
+            print(f"    {encoding:<4} din mers (nivel {STREAM_LEVELS[encoding]}): {len(streamed) / 1e3:8.1f} KB "
+                  f"(x{len(data) / len(streamed):4.1f}) {stream_time * 1e3:7.1f} ms "
+                  f"({100 * stream_time / render:4.0f}% din generare, {len(data) / stream_time / 1e6:6.1f} MB/s) | "
+                  f"salvat (nivel {STORED_LEVELS[encoding]}): {len(stored) / 1e3:8.1f} KB "
+                  f"(x{len(data) / len(stored):4.1f}) {stored_time * 1e3:7.1f} ms")
+
+
+def bench_export(counts: List[int]) -> None:
+    """
+    Exportul actelor (act_export) față de raportul HTML, pentru aceleași acte
+    parsate dintr-un monitor sintetic: timp și mărime, cu câmpurile implicite
+    (fără text_complet), cu toate și doar cu informațiile pe care le are și
+    raportul. Raportul listează doar actele relevante, exportul pe toate, deci
+    e comparat și timpul per act listat.
+    """
+    from act_export import DEFAULT_EXPORT_FIELDS, EXPORT_FIELDS, EXPORT_FORMATS
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import TOP_COMPANII, iter_html_report, parse_monitor, report_state
+
+    # Ce conține și raportul HTML despre fiecare act
+    like_html = ('nr_monitor', 'nr_act', 'denumire', 'tip_operatiune', 'operatiuni', 'in_top', 'rank',
+                 'ca', 'categorie_ca', 'is_high_interest')
+    for count in counts:
+        acts = parse_monitor(generate_monitor(count, seed=count, top_companies=TOP_COMPANII), 129)
+        monitors_info = {129: "15.01.2026"}
+        repeat = max(1, min(5, 20_000 // count))
+        relevant = report_state(acts, monitors_info).counters()['relevant']
+        html_size = sum(len(chunk) for chunk in iter_html_report(acts, monitors_info))
+        html_time = best_time(lambda: sum(1 for _ in iter_html_report(acts, monitors_info)), repeat)
+        print(f"  {len(acts):>7,} acte | html {html_time * 1e3:8.1f} ms, {html_size / 1e6:6.2f} MB, "
+              f"{relevant:,} acte listate ({html_time / max(relevant, 1) * 1e6:5.2f} µs/act)")
+        for name, writer_class in EXPORT_FORMATS.items():
+            for fields, label in ((DEFAULT_EXPORT_FIELDS, 'implicite'), (EXPORT_FIELDS, 'cu text_complet'),
+                                  (like_html, 'câmpurile din html')):
+                def render():
+                    writer = writer_class(fields)
+                    return writer.start() + writer.acts(acts) + writer.end()
+                size = len(render())
+                seconds = best_time(render, repeat)
+                print(f"    {name:<6} {label:<18} {seconds * 1e3:8.1f} ms ({100 * seconds / html_time:5.1f}% din html, "
+                      f"{seconds / len(acts) * 1e6:5.2f} µs/act), {size / 1e6:6.2f} MB")
+
+
+def bench_incremental(monitors: int, acts_per_monitor: int) -> None:
+    """
+    Raportul unei zile în care monitoarele apar pe rând: la fiecare monitor nou,
+    reparsarea tuturor și generarea raportului (varianta fără stare) față de
+    adăugarea doar a monitorului nou la ReportState și compunerea raportului.
+    """
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import TOP_COMPANII, ReportState, iter_html_report, monitor_report, parse_monitor
+
+    sources = [generate_monitor(acts_per_monitor, seed=i, top_companies=TOP_COMPANII) for i in range(monitors)]
+    state = ReportState()
+    for i, html in enumerate(sources):
+        nr_monitor = 129 + i
+        parse_time = best_time(lambda: parse_monitor(html, nr_monitor), 3)
+        acts = parse_monitor(html, nr_monitor)
+        update_time = best_time(lambda: monitor_report(nr_monitor, "15.01.2026", acts), 3)
+        state.add_monitor(nr_monitor, "15.01.2026", acts)
+        render_time = best_time(lambda: sum(1 for _ in state.iter_html()), 3)
+
+        def from_scratch():
+            all_acts = []
+            for j, source in enumerate(sources[:i + 1]):
+                all_acts.extend(parse_monitor(source, 129 + j))
+            return sum(1 for _ in iter_html_report(all_acts, {129 + j: "15.01.2026" for j in range(i + 1)}))
+        scratch_time = best_time(from_scratch, 1)
+        incremental = parse_time + update_time + render_time
+        print(f"  {i + 1:>3} monitoare | de la zero {scratch_time * 1e3:8.1f} ms | incremental {incremental * 1e3:7.1f} ms "
+              f"(parsare {parse_time * 1e3:6.1f}, actualizare stare {update_time * 1e3:5.1f}, "
+              f"raport {render_time * 1e3:5.1f})")
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Cel mai bun timp (secunde) din `repeat` rulări."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def git_revision() -> str:
+    """Commit-ul curent, pentru a putea compara rezultatele între versiuni."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_suite(sizes: List[int], seed: int = 0) -> dict:
+    """
+    Timpul fiecărei etape pe monitoare sintetice de mărimile date:
+    parsare completă, detecție operațiune, extragere CUI, potrivire TOP, raport HTML.
+    """
+    from mo_generator import generate_monitor
+    from mo_parser_v4 import (
+        TOP_COMPANII, parse_monitor, extract_cui, match_top, generate_html_report
+    )
+
+    results = []
+    for count in sizes:
+        html = generate_monitor(count, seed=seed, top_companies=TOP_COMPANII)
+        repeat = max(1, min(5, 20_000 // count))
+        acts = parse_monitor(html, 129)
+        texts = [act.text_complet for act in acts]
+        monitors_info = {129: "15.01.2026"}
+
+        stages = {
+            'parse_monitor': best_time(lambda: parse_monitor(html, 129), repeat),
+            'detect_operation': best_time(lambda: [detect_operation(t) for t in texts], repeat),
+            'detect_operations': best_time(lambda: [detect_operations(t) for t in texts], repeat),
+            'extract_cui': best_time(lambda: [extract_cui(t) for t in texts], repeat),
+            'match_top': best_time(lambda: [match_top(a.denumire, a.cui) for a in acts], repeat),
+            'generate_html_report': best_time(lambda: generate_html_report(acts, monitors_info), repeat),
+        }
+        size = len(html.encode('utf-8'))
+        results.append({
+            'generated': count,
+            'acts': len(acts),
+            'bytes': size,
+            'repeat': repeat,
+            'stages': {
+                name: {'seconds': round(seconds, 6), 'acts_per_second': round(len(acts) / seconds, 1)}
+                for name, seconds in stages.items()
+            },
+        })
+        print(f"  {len(acts):>7,} acte, {size / 1e6:5.1f} MB | " + " | ".join(
+            f"{name} {seconds * 1e3:8.1f} ms" for name, seconds in stages.items()))
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'top_companies': len(TOP_COMPANII),
+        'seed': seed,
+        'results': results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MO IV Analyzer")
+    parser.add_argument('monitors', nargs='*', help="monitoare HTML pentru benchmark-ul de detecție")
+    parser.add_argument('--suite', action='store_true', help="etapele pe monitoare sintetice")
+    parser.add_argument('--sizes', default='100,1000,10000,50000', help="numărul de acte per monitor")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="fișierul JSON cu rezultatele suitei")
+    parser.add_argument('--batch', action='store_true', help="/analyze/batch vs apeluri /analyze separate")
+    parser.add_argument('--memory', action='store_true', help="vârful RSS la parsarea uploadurilor mari")
+    parser.add_argument('--segmenter', action='store_true', help="segmentarea pe HTML patologic")
+    parser.add_argument('--compression', action='store_true', help="gzip / br ale raportului HTML")
+    parser.add_argument('--export', action='store_true', help="exportul JSON / CSV / NDJSON vs raportul HTML")
+    parser.add_argument('--incremental', action='store_true', help="raportul actualizat monitor cu monitor")
+    args = parser.parse_args()
+
+    if args.batch:
+        print("/analyze/batch vs /analyze (cel mai bun timp din 3)")
+        for monitors, acts in ((200, 10), (50, 100), (20, 1000)):
+            bench_batch(monitors, acts)
+    elif args.memory:
+        print("memoria parsării unui upload (vârf RSS peste procesul de bază)")
+        bench_upload_memory([5_000, 20_000, 80_000])
+        print("memoria actelor parsate")
+        bench_act_memory(10_000)
+    elif args.segmenter:
+        print("segmentare pe HTML patologic (exponentul de creștere ~1 = timp liniar)")
+        if not bench_segmenter([128 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024], [8 * 1024, 16 * 1024, 32 * 1024]):
+            sys.exit(1)
+    elif args.compression:
+        print("compresia raportului HTML (cel mai bun timp)")
+        bench_compression([100, 1_000, 10_000, 50_000])
+    elif args.export:
+        print("export JSON / CSV / NDJSON vs raport HTML (cel mai bun timp)")
+        bench_export([1_000, 10_000, 50_000])
+    elif args.incremental:
+        print("raport actualizat la fiecare monitor nou: reparsare completă vs ReportState (cel mai bun timp)")
+        bench_incremental(12, 2_000)
+    elif args.suite:
+        print("etape pe monitoare sintetice (cel mai bun timp)")
+        suite = run_suite([int(n) for n in args.sizes.split(',')], args.seed)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(suite, f, indent=2, ensure_ascii=False)
+            print(f"[INFO] Rezultate salvate: {args.output}")
+    else:
+        bench_detect_operation(load_texts(args.monitors))
+        print()
+        bench_report([1_000, 10_000, 50_000])
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Index binar pentru TOP companii
+Compilează top_companii.json într-un fișier read-only deschis prin mmap,
+partajat de toți workerii gunicorn prin page cache
+
+Format (little-endian), secțiuni consecutive după antet:
+- CUI-uri sortate (u64), pe care se face căutarea binară
+- coloane per companie, în ordinea CUI-urilor: ca, profit (i64), rank, angajati (u32)
+- offset-uri în pool pentru denumire, caen, judet, industrie (4 x u32)
+- tabelă hash pentru denumirile normalizate: sloturi (offset cheie, nr. companie + 1)
+- pool de șiruri UTF-8, fiecare precedat de lungimea pe u16
+
+Utilizare:
+    python company_index.py [top_companii.json] [top_companii.idx]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+import zlib
+from bisect import bisect_left
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+MAGIC = b'MOTC'
+# Versiunea 3: cheile denumirilor sunt produse de normalize_name
+FORMAT_VERSION = 3
+# magic, versiune, rezervat, nr. companii, nr. sloturi hash, dimensiune, mtime și sha256 JSON sursă
+HEADER = struct.Struct('<4sHHIIQQ32s')
+STRING_FIELDS = ('denumire', 'caen', 'judet', 'industrie')
+
+
+# Literele latine cu diacritice -> litera de bază (Ș/Ş, Ț/Ţ, Ă, Â, Î, É, Ö...)
+_FOLD_TABLE = {
+    code: unicodedata.normalize('NFKD', chr(code))[0]
+    for code in range(0xC0, 0x250)
+    if unicodedata.normalize('NFKD', chr(code))[0].isascii()
+}
+# Denumiri UTF-8 citite ca Windows-1252 ("DISTRIBUÈšIE"), prezente în top_companii.json
+_MOJIBAKE = re.compile('[ÂÃÄÅÈ][\u0080-\u203a]')
+_NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+# Forma juridică de la sfârșit, cu sau fără puncte: S.R.L., SRL, S.A., SA, S.C.S., SNC
+_LEGAL_SUFFIX = re.compile(r'(?: (?:S ?R ?L|S ?A|S ?C ?S|S ?N ?C))+ ?$')
+
+# Câte denumiri normalizate sunt memorate (actele aceleiași companii se repetă)
+NAME_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(denumire: str) -> str:
+    """
+    Cheia după care se caută o companie TOP după denumire, aceeași la construirea
+    indexului și la căutare: fără diacritice, punctuație și formă juridică.
+    "Distribuție Energie - S.R.L." -> "DISTRIBUTIE ENERGIE".
+    """
+    if not denumire.isascii():
+        if _MOJIBAKE.search(denumire):
+            try:
+                denumire = denumire.encode('cp1252').decode('utf-8')
+            except UnicodeError:
+                pass
+        denumire = denumire.translate(_FOLD_TABLE)
+    key = _NON_ALNUM.sub(' ', denumire.upper())
+    return _LEGAL_SUFFIX.sub('', key).strip()
+
+
+def _name_hash(key: bytes) -> int:
+    return zlib.crc32(key)
+
+
+def _layout(count: int, slots: int) -> Dict[str, Tuple[int, int]]:
+    """Offset-ul și lungimea fiecărei secțiuni din fișier."""
+    sections = [
+        ('cui', 8 * count), ('ca', 8 * count), ('profit', 8 * count),
+        ('rank', 4 * count), ('angajati', 4 * count),
+        ('strings', 4 * len(STRING_FIELDS) * count),
+        ('names', 8 * slots),
+    ]
+    layout = {}
+    offset = HEADER.size
+    for name, size in sections:
+        layout[name] = (offset, size)
+        offset += size
+    layout['pool'] = (offset, 0)
+    return layout
+
+
+def build_index(json_path: str, index_path: str) -> None:
+    """Compilează JSON-ul în indexul binar; fișierul apare atomic (rename)."""
+    stat = os.stat(json_path)
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    companies = json.loads(raw.decode('utf-8'))
+
+    cuis = sorted(companies, key=int)
+    position = {cui: i for i, cui in enumerate(cuis)}
+    count = len(cuis)
+    slots = 1
+    while slots < 2 * count:
+        slots *= 2
+
+    pool = bytearray()
+    pool_offsets: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in pool_offsets:
+            data = value.encode('utf-8')
+            pool_offsets[value] = len(pool)
+            pool.extend(struct.pack('<H', len(data)))
+            pool.extend(data)
+        return pool_offsets[value]
+
+    string_offsets: List[int] = []
+    for cui in cuis:
+        info = companies[cui]
+        string_offsets.extend(intern(info[field]) for field in STRING_FIELDS)
+
+    # Ca la dict-ul construit din JSON: la denumiri identice câștigă ultima
+    by_name: Dict[str, int] = {}
+    for cui, info in companies.items():
+        by_name[normalize_name(info['denumire'])] = position[cui]
+    table = [0] * (2 * slots)
+    for name, record in by_name.items():
+        key = name.encode('utf-8')
+        slot = _name_hash(key) & (slots - 1)
+        while table[2 * slot + 1]:
+            slot = (slot + 1) & (slots - 1)
+        table[2 * slot] = intern(name)
+        table[2 * slot + 1] = record + 1
+
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, slots,
+                    stat.st_size, stat.st_mtime_ns, hashlib.sha256(raw).digest()),
+        struct.pack(f'<{count}Q', *(int(cui) for cui in cuis)),
+        struct.pack(f'<{count}q', *(companies[cui]['ca'] for cui in cuis)),
+        struct.pack(f'<{count}q', *(companies[cui]['profit'] for cui in cuis)),
+        struct.pack(f'<{count}I', *(companies[cui]['rank'] for cui in cuis)),
+        struct.pack(f'<{count}I', *(companies[cui]['angajati'] for cui in cuis)),
+        struct.pack(f'<{len(string_offsets)}I', *string_offsets),
+        struct.pack(f'<{len(table)}I', *table),
+        bytes(pool),
+    ]
+    tmp_path = f'{index_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        for part in parts:
+            f.write(part)
+    os.replace(tmp_path, index_path)
+
+
+class CompanyIndex(Mapping):
+    """
+    TOP companii indexate după CUI, citite direct din fișierul mapat în memorie.
+    Se comportă ca dict-ul din JSON: TOP_COMPANII[cui] -> {'rank': ..., 'denumire': ...}.
+    """
+
+    def __init__(self, index_path: str):
+        self.path = index_path
+        with open(index_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, slots, src_size, src_mtime, src_sha = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{index_path}: format de index necunoscut')
+        self.source_size = src_size
+        self.source_mtime_ns = src_mtime
+        # Versiunea datelor: primele caractere din sha256 al JSON-ului sursă
+        self.version = src_sha.hex()[:16]
+        self._count = count
+        self._slots = slots
+
+        view = memoryview(self._mm)
+        layout = _layout(count, slots)
+
+        def column(name: str, fmt: str) -> memoryview:
+            offset, size = layout[name]
+            return view[offset:offset + size].cast(fmt)
+
+        self._cui = column('cui', 'Q')
+        self._ca = column('ca', 'q')
+        self._profit = column('profit', 'q')
+        self._rank = column('rank', 'I')
+        self._angajati = column('angajati', 'I')
+        self._strings = column('strings', 'I')
+        self._names = column('names', 'I')
+        self._pool = view[layout['pool'][0]:]
+        self.by_name = CompanyNameIndex(self)
+
+    def _string(self, offset: int) -> str:
+        length = self._pool[offset] | (self._pool[offset + 1] << 8)
+        return str(self._pool[offset + 2:offset + 2 + length], 'utf-8')
+
+    def _position(self, cui: str) -> int:
+        """Poziția CUI-ului în index sau -1."""
+        if not isinstance(cui, str) or not cui.isdigit() or cui.startswith('0'):
+            return -1
+        key = int(cui)
+        i = bisect_left(self._cui, key)
+        if i < self._count and self._cui[i] == key:
+            return i
+        return -1
+
+    def record(self, i: int) -> dict:
+        """Decodează compania de pe poziția i."""
+        strings = self._strings[4 * i:4 * i + 4]
+        return {
+            'rank': self._rank[i],
+            'denumire': self._string(strings[0]),
+            'ca': self._ca[i],
+            'profit': self._profit[i],
+            'angajati': self._angajati[i],
+            'caen': self._string(strings[1]),
+            'judet': self._string(strings[2]),
+            'industrie': self._string(strings[3]),
+        }
+
+    def __getitem__(self, cui: str) -> dict:
+        i = self._position(cui)
+        if i < 0:
+            raise KeyError(cui)
+        return self.record(i)
+
+    def __contains__(self, cui: object) -> bool:
+        return self._position(cui) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(cui) for cui in self._cui)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class CompanyNameIndex(Mapping):
+    """TOP companii după denumirea normalizată: {'cui': ..., **info}."""
+
+    def __init__(self, index: CompanyIndex):
+        self._index = index
+
+    def _position(self, name: str) -> int:
+        if not isinstance(name, str):
+            return -1
+        index = self._index
+        key = name.encode('utf-8')
+        mask = index._slots - 1
+        slot = _name_hash(key) & mask
+        names = index._names
+        pool = index._pool
+        while True:
+            record = names[2 * slot + 1]
+            if not record:
+                return -1
+            offset = names[2 * slot]
+            length = pool[offset] | (pool[offset + 1] << 8)
+            if length == len(key) and pool[offset + 2:offset + 2 + length] == key:
+                return record - 1
+            slot = (slot + 1) & mask
+
+    def __getitem__(self, name: str) -> dict:
+        i = self._position(name)
+        if i < 0:
+            raise KeyError(name)
+        return {'cui': str(self._index._cui[i]), **self._index.record(i)}
+
+    def __contains__(self, name: object) -> bool:
+        return self._position(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._index._names
+        for slot in range(self._index._slots):
+            if names[2 * slot + 1]:
+                yield self._index._string(names[2 * slot])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def index_path_for(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + '.idx'
+
+
+def load_company_index(json_path: str) -> CompanyIndex:
+    """
+    Deschide indexul binar de lângă JSON, reconstruindu-l dacă lipsește
+    sau dacă JSON-ul s-a schimbat de la ultima compilare.
+    """
+    index_path = index_path_for(json_path)
+    stat = os.stat(json_path)
+    if os.path.exists(index_path):
+        try:
+            index = CompanyIndex(index_path)
+        except ValueError:
+            index = None
+        if index is not None and (index.source_size, index.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return index
+    build_index(json_path, index_path)
+    return CompanyIndex(index_path)
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'top_companii.json')
+    dst = sys.argv[2] if len(sys.argv) > 2 else index_path_for(src)
+    build_index(src, dst)
+    index = CompanyIndex(dst)
+    print(f"[INFO] Index {dst}: {len(index):,} companii, {os.path.getsize(dst):,} bytes")
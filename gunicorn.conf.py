@@ -0,0 +1,17 @@
+"""
+Configurația gunicorn, citită automat din directorul de lucru
+(opțiunile din Procfile au prioritate).
+"""
+
+
+def post_worker_init(worker):
+    # Pool-ul de parsare e creat acum, înainte ca workerul să servească cereri:
+    # procesele lui sunt create prin fork dintr-un proces încă fără alte threaduri
+    from main import get_parse_pool
+    get_parse_pool()
+
+
+def worker_exit(server, worker):
+    # Contoarele modificate de la ultima salvare periodică ajung în METRICS_DIR
+    from metrics import METRICS
+    METRICS.flush()
@@ -0,0 +1,206 @@
+"""
+Joburi asincrone pentru procesarea monitoarelor
+Fiecare job are un director în JOBS_DIR cu fișierele uploadate, status.json
+și, la final, raportul HTML (plus variantele lui comprimate). Starea e pe disc, deci orice worker gunicorn
+poate răspunde la interogări, indiferent care a primit uploadul.
+"""
+
+import json
+import os
+import re
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from upload_spool import map_file
+
+# Directorul joburilor, comun tuturor workerilor
+JOBS_DIR = os.environ.get('JOBS_DIR', os.path.join(tempfile.gettempdir(), 'mo-iv-jobs'))
+# După câte secunde de la ultima actualizare e șters un job (și raportul lui)
+JOB_TTL = int(os.environ.get('JOB_TTL', '3600'))
+# Câte joburi rulează simultan în fiecare worker gunicorn
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))
+# La câte secunde își confirmă workerul joburile neterminate; după 4 confirmări
+# ratate (sau dacă procesul lui nu mai există) jobul e considerat abandonat
+JOB_HEARTBEAT = int(os.environ.get('JOB_HEARTBEAT', '15'))
+_STALE_HEARTBEATS = 4
+
+# Stările unui job
+IN_ASTEPTARE = 'in_asteptare'
+IN_LUCRU = 'in_lucru'
+GATA = 'gata'
+EROARE = 'eroare'
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+_HOST = socket.gethostname()
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobStore:
+    """
+    Joburile din `directory`, fiecare într-un subdirector numit după id.
+    Jobul e rulat de workerul care l-a creat (owner: pid și host), care îi
+    reînnoiește heartbeat-ul cât timp e în așteptare sau în lucru; un job
+    al cărui worker a murit (oprit de OOM killer, timeout gunicorn, redeploy)
+    e raportat de status() ca EROARE, nu rămâne la nesfârșit neterminat.
+    """
+
+    def __init__(self, directory: str, ttl: int):
+        self.directory = directory
+        self.ttl = ttl
+        # Joburile neterminate ale acestui proces și threadul care le confirmă
+        self._owned = set()
+        self._lock = threading.Lock()
+        self._heartbeat_thread = None
+
+    def _path(self, job_id: str, name: str = '') -> Optional[str]:
+        if not _JOB_ID.match(job_id):
+            return None
+        return os.path.join(self.directory, job_id, name)
+
+    def create(self, uploads: List[Tuple[str, bytes]]) -> str:
+        """Salvează fișierele uploadate și returnează id-ul jobului."""
+        job_id = uuid.uuid4().hex
+        job_dir = self._path(job_id)
+        os.makedirs(job_dir)
+        files = []
+        for i, (filename, raw) in enumerate(uploads):
+            stored = f'{i:03d}_{filename}'
+            with open(os.path.join(job_dir, stored), 'wb') as f:
+                f.write(raw)
+            files.append([filename, stored])
+        self._write_status(job_id, {
+            'job_id': job_id,
+            'status': IN_ASTEPTARE,
+            'files': files,
+            'monitors_total': len(uploads),
+            'monitors_done': 0,
+            'acts_found': 0,
+            'errors': [],
+            'owner': {'pid': os.getpid(), 'host': _HOST},
+            'heartbeat': time.time(),
+            'created': time.time(),
+            'updated': time.time(),
+        })
+        with self._lock:
+            self._owned.add(job_id)
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._beat, name='mo-iv-job-heartbeat', daemon=True)
+                self._heartbeat_thread.start()
+        return job_id
+
+    def release(self, job_id: str) -> None:
+        """Jobul s-a terminat (GATA sau EROARE): heartbeat-ul lui nu mai e reînnoit."""
+        with self._lock:
+            self._owned.discard(job_id)
+
+    def _beat(self) -> None:
+        while True:
+            time.sleep(JOB_HEARTBEAT)
+            with self._lock:
+                owned = list(self._owned)
+            for job_id in owned:
+                try:
+                    if self._update(job_id, {'heartbeat': time.time()}) is None:
+                        # Job șters (expirat) între timp
+                        self.release(job_id)
+                except OSError as e:
+                    print(f"[WARNING] Heartbeat-ul jobului {job_id} nu a putut fi scris: {e}")
+
+    def uploads(self, job_id: str) -> List[Tuple[str, bytes]]:
+        """
+        Fișierele jobului, în ordinea uploadului, mapate în memorie
+        (apelantul le închide cu upload_spool.close_upload).
+        """
+        return [(filename, map_file(self._path(job_id, stored)))
+                for filename, stored in self.status(job_id)['files']]
+
+    def _read_status(self, job_id: str) -> Optional[dict]:
+        path = self._path(job_id, 'status.json')
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _abandoned(self, status: dict) -> bool:
+        if status['status'] not in (IN_ASTEPTARE, IN_LUCRU) or 'owner' not in status:
+            return False
+        owner = status['owner']
+        if owner['host'] == _HOST and not _process_exists(owner['pid']):
+            return True
+        return time.time() - status['heartbeat'] > JOB_HEARTBEAT * _STALE_HEARTBEATS
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """
+        Starea jobului sau None dacă nu există (ori a expirat). Un job neterminat
+        al cărui worker nu mai există e trecut (și salvat) ca EROARE.
+        """
+        status = self._read_status(job_id)
+        if status is not None and self._abandoned(status):
+            status = self._update(job_id, {'status': EROARE, 'updated': time.time(),
+                                           'error': 'Workerul care rula jobul s-a oprit; reîncercați'})
+        return status
+
+    def update(self, job_id: str, **fields) -> Optional[dict]:
+        """Actualizează starea (None dacă jobul nu mai există)."""
+        return self._update(job_id, dict(fields, updated=time.time()))
+
+    def _update(self, job_id: str, fields: dict) -> Optional[dict]:
+        # Starea e scrisă de threadul care rulează jobul și de heartbeat-ul lui
+        with self._lock:
+            status = self._read_status(job_id)
+            if status is None:
+                return None
+            status.update(fields)
+            self._write_status(job_id, status)
+        return status
+
+    def _write_status(self, job_id: str, status: dict) -> None:
+        path = self._path(job_id, 'status.json')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def report_path(self, job_id: str) -> Optional[str]:
+        return self._path(job_id, 'raport.html')
+
+    def expire(self) -> int:
+        """Șterge joburile neactualizate de mai mult de `ttl` secunde."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for job_id in os.listdir(self.directory):
+            path = self._path(job_id, 'status.json')
+            if path is None:
+                continue
+            try:
+                # Un job fără status (creare întreruptă) expiră după director
+                stamp = path if os.path.exists(path) else os.path.dirname(path)
+                expired = os.path.getmtime(stamp) < cutoff
+            except OSError:
+                continue
+            if expired:
+                shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+                removed += 1
+        return removed
+
+
+JOBS = JobStore(JOBS_DIR, JOB_TTL)
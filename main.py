@@ -4,26 +4,104 @@ MO IV Analyzer - Railway Server
 Flask API pentru procesarea Monitoarelor Oficiale Partea IV
 """
 
+import hmac
 import os
 import re
 import json
-import tempfile
+import time
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file, render_template_string
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from flask import Flask, Response, g, request, jsonify, render_template_string, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 
 # Import local modules
 from patterns_relaxed import detect_operation, NOISE_OPERATIONS, HIGH_INTEREST_OPERATIONS
 from mo_parser_v4 import (
     parse_monitor, 
-    generate_html_report, 
-    TOP_COMPANII,
+    iter_html_report, 
+    count_flags,
+    get_fuzzy_index,
+    monitor_report,
+    ReportState,
+    company_db,
+    companies_changed,
+    reload_companies,
     Act
 )
+from parse_cache import PARSE_CACHE, cached_parse_monitor
+from metrics import (
+    METRICS,
+    RequestTimings,
+    collecting,
+    current_timings,
+    record_budget_exceeded,
+    record_stage,
+    record_volume,
+    server_timing_header,
+    start_timing,
+    stop_timing,
+    timed_iter
+)
+from jobs import JOBS, JOB_WORKERS, IN_LUCRU, GATA, EROARE
+from report_store import REPORTS
+from act_store import ACT_STORE, FILTERS
+from upload_spool import MappedFile, close_upload, map_file, spool_upload
+from act_export import EXPORT_FORMATS, ExportWriter, parse_fields
+from http_compress import (
+    COMPRESSIBLE,
+    MIN_COMPRESS_BYTES,
+    SUFFIXES,
+    PrecompressedWriter,
+    cached_body,
+    compress,
+    iter_compressed,
+    negotiate,
+    representation_etag
+)
+from time_budget import BudgetExceeded, budget_left, check_budget, current_deadline, deadline_at, time_budget
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max
 
+
+def _default_parse_workers() -> int:
+    """
+    Procesoarele pe care le poate folosi acest proces (affinity / cpuset-ul
+    containerului, nu toate nucleele mașinii), cel mult 4: fiecare worker
+    gunicorn are propriul pool.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return min(cpus, 4)
+
+
+# Numărul de procese pentru parsarea în paralel a monitoarelor, în fiecare worker gunicorn (1 = fără pool)
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', _default_parse_workers()))
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+_job_pool = None
+
+# La câte secunde verifică fiecare worker dacă top_companii.json s-a schimbat (0 = doar la cerere)
+COMPANY_RELOAD_INTERVAL = int(os.environ.get('COMPANY_RELOAD_INTERVAL', '60'))
+# Tokenul pentru endpoint-urile de administrare (gol = dezactivate)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+_reload_pool = None
+_next_reload_check = 0.0
+
+# Câte secunde poate dura analiza unei cereri /api/process sau /analyze înainte de
+# a fi oprită cu un rezultat parțial / 503, sub timeout-ul gunicorn (0 = fără limită)
+REQUEST_TIME_BUDGET = float(os.environ.get('REQUEST_TIME_BUDGET', '90'))
+
+# Dimensiunea blocurilor în care e transmis raportul HTML
+REPORT_CHUNK_SIZE = 16 * 1024
+
 # Landing page HTML
 LANDING_PAGE = """
 <!DOCTYPE html>
@@ -252,25 +330,38 @@ LANDING_PAGE = """
             selectedFiles.forEach(f => formData.append('files', f));
             
             try {
-                const response = await fetch('/api/process', {
+                // Jobul rulează în fundal; starea e interogată până la final
+                const response = await fetch('/api/jobs', {
                     method: 'POST',
                     body: formData
                 });
+                let job = await response.json();
+                if (!response.ok) {
+                    throw new Error(job.error || 'Eroare la procesare');
+                }
+                
+                while (job.status === 'in_asteptare' || job.status === 'in_lucru') {
+                    status.textContent = 'Se procesează: ' + job.monitors_done + '/' + job.monitors_total +
+                        ' monitoare, ' + job.acts_found.toLocaleString('ro-RO') + ' acte găsite...';
+                    await new Promise(resolve => setTimeout(resolve, 1000));
+                    const poll = await fetch(job.status_url);
+                    job = await poll.json();
+                    if (!poll.ok) {
+                        throw new Error(job.error || 'Eroare la procesare');
+                    }
+                }
                 
-                if (response.ok) {
-                    const blob = await response.blob();
-                    const url = URL.createObjectURL(blob);
-                    const a = document.createElement('a');
-                    a.href = url;
-                    a.download = 'raport_mo_iv_' + new Date().toISOString().slice(0,10) + '.html';
-                    a.click();
-                    
-                    status.className = 'status success';
-                    status.textContent = '✅ Raport generat cu succes!';
-                } else {
-                    const err = await response.json();
-                    throw new Error(err.error || 'Eroare la procesare');
+                if (job.status !== 'gata') {
+                    throw new Error(job.error || 'Eroare la procesare');
                 }
+                
+                const a = document.createElement('a');
+                a.href = job.report_url;
+                a.download = job.download_name;
+                a.click();
+                
+                status.className = 'status success';
+                status.textContent = '✅ Raport generat cu succes!';
             } catch (err) {
                 status.className = 'status error';
                 status.textContent = '❌ ' + err.message;
@@ -284,37 +375,638 @@ LANDING_PAGE = """
 """
 
 
+def monitor_metadata(filename: str, html_content) -> Tuple[Optional[int], str]:
+    """
+    Numărul și data monitorului (conținutul poate fi str sau bytes / mmap).
+    Numărul este None dacă nu apare nici în numele fișierului, nici în conținut.
+    """
+    binary = not isinstance(html_content, str)
+    # Extrage numărul monitorului din filename sau din conținut
+    nr_match = re.search(r'(\d{2,4})', filename)
+    if nr_match:
+        nr_monitor = int(nr_match.group(1))
+    else:
+        # Încearcă să extragă din conținut
+        pattern = rb'nr\.\s*(\d+)\s*din' if binary else r'nr\.\s*(\d+)\s*din'
+        content_match = re.search(pattern, html_content, re.IGNORECASE)
+        nr_monitor = int(content_match.group(1)) if content_match else None
+    
+    # Extrage data din filename sau conținut
+    pattern = rb'(\d{1,2})\.(\d{1,2})\.(\d{4})' if binary else r'(\d{1,2})\.(\d{1,2})\.(\d{4})'
+    date_match = re.search(pattern, html_content)
+    if date_match:
+        parts = [part.decode('ascii') if binary else part for part in date_match.groups()]
+        data_mo = '.'.join(parts)
+    else:
+        data_mo = datetime.now().strftime("%d.%m.%Y")
+    return nr_monitor, data_mo
+
+
+def parse_upload(filename: str, raw: bytes) -> Tuple[Optional[int], str, List[Act]]:
+    """
+    Parsează un monitor uploadat (bytes sau fișier mapat). Returnează
+    (nr_monitor, data_mo, acte); nr_monitor este None dacă nu apare nici în
+    numele fișierului, nici în conținut. Monitorul nu e decodat integral:
+    parserul decodează doar actul curent.
+    """
+    nr_monitor, data_mo = monitor_metadata(filename, raw)
+    
+    # Parsează monitorul (sau îl ia din cache, dacă a mai fost văzut)
+    acts = cached_parse_monitor(raw, nr_monitor or 0, content=raw)
+    return nr_monitor, data_mo, acts
+
+
+def parse_in_worker(source, nr_monitor: int, deadline: Optional[float] = None) -> Tuple[List[Act], dict, int]:
+    """
+    parse_monitor rulat în pool; întoarce și timpii pe etape, pentru cererea
+    din worker. `source` e HTML-ul (str / bytes) sau calea unui fișier mapat;
+    `deadline` e termenul cererii, verificat și în proces între acte.
+    """
+    token = start_timing()
+    content = map_file(str(source)) if isinstance(source, Path) else source
+    try:
+        with deadline_at(deadline):
+            acts = parse_monitor(content, nr_monitor)
+        timings = current_timings()
+        return acts, timings.stages, timings.acts
+    finally:
+        close_upload(content)
+        stop_timing(token)
+
+
+def coalesce_chunks(chunks: Iterable[str], size: int = REPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Grupează bucățile mici ale raportului în blocuri de ~`size` caractere."""
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Pool-ul de procese pentru parsare al workerului gunicorn. E creat de
+    gunicorn.conf.py imediat după pornirea workerului, cât timp procesul nu
+    are alte threaduri (un fork dintr-un proces cu threaduri poate moșteni
+    lock-uri ținute de ele), apoi din nou după o reîncărcare a bazei TOP sau
+    după ce un proces de parsare a murit (BrokenProcessPool, vezi submit_to_pool).
+    Procesele sunt create prin fork, deci moștenesc baza TOP deja încărcată,
+    fără să recitească top_companii.json.
+    """
+    global _parse_pool
+    if PARSE_WORKERS <= 1:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # Indexul de trigrame e construit înainte de fork, ca să fie moștenit
+            get_fuzzy_index()
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context('fork')
+            )
+            # Cu fork, toate procesele sunt create la prima trimitere: acum, nu în timpul unei cereri
+            _parse_pool.submit(os.getpid).result()
+        return _parse_pool
+
+
+def retire_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Scoate `pool` din uz, dacă e încă pool-ul curent: parsările trimise deja se
+    termină în el, iar următoarele pornesc într-un pool nou (get_parse_pool).
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not pool:
+            return
+        _parse_pool = None
+    pool.shutdown(wait=False)
+
+
+def submit_to_pool(*args) -> Future:
+    """
+    parse_in_worker(*args) în pool-ul curent. Pool-ul poate fi înlocuit în
+    timpul unei cereri care trimite mai multe monitoare (reload_company_db),
+    deci e citit la fiecare trimitere; dacă a fost oprit chiar între citire și
+    trimitere sau e stricat (un proces de parsare a murit, de exemplu oprit de
+    OOM killer: parsările din el se termină cu BrokenProcessPool), e scos din
+    uz și monitorul e trimis o dată într-un pool nou.
+    """
+    pool = get_parse_pool()
+    try:
+        return pool.submit(parse_in_worker, *args)
+    except RuntimeError:
+        # "cannot schedule new futures after shutdown" sau BrokenProcessPool (subclasă de RuntimeError)
+        retire_parse_pool(pool)
+        return get_parse_pool().submit(parse_in_worker, *args)
+
+
+def reload_company_db(force: bool = False) -> bool:
+    """
+    Reîncarcă baza TOP în acest worker. Procesele pool-ului au moștenit versiunea
+    veche, deci pool-ul e înlocuit (retire_parse_pool).
+    """
+    if not reload_companies(force):
+        return False
+    pool = _parse_pool
+    if pool is not None:
+        retire_parse_pool(pool)
+    return True
+
+
+def schedule_company_reload(force: bool = False) -> Future:
+    """Reîncărcarea bazei TOP, rulată pe un thread separat, în afara cererilor."""
+    global _reload_pool
+    if _reload_pool is None:
+        _reload_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mo-iv-reload')
+    return _reload_pool.submit(reload_company_db, force)
+
+
+def submit_parse(html_content, nr_monitor: int,
+                 content: Optional[bytes] = None) -> Tuple[Optional[List[Act]], str, Optional[Future]]:
+    """
+    Actele din cache sau, pentru un monitor nou, parsarea lui trimisă în pool
+    (submit_to_pool).
+    Returnează (acte sau None, cheia din cache, future sau None).
+    Cache-ul e consultat în workerul gunicorn; în pool ajung doar monitoarele
+    noi, iar fișierele mapate ajung doar ca nume de fișier, nu ca și conținut.
+    """
+    start = time.perf_counter()
+    key = PARSE_CACHE.key(content if content is not None else html_content.encode('utf-8'))
+    acts = PARSE_CACHE.get(key, nr_monitor)
+    record_stage('cache', time.perf_counter() - start)
+    if acts is not None:
+        return acts, key, None
+    source = Path(html_content.path) if isinstance(html_content, MappedFile) else html_content
+    return None, key, submit_to_pool(source, nr_monitor, current_deadline())
+
+
+def collect_parse(key: str, future: Future) -> List[Act]:
+    """Rezultatul unei parsări din pool; timpii ajung în cererea curentă, actele în cache."""
+    acts, stages, parsed = future.result()
+    timings = current_timings()
+    if timings is not None:
+        timings.merge(stages)
+    record_volume(acts=parsed)
+    PARSE_CACHE.put(key, acts)
+    return acts
+
+
+def iter_parsed_uploads(uploads: List[Tuple[str, bytes]]) -> Iterator[Tuple[str, object]]:
+    """
+    Parsează fișierele uploadate și produce, în ordinea primită, (filename,
+    rezultat parse_upload) sau (filename, excepția apărută), fiecare de îndată
+    ce monitorul e gata; cu pool, toate monitoarele sunt trimise la parsare
+    la primul pas. Sub un buget de timp (time_budget), monitoarele oprite sau
+    nepornite la termen au ca rezultat BudgetExceeded.
+    """
+    if len(uploads) < 2 or get_parse_pool() is None:
+        for filename, raw in uploads:
+            try:
+                check_budget()
+                outcome = parse_upload(filename, raw)
+            except Exception as e:
+                outcome = e
+            yield filename, outcome
+        return
+    
+    submitted = []  # (filename, nr_monitor, data_mo, acte din cache, cheia din cache, future)
+    for filename, raw in uploads:
+        nr_monitor, data_mo = monitor_metadata(filename, raw)
+        acts, key, future = submit_parse(raw, nr_monitor or 0, content=raw)
+        submitted.append((filename, nr_monitor, data_mo, acts, key, future))
+    
+    for filename, nr_monitor, data_mo, acts, key, future in submitted:
+        if future is not None:
+            try:
+                # După termen, monitoarele încă nepornite nu mai pornesc; cele în lucru se opresc singure
+                if budget_left() == 0:
+                    future.cancel()
+                acts = collect_parse(key, future)
+            except CancelledError:
+                yield filename, BudgetExceeded('Monitorul nu a mai fost parsat înainte de termen')
+                continue
+            except Exception as e:
+                yield filename, e
+                continue
+        yield filename, (nr_monitor, data_mo, acts)
+
+
+def parse_uploads(uploads: List[Tuple[str, bytes]],
+                  progress: Optional[Callable[[str, object], None]] = None) -> List[Tuple[str, object]]:
+    """
+    Rezultatele iter_parsed_uploads, ca listă. `progress` e apelat cu fiecare
+    pereche pe măsură ce monitorul e gata.
+    """
+    results = []
+    for filename, outcome in iter_parsed_uploads(uploads):
+        if progress is not None:
+            progress(filename, outcome)
+        results.append((filename, outcome))
+    return results
+
+
+def number_monitor(nr_monitor: Optional[int], acts: List[Act], monitors_info: Dict[int, str]) -> int:
+    """Numărul monitorului în rezultat; unul fără număr primește următorul număr secvențial."""
+    if nr_monitor is None:
+        nr_monitor = len(monitors_info) + 1
+        for act in acts:
+            act.nr_monitor = nr_monitor
+    return nr_monitor
+
+
+def merge_results(results: List[Tuple[str, object]], errors: List[str]) -> Tuple[List[Act], Dict[int, str]]:
+    """
+    Combină rezultatele parse_uploads în ordinea uploadului; monitoarele fără
+    număr primesc unul secvențial. Erorile sunt adăugate în `errors`.
+    """
+    all_acts = []
+    monitors_info = {}
+    for filename, outcome in results:
+        if isinstance(outcome, Exception):
+            errors.append(f'{filename}: {str(outcome)}')
+            continue
+        nr_monitor, data_mo, acts = outcome
+        nr_monitor = number_monitor(nr_monitor, acts, monitors_info)
+        all_acts.extend(acts)
+        monitors_info[nr_monitor] = data_mo
+    return all_acts, monitors_info
+
+
+def monitor_int(value) -> int:
+    """Numărul monitorului trimis în JSON (int sau text), 0 dacă nu e valid."""
+    try:
+        nr_monitor = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    return nr_monitor if 0 < nr_monitor < 2 ** 32 else 0
+
+
+def archive_monitor(nr_monitor, data_mo: str, acts: List[Act], key: str) -> None:
+    """
+    Salvează monitorul în arhiva de acte. `key` e cheia din cache-ul de parsare,
+    care include versiunea parserului, deci un monitor reparsat cu alt cod e
+    rescris; monitoarele fără număr valid nu pot fi identificate și nu sunt salvate.
+    """
+    nr_monitor = monitor_int(nr_monitor)
+    if ACT_STORE is not None and nr_monitor:
+        ACT_STORE.ingest(nr_monitor, data_mo, acts, key)
+
+
+def archive_results(uploads: List[Tuple[str, bytes]], results: List[Tuple[str, object]]) -> None:
+    """Salvează în arhivă monitoarele parsate de parse_uploads (aceeași ordine ca uploadurile)."""
+    for (_, raw), (_, outcome) in zip(uploads, results):
+        if not isinstance(outcome, Exception):
+            archive_monitor(outcome[0], outcome[1], outcome[2], PARSE_CACHE.key(raw))
+
+
+def budget_split(results: List[Tuple[str, object]]) -> Tuple[List[str], List[str]]:
+    """
+    Fișierele parsate complet și cele oprite de bugetul de timp (vezi
+    parse_uploads); dacă există cele din urmă, cererea e numărată în metrici.
+    """
+    processed = [filename for filename, outcome in results if not isinstance(outcome, Exception)]
+    skipped = [filename for filename, outcome in results if isinstance(outcome, BudgetExceeded)]
+    if skipped:
+        record_budget_exceeded()
+    return processed, skipped
+
+
+def budget_exceeded_response(processed: List, skipped: List):
+    """Răspunsul 503 când bugetul de timp s-a terminat înainte de vreun rezultat utilizabil."""
+    return jsonify({
+        'error': f'Bugetul de timp al cererii ({REQUEST_TIME_BUDGET:g} s) a fost depășit',
+        'budget_seconds': REQUEST_TIME_BUDGET,
+        'monitors_processed': processed,
+        'monitors_skipped': skipped
+    }), 503
+
+
+def stream_response(chunks: Iterable[str], mimetype: str, headers: Dict[str, str],
+                    stage: Optional[str] = None) -> Response:
+    """
+    Răspuns transmis pe măsură ce e produs (chunked), comprimat din mers dacă
+    clientul acceptă gzip / br. Cu `stage`, timpul transmiterii, inclusiv
+    compresia, ajunge în /api/metrics la etapa respectivă (nu în Server-Timing).
+    """
+    body = coalesce_chunks(chunks)
+    encoding = negotiate(request.accept_encodings)
+    if encoding is not None:
+        body = iter_compressed(body, encoding)
+        headers = {**headers, 'Content-Encoding': encoding}
+    if stage is not None:
+        body = timed_iter(body, stage)
+    response = Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def export_response(uploads: List[Tuple[str, bytes]], errors: List[str], writer: ExportWriter) -> Response:
+    """
+    Actele monitoarelor în formatul lui `writer`, transmise monitor cu monitor,
+    în ordinea uploadului, de îndată ce fiecare e parsat. Parsarea rămâne sub
+    bugetul de timp al cererii; monitoarele neprocesate la termen apar ca erori.
+    """
+    deadline = current_deadline()
+    timings = RequestTimings()
+    parsed = zip(uploads, iter_parsed_uploads(uploads))
+    monitors_info = {}
+    
+    def export(upload: Tuple[str, bytes], filename: str, outcome: object) -> str:
+        if isinstance(outcome, Exception):
+            skipped = isinstance(outcome, BudgetExceeded)
+            if skipped:
+                record_budget_exceeded()
+            return writer.error(filename, str(outcome), skipped)
+        nr_monitor, data_mo, acts = outcome
+        archive_monitor(nr_monitor, data_mo, acts, PARSE_CACHE.key(upload[1]))
+        nr_monitor = number_monitor(nr_monitor, acts, monitors_info)
+        monitors_info[nr_monitor] = data_mo
+        start = time.perf_counter()
+        chunk = writer.acts(acts) + writer.monitor(
+            {'filename': filename, 'nr_monitor': nr_monitor, 'data_mo': data_mo, 'acts': len(acts)})
+        record_stage('export', time.perf_counter() - start)
+        return chunk
+    
+    def generate() -> Iterator[str]:
+        yield writer.start()
+        for message in errors:
+            filename, _, error = message.partition(': ')
+            yield writer.error(filename, error)
+        try:
+            while True:
+                with collecting(timings), deadline_at(deadline):
+                    item = next(parsed, None)
+                    if item is None:
+                        break
+                    upload, (filename, outcome) = item
+                    chunk = export(upload, filename, outcome)
+                yield chunk
+        finally:
+            METRICS.observe_work('process_monitors', timings)
+        yield writer.end()
+    
+    name = f'acte_mo_iv_{datetime.now().strftime("%Y%m%d_%H%M")}.{writer.extension}'
+    return stream_response(generate(), writer.mimetype, {'Content-Disposition': f'attachment; filename={name}'})
+
+
+def cached_json_response(name: str, payload: dict) -> Response:
+    """
+    Răspunsul JSON cu ETag puternic: cât timp conținutul nu se schimbă, varianta
+    comprimată e refolosită, iar clientul care o are deja primește 304.
+    """
+    body = cached_body(name, app.json.dumps(payload).encode('utf-8'))
+    encoding = negotiate(request.accept_encodings) if len(body.data) >= MIN_COMPRESS_BYTES else None
+    etag = body.etag(encoding)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body.get(encoding), mimetype='application/json')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def report_download_name() -> str:
+    return f'raport_mo_iv_{datetime.now().strftime("%Y%m%d_%H%M")}.html'
+
+
+def get_job_pool() -> ThreadPoolExecutor:
+    """Threadurile care rulează joburile acceptate de acest worker gunicorn."""
+    global _job_pool
+    if _job_pool is None:
+        _job_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='mo-iv-job')
+    return _job_pool
+
+
+def run_report_job(job_id: str) -> None:
+    """Parsează monitoarele jobului, actualizând progresul, și scrie raportul pe disc."""
+    token = start_timing()
+    uploads = []
+    try:
+        uploads = JOBS.uploads(job_id)
+        JOBS.update(job_id, status=IN_LUCRU)
+        progress = {'monitors_done': 0, 'acts_found': 0}
+        
+        def on_result(filename: str, outcome: object) -> None:
+            progress['monitors_done'] += 1
+            if not isinstance(outcome, Exception):
+                progress['acts_found'] += len(outcome[2])
+            JOBS.update(job_id, **progress)
+        
+        errors = JOBS.status(job_id)['errors']
+        results = parse_uploads(uploads, on_result)
+        archive_results(uploads, results)
+        all_acts, monitors_info = merge_results(results, errors)
+        if not all_acts:
+            JOBS.update(job_id, status=EROARE, errors=errors,
+                        error='Nu s-au putut procesa monitoarele')
+            return
+        
+        # Raportul e salvat și comprimat (gzip / br) o singură dată, la generare
+        start = time.perf_counter()
+        writer = PrecompressedWriter(JOBS.report_path(job_id))
+        for chunk in coalesce_chunks(iter_html_report(all_acts, monitors_info)):
+            writer.write(chunk)
+        digest = writer.close()
+        record_stage('raport', time.perf_counter() - start)
+        JOBS.update(job_id, status=GATA, errors=errors, download_name=report_download_name(), etag=digest)
+    except Exception as e:
+        print(f"[WARNING] Jobul {job_id} a eșuat: {e}")
+        if JOBS.status(job_id) is not None:
+            JOBS.update(job_id, status=EROARE, error=str(e))
+    finally:
+        JOBS.release(job_id)
+        for _, content in uploads:
+            close_upload(content)
+        timings = current_timings()
+        METRICS.observe_stages(timings.stages)
+        stop_timing(token)
+
+
+def job_response(status: dict) -> dict:
+    """Starea publică a jobului, cu link-urile utile."""
+    public = {k: v for k, v in status.items() if k not in ('files', 'owner')}
+    public['status_url'] = f"/api/jobs/{status['job_id']}"
+    if status['status'] == GATA:
+        public['report_url'] = f"/api/jobs/{status['job_id']}/report"
+    return public
+
+
+def iter_lines(stream, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Liniile unui flux binar, citit în blocuri mari (readline pe fluxul cererii
+    citește câte un byte). În memorie stă doar linia curentă.
+    """
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        start = len(buffer)
+        buffer += chunk
+        end = buffer.find(b'\n', start)
+        while end != -1:
+            yield bytes(buffer[:end + 1])
+            del buffer[:end + 1]
+            end = buffer.find(b'\n')
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_alerts(acts: List[Act], monitor_number) -> Iterator[dict]:
+    """Alertele pentru Apify: câte una pentru fiecare act al unei companii TOP."""
+    for act in acts:
+        if not act.in_top:
+            continue
+        # Companii din TOP cu operațiuni de interes major, apoi orice companie TOP
+        if act.is_high_interest:
+            motiv = f'Companie TOP #{act.rank} (CA: {act.ca:,} lei) - operațiune de interes major'
+        else:
+            motiv = f'Companie TOP #{act.rank} (CA: {act.ca:,} lei)'
+        yield {
+            'companie': act.denumire,
+            'cui': act.cui,
+            'nr_orc': act.nr_orc,
+            'euid': act.euid,
+            'capital_social': act.capital_social,
+            'sursa_top': act.sursa_top,
+            'operatiuni': act.operatiuni,
+            'operatiuni_ids': act.operatiuni_ids,
+            'motiv': motiv,
+            'monitor': monitor_number,
+            'categorie_ca': act.categorie_ca
+        }
+
+
+def monitor_summary(acts: List[Act], monitor_number, total_alerts: int) -> dict:
+    counts = count_flags(acts)
+    return {
+        'monitor': monitor_number,
+        'total_acts': len(acts),
+        'total_alerts': total_alerts,
+        'top_companies_found': counts['top'],
+        'high_interest_found': counts['high_interest_top']
+    }
+
+
+@app.before_request
+def start_request_timing():
+    g.request_start = time.perf_counter()
+    g.timing_token = start_timing()
+
+
+@app.before_request
+def watch_company_db():
+    """Cel mult o dată la COMPANY_RELOAD_INTERVAL secunde: reîncarcă baza TOP dacă JSON-ul s-a schimbat."""
+    global _next_reload_check
+    if COMPANY_RELOAD_INTERVAL <= 0 or time.monotonic() < _next_reload_check:
+        return
+    _next_reload_check = time.monotonic() + COMPANY_RELOAD_INTERVAL
+    if companies_changed():
+        schedule_company_reload()
+
+
+@app.after_request
+def compress_response(response):
+    """
+    Comprimă răspunsurile construite integral (JSON, text) pentru clienții care
+    acceptă gzip / br; fișierele și răspunsurile în stream sunt tratate de endpoint.
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE):
+        return response
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(request.accept_encodings)
+    if encoding is not None:
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.after_request
+def finish_request_timing(response):
+    """Antetul Server-Timing și metricile cererii."""
+    start = g.get('request_start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    timings = current_timings()
+    if timings is not None:
+        response.headers['Server-Timing'] = server_timing_header(timings, elapsed)
+    METRICS.observe_request(request.endpoint or 'necunoscut', elapsed, response.status_code, timings)
+    return response
+
+
+@app.teardown_request
+def stop_request_timing(exc=None):
+    token = g.pop('timing_token', None)
+    if token is not None:
+        stop_timing(token)
+    for content in g.pop('uploads', []):
+        close_upload(content)
+
+
 @app.route('/')
 def index():
-    return render_template_string(LANDING_PAGE, companies=f"{len(TOP_COMPANII):,}")
+    return render_template_string(LANDING_PAGE, companies=f"{len(company_db().companies):,}")
 
 
 @app.route('/api/health')
 def health():
+    """Starea serviciului, fără cache: fiecare răspuns are momentul curent."""
+    db = company_db()
     return jsonify({
         'status': 'ok',
         'version': '4.0',
-        'companies_loaded': len(TOP_COMPANII),
+        'companies_loaded': len(db.companies),
+        'companies_version': db.version,
+        'companies_loaded_at': datetime.fromtimestamp(db.loaded_at).isoformat() if db.loaded_at else None,
         'timestamp': datetime.now().isoformat()
     })
 
 
-@app.route('/api/process', methods=['POST'])
-def process_monitors():
-    """Procesează monitoarele uploadate și returnează raportul HTML."""
-    
+@app.route('/api/admin/reload-companies', methods=['POST'])
+def admin_reload_companies():
+    """
+    Reîncarcă top_companii.json în workerul care primește cererea (ceilalți îl
+    reîncarcă la următoarea verificare). Răspunde imediat; versiunea nouă apare
+    în /api/health după ce indexurile sunt construite.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Endpoint-urile de administrare sunt dezactivate (ADMIN_TOKEN)'}), 403
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {ADMIN_TOKEN}'):
+        return jsonify({'error': 'Token invalid'}), 401
+    schedule_company_reload(force=request.args.get('force', '').lower() in ('1', 'true'))
+    return jsonify({'status': 'reincarcare_programata', 'companies_version': company_db().version}), 202
+
+
+def read_uploads(errors: List[str]) -> Tuple[List[Tuple[str, bytes]], Optional[str]]:
+    """
+    Fișierele HTML din cererea multipart, ca (filename, conținut), și mesajul
+    de eroare dacă nu a fost trimis/selectat niciun fișier. Fișierele
+    respinse sunt trecute în `errors`. Fișierele mari sunt mapate de pe disc
+    (vezi upload_spool) și închise la sfârșitul cererii.
+    """
     if 'files' not in request.files:
-        return jsonify({'error': 'Nu au fost trimise fișiere'}), 400
+        return [], 'Nu au fost trimise fișiere'
     
     files = request.files.getlist('files')
     
     if not files or all(f.filename == '' for f in files):
-        return jsonify({'error': 'Nu au fost selectate fișiere'}), 400
-    
-    all_acts = []
-    monitors_info = {}
-    errors = []
+        return [], 'Nu au fost selectate fișiere'
     
+    uploads = []
     for file in files:
         if not file.filename:
             continue
@@ -325,68 +1017,260 @@ def process_monitors():
             errors.append(f'{filename}: nu este fișier HTML')
             continue
         
+        content = spool_upload(file.stream)
+        g.setdefault('uploads', []).append(content)
+        uploads.append((filename, content))
+    
+    record_volume(nbytes=sum(len(raw) for _, raw in uploads))
+    return uploads, None
+
+
+@app.route('/api/process', methods=['POST'])
+def process_monitors():
+    """
+    Procesează monitoarele uploadate și returnează raportul HTML sau, cu
+    format=json / csv / ndjson, actele parsate, transmise pe măsură ce fiecare
+    monitor e gata (fields=... alege câmpurile, de exemplu fără text_complet).
+    """
+    writer = None
+    export_format = request.values.get('format', 'html').lower()
+    if export_format != 'html':
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f'Format necunoscut: {export_format} (html, {", ".join(EXPORT_FORMATS)})'}), 400
         try:
-            # Citește conținutul
-            html_content = file.read().decode('utf-8')
-            
-            # Extrage numărul monitorului din filename sau din conținut
-            nr_match = re.search(r'(\d{2,4})', filename)
-            if nr_match:
-                nr_monitor = int(nr_match.group(1))
-            else:
-                # Încearcă să extragă din conținut
-                content_match = re.search(r'nr\.\s*(\d+)\s*din', html_content, re.IGNORECASE)
-                nr_monitor = int(content_match.group(1)) if content_match else len(monitors_info) + 1
-            
-            # Extrage data din filename sau conținut
-            date_match = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', html_content)
-            if date_match:
-                data_mo = f"{date_match.group(1)}.{date_match.group(2)}.{date_match.group(3)}"
-            else:
-                data_mo = datetime.now().strftime("%d.%m.%Y")
-            
-            # Parsează monitorul
-            acts = parse_monitor(html_content, nr_monitor)
-            all_acts.extend(acts)
-            monitors_info[nr_monitor] = data_mo
-            
-        except Exception as e:
-            errors.append(f'{filename}: {str(e)}')
+            writer = EXPORT_FORMATS[export_format](parse_fields(request.values.get('fields')))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    errors = []
+    with time_budget(REQUEST_TIME_BUDGET):
+        uploads, error = read_uploads(errors)
+        if error:
+            return jsonify({'error': error}), 400
+        if writer is not None:
+            return export_response(uploads, errors, writer)
+        
+        # Parsează monitoarele (în paralel când sunt mai multe) și combină
+        # rezultatele în ordinea uploadului
+        results = parse_uploads(uploads)
+    archive_results(uploads, results)
+    processed, skipped = budget_split(results)
+    all_acts, monitors_info = merge_results(results, errors)
     
     if not all_acts:
+        if skipped:
+            return budget_exceeded_response(processed, skipped)
         return jsonify({
             'error': 'Nu s-au putut procesa monitoarele',
             'details': errors
         }), 400
     
-    # Generează raportul
-    report_html = generate_html_report(all_acts, monitors_info)
-    
-    # Salvează temporar și trimite
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-        f.write(report_html)
-        temp_path = f.name
+    # Generează raportul și îl transmite pe măsură ce e produs (chunked);
+    # timpul raportului ajunge în /api/metrics, nu în Server-Timing
+    headers = {'Content-Disposition': f'attachment; filename={report_download_name()}'}
+    notice = None
+    if skipped:
+        notice = (f'bugetul de timp al cererii ({REQUEST_TIME_BUDGET:g} s) a fost depășit. '
+                  f'Monitoare procesate: {", ".join(processed)}. Neprocesate: {", ".join(skipped)}. '
+                  f'Pentru loturi mari folosiți /api/jobs.')
+        headers.update({
+            'X-Partial-Result': 'true',
+            'X-Monitors-Processed': ', '.join(processed),
+            'X-Monitors-Skipped': ', '.join(skipped),
+        })
+    return stream_response(iter_html_report(all_acts, monitors_info, notice), 'text/html', headers, 'raport')
+
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Varianta asincronă a /api/process: salvează fișierele, pornește jobul
+    în fundal și răspunde imediat cu id-ul lui.
+    """
+    errors = []
+    uploads, error = read_uploads(errors)
+    if error:
+        return jsonify({'error': error}), 400
+    if not uploads:
+        return jsonify({'error': 'Nu s-au putut procesa monitoarele', 'details': errors}), 400
     
-    return send_file(
-        temp_path,
-        mimetype='text/html',
-        as_attachment=True,
-        download_name=f'raport_mo_iv_{datetime.now().strftime("%Y%m%d_%H%M")}.html'
-    )
+    JOBS.expire()
+    job_id = JOBS.create(uploads)
+    if errors:
+        JOBS.update(job_id, errors=errors)
+    get_job_pool().submit(run_report_job, job_id)
+    return jsonify(job_response(JOBS.status(job_id))), 202
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Starea și progresul jobului (monitoare procesate, acte găsite)."""
+    status = JOBS.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job inexistent sau expirat'}), 404
+    return jsonify(job_response(status))
+
+
+@app.route('/api/jobs/<job_id>/report')
+def job_report(job_id):
+    """Raportul HTML al unui job terminat."""
+    status = JOBS.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job inexistent sau expirat'}), 404
+    if status['status'] != GATA:
+        return jsonify(job_response(status)), 409
+    # Varianta comprimată salvată la generare, cu ETag-ul ei; If-None-Match -> 304
+    path = JOBS.report_path(job_id)
+    encoding = negotiate(request.accept_encodings)
+    if encoding is not None and not os.path.exists(path + SUFFIXES[encoding]):
+        encoding = None
+    response = send_file(path + SUFFIXES.get(encoding, ''), mimetype='text/html', as_attachment=True,
+                         download_name=status['download_name'],
+                         etag=representation_etag(status['etag'], encoding) if 'etag' in status else True)
+    response.vary.add('Accept-Encoding')
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 
 @app.route('/api/stats')
 def stats():
     """Returnează statistici despre sistemul de analiză."""
-    return jsonify({
+    return cached_json_response('stats', {
         'version': '4.0',
-        'companies_in_database': len(TOP_COMPANII),
+        'companies_in_database': len(company_db().companies),
         'noise_operations': list(NOISE_OPERATIONS),
         'high_interest_operations': list(HIGH_INTEREST_OPERATIONS),
+        'parse_cache': PARSE_CACHE.stats(),
         'developer': 'Adrian Seceleanu'
     })
 
 
+@app.route('/api/metrics')
+def metrics():
+    """Metrici agregate din toți workerii, în format text Prometheus."""
+    return Response(METRICS.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+def store_filters() -> Dict[str, str]:
+    """Filtrele arhivei din query string (vezi act_store.FILTERS)."""
+    return {name: request.args[name] for name in FILTERS if name in request.args}
+
+
+@app.route('/api/acts')
+def list_acts():
+    """
+    Actele din arhivă, filtrate după cui, tip_operatiune_id (operațiunea
+    principală), operatiune (oricare dintre operațiunile actului), categorie_ca,
+    nr_monitor, an, in_top, is_high_interest, rank_max, de_la / pana_la (AAAA-LL-ZZ).
+    Paginare prin limit (implicit 100, maxim 1000) și offset.
+    """
+    if ACT_STORE is None:
+        return jsonify({'error': 'Arhiva de acte este dezactivată'}), 404
+    filters = store_filters()
+    try:
+        # LIMIT negativ înseamnă „fără limită” în SQLite
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+        offset = int(request.args.get('offset', 0))
+        if offset < 0:
+            raise ValueError('offset negativ')
+        total = ACT_STORE.count(filters)
+        acts = [{**act.to_dict(), 'operatiuni': act.operatiuni_ids}
+                for act in ACT_STORE.iter_acts(filters, limit, offset)]
+    except ValueError as e:
+        return jsonify({'error': f'Filtru invalid: {e}'}), 400
+    return jsonify({'total': total, 'limit': limit, 'offset': offset, 'acts': acts})
+
+
+@app.route('/api/monitors')
+def list_monitors():
+    """Monitoarele salvate în arhivă."""
+    if ACT_STORE is None:
+        return jsonify({'error': 'Arhiva de acte este dezactivată'}), 404
+    return jsonify({'monitors': ACT_STORE.monitors()})
+
+
+@app.route('/api/acts/report')
+def store_report():
+    """Raportul HTML pentru actele din arhivă care îndeplinesc filtrele, fără reparsare."""
+    if ACT_STORE is None:
+        return jsonify({'error': 'Arhiva de acte este dezactivată'}), 404
+    # Actele sunt citite pe bucăți și adăugate la raport monitor cu monitor,
+    # deci în memorie e un singur monitor, nu toată arhiva
+    state = ReportState()
+    try:
+        for year, nr_monitor, data_mo, acts in ACT_STORE.iter_monitors(store_filters()):
+            state.add_monitor(nr_monitor, data_mo, acts, year)
+    except ValueError as e:
+        return jsonify({'error': f'Filtru invalid: {e}'}), 400
+    if not state.monitors:
+        return jsonify({'error': 'Niciun act în arhivă pentru filtrele date'}), 404
+    return stream_response(state.iter_html(), 'text/html',
+                           {'Content-Disposition': f'attachment; filename={report_download_name()}'}, 'raport')
+
+
+@app.route('/api/reports/<report_id>/monitors', methods=['POST'])
+def add_report_monitors(report_id):
+    """
+    Adaugă monitoarele uploadate la raportul incremental `report_id` (creat la
+    primul monitor). Sunt parsate doar monitoarele noi; un monitor trimis din
+    nou își înlocuiește partea din raport.
+    """
+    if not REPORTS.valid_id(report_id):
+        return jsonify({'error': 'Id de raport invalid (litere, cifre, ".", "_", "-"; cel mult 64)'}), 400
+    
+    errors = []
+    with time_budget(REQUEST_TIME_BUDGET):
+        uploads, error = read_uploads(errors)
+        if error:
+            return jsonify({'error': error}), 400
+        results = parse_uploads(uploads)
+        archive_results(uploads, results)
+    
+    REPORTS.expire()
+    added = []
+    for filename, outcome in results:
+        if isinstance(outcome, Exception):
+            if isinstance(outcome, BudgetExceeded):
+                record_budget_exceeded()
+            errors.append(f'{filename}: {str(outcome)}')
+            continue
+        nr_monitor, data_mo, acts = outcome
+        if nr_monitor is None:
+            errors.append(f'{filename}: numărul monitorului nu a putut fi determinat')
+            continue
+        REPORTS.add(report_id, monitor_report(nr_monitor, data_mo, acts))
+        added.append({'filename': filename, 'nr_monitor': nr_monitor, 'data_mo': data_mo, 'acts': len(acts)})
+    
+    return jsonify({
+        'report_id': report_id,
+        'added': added,
+        'errors': errors,
+        'monitors': REPORTS.monitors(report_id),
+    }), 200 if added else 400
+
+
+@app.route('/api/reports/<report_id>')
+def report_state_html(report_id):
+    """Raportul HTML incremental, compus din părțile salvate ale monitoarelor."""
+    try:
+        state = REPORTS.load(report_id) if REPORTS.valid_id(report_id) else None
+    except ValueError as e:
+        return jsonify({'error': f'{e}; monitoarele trebuie adăugate din nou'}), 409
+    if state is None:
+        return jsonify({'error': 'Raport inexistent sau expirat'}), 404
+    return stream_response(state.iter_html(), 'text/html',
+                           {'Content-Disposition': f'attachment; filename={report_download_name()}'}, 'raport')
+
+
+@app.route('/api/reports/<report_id>', methods=['DELETE'])
+def delete_report(report_id):
+    """Șterge raportul incremental."""
+    if not REPORTS.delete(report_id):
+        return jsonify({'error': 'Raport inexistent sau expirat'}), 404
+    return jsonify({'report_id': report_id, 'status': 'sters'})
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze_for_apify():
     """
@@ -394,7 +1278,10 @@ def analyze_for_apify():
     Primește HTML și returnează analiză JSON cu alerte.
     """
     try:
+        start = time.perf_counter()
         data = request.get_json()
+        record_stage('decodare', time.perf_counter() - start)
+        record_volume(nbytes=request.content_length or 0)
         
         if not data or 'html' not in data:
             return jsonify({'error': 'Missing html field'}), 400
@@ -402,52 +1289,105 @@ def analyze_for_apify():
         html_content = data['html']
         monitor_number = data.get('monitor', 0)
         
-        # Parsează monitorul
-        acts = parse_monitor(html_content, monitor_number)
+        # Parsează monitorul (reîncercările webhook-ului vin din cache)
+        content = html_content.encode('utf-8')
+        with time_budget(REQUEST_TIME_BUDGET):
+            acts = cached_parse_monitor(html_content, monitor_int(monitor_number), content=content)
+        archive_monitor(monitor_number, monitor_metadata('', html_content)[1], acts, PARSE_CACHE.key(content))
         
         # Generează alertele pentru Apify
-        alerts = []
-        for act in acts:
-            # Alertă pentru companii din TOP cu operațiuni de interes major
-            if act.in_top and act.is_high_interest:
-                alerts.append({
-                    'companie': act.denumire,
-                    'cui': act.cui,
-                    'operatiuni': [act.tip_operatiune],
-                    'motiv': f'Companie TOP #{act.rank} (CA: {act.ca:,} lei) - operațiune de interes major',
-                    'monitor': monitor_number,
-                    'categorie_ca': act.categorie_ca
-                })
-            # Alertă pentru orice companie TOP (chiar și fără operațiuni majore)
-            elif act.in_top:
-                alerts.append({
-                    'companie': act.denumire,
-                    'cui': act.cui,
-                    'operatiuni': [act.tip_operatiune],
-                    'motiv': f'Companie TOP #{act.rank} (CA: {act.ca:,} lei)',
-                    'monitor': monitor_number,
-                    'categorie_ca': act.categorie_ca
-                })
+        alerts = list(iter_alerts(acts, monitor_number))
         
         return jsonify({
-            'monitor': monitor_number,
-            'total_acts': len(acts),
-            'total_alerts': len(alerts),
-            'alerts': alerts,
-            'top_companies_found': sum(1 for a in acts if a.in_top),
-            'high_interest_found': sum(1 for a in acts if a.in_top and a.is_high_interest)
+            **monitor_summary(acts, monitor_number, len(alerts)),
+            'alerts': alerts
         })
         
+    except BudgetExceeded:
+        # Un monitor oprit la jumătate nu dă alerte complete, deci nu e returnat parțial
+        record_budget_exceeded()
+        return budget_exceeded_response([], [monitor_number])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Varianta batch a /analyze: corpul e NDJSON, câte un monitor pe linie
+    ({"html": ..., "monitor": ...}). Monitoarele sunt analizate pe măsură
+    ce liniile sosesc, iar răspunsul e tot NDJSON, în ordinea liniilor: câte
+    o linie {"type": "alert", ...} pentru fiecare companie TOP, apoi
+    {"type": "summary", ...} pentru monitor ({"type": "error", ...} pentru
+    liniile invalide). Cu pool de parsare, cel mult PARSE_WORKERS monitoare
+    sunt în lucru simultan, deci memoria nu crește cu mărimea batch-ului.
+    """
+    stream = request.stream
+    pooled = get_parse_pool() is not None
+    in_flight = PARSE_WORKERS if pooled else 0
+    
+    def start(line_number: int, line: bytes) -> dict:
+        item = {'line': line_number, 'timings': RequestTimings()}
+        with collecting(item['timings']):
+            try:
+                begin = time.perf_counter()
+                data = json.loads(line)
+                record_stage('decodare', time.perf_counter() - begin)
+                record_volume(nbytes=len(line))
+                if not isinstance(data, dict) or 'html' not in data:
+                    raise ValueError('Missing html field')
+                item['monitor'] = data.get('monitor', 0)
+                item['data_mo'] = monitor_metadata('', data['html'])[1]
+                content = data['html'].encode('utf-8')
+                if not pooled:
+                    item['acts'] = cached_parse_monitor(data['html'], monitor_int(item['monitor']), content=content)
+                    item['key'] = PARSE_CACHE.key(content)
+                else:
+                    item['acts'], item['key'], item['future'] = submit_parse(
+                        data['html'], monitor_int(item['monitor']), content=content)
+            except Exception as e:
+                item['error'] = e
+        return item
+    
+    def finish(item: dict) -> str:
+        with collecting(item['timings']):
+            try:
+                if 'error' in item:
+                    raise item['error']
+                acts = item['acts']
+                if item.get('future') is not None:
+                    acts = collect_parse(item['key'], item['future'])
+                archive_monitor(item['monitor'], item['data_mo'], acts, item['key'])
+                records = [app.json.dumps({'type': 'alert', **alert}) + '\n'
+                           for alert in iter_alerts(acts, item['monitor'])]
+                records.append(app.json.dumps({
+                    'type': 'summary', **monitor_summary(acts, item['monitor'], len(records))
+                }) + '\n')
+            except Exception as e:
+                records = [app.json.dumps({'type': 'error', 'line': item['line'], 'error': str(e)}) + '\n']
+        METRICS.observe_work('analyze_batch', item['timings'])
+        return ''.join(records)
+    
+    def generate() -> Iterator[str]:
+        pending = deque()
+        for line_number, line in enumerate(iter_lines(stream), 1):
+            if not line.strip():
+                continue
+            pending.append(start(line_number, line))
+            while len(pending) > in_flight:
+                yield finish(pending.popleft())
+        while pending:
+            yield finish(pending.popleft())
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'false').lower() == 'true'
     
     print(f"[INFO] Starting MO IV Analyzer v4.0")
-    print(f"[INFO] Companies loaded: {len(TOP_COMPANII):,}")
+    print(f"[INFO] Companies loaded: {len(company_db().companies):,}")
     print(f"[INFO] Port: {port}")
     
     app.run(host='0.0.0.0', port=port, debug=debug)
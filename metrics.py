@@ -0,0 +1,289 @@
+"""
+Metrici de performanță
+- cronometre pe etape pentru cererea curentă, trimise în antetul Server-Timing
+- histograme de latență și contoare (acte, bytes, erori, bugete de timp
+  depășite), agregate între
+  workerii gunicorn prin câte un fișier JSON per proces în METRICS_DIR (rescris
+  cel mult o dată la METRICS_FLUSH_INTERVAL secunde) și expuse în format text
+  Prometheus
+"""
+
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterable, Iterator, Optional
+
+# Etapele cronometrate; segmentare = parsarea fără identificatori, detecție și TOP
+STAGES = ('decodare', 'cache', 'segmentare', 'identificatori', 'detectie', 'top', 'raport')
+PARSE_STAGES = ('segmentare', 'identificatori', 'detectie', 'top')
+
+# Limitele (secunde) histogramei de latență a cererilor
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Directorul în care fiecare proces își scrie contoarele
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'mo-iv-metrics'))
+
+# La câte secunde sunt salvate contoarele modificate ale procesului
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+
+
+class RequestTimings:
+    """Timpii pe etape și volumul procesat în cererea curentă."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.acts = 0
+        self.bytes = 0
+        self.budget_exceeded = False
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, float]) -> None:
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def start_timing() -> Token:
+    """Începe colectarea timpilor pentru cererea (sau sarcina) curentă."""
+    return _current.set(RequestTimings())
+
+
+def stop_timing(token: Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def collecting(timings: RequestTimings) -> Iterator[RequestTimings]:
+    """Colectează în `timings` pe durata blocului (pentru lucru din afara cererii)."""
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Adaugă timpul unei etape; fără colectare activă nu face nimic."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+def record_volume(acts: int = 0, nbytes: int = 0) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.acts += acts
+        timings.bytes += nbytes
+
+
+def record_budget_exceeded() -> None:
+    """Marchează cererea curentă ca oprită de bugetul de timp (vezi time_budget)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.budget_exceeded = True
+
+
+def server_timing_header(timings: RequestTimings, total: float) -> str:
+    """Valoarea antetului Server-Timing (durate în milisecunde)."""
+    parts = [f'{stage};dur={timings.stages[stage] * 1000:.2f}' for stage in STAGES if stage in timings.stages]
+    parts.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(parts)
+
+
+def _empty_state() -> dict:
+    return {'requests': {}, 'stages': {}, 'acts': {}, 'bytes': {}, 'errors': {}, 'budget_exceeded': {}}
+
+
+def _merge_state(into: dict, state: dict) -> None:
+    for endpoint, hist in state.get('requests', {}).items():
+        target = into['requests'].setdefault(endpoint, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+        target['buckets'] = [a + b for a, b in zip(target['buckets'], hist['buckets'])]
+        target['sum'] += hist['sum']
+        target['count'] += hist['count']
+    for key in ('stages', 'acts', 'bytes', 'errors', 'budget_exceeded'):
+        for label, value in state.get(key, {}).items():
+            into[key][label] = into[key].get(label, 0) + value
+
+
+class MetricsRegistry:
+    """
+    Contoarele procesului curent, salvate periodic în METRICS_DIR/<pid>-<pornire>.json.
+
+    Un thread salvează contoarele la METRICS_FLUSH_INTERVAL secunde dacă s-au
+    modificat (și o dată la oprirea procesului), nu după fiecare cerere. Momentul
+    pornirii din numele fișierului împiedică un proces nou cu un pid refolosit să
+    suprascrie fișierul unui worker oprit (contoarele ar scădea).
+    """
+
+    def __init__(self, directory: str, flush_interval: float = METRICS_FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        # Un proces nou (fork) pornește cu contoare goale și cu propriul fișier
+        self._lock = threading.Lock()
+        self._state = _empty_state()
+        self._dirty = False
+        self._flush_thread: Optional[threading.Thread] = None
+        self._path = os.path.join(self.directory, f'{os.getpid()}-{time.time_ns() // 1_000_000}.json')
+
+    def _changed(self) -> None:
+        """Marchează contoarele ca modificate; apelat cu self._lock luat."""
+        self._dirty = True
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(target=self._flush_loop, name='mo-iv-metrics-flush', daemon=True)
+            self._flush_thread.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def observe_request(self, endpoint: str, seconds: float, status: int, timings: Optional[RequestTimings]) -> None:
+        with self._lock:
+            hist = self._state['requests'].setdefault(
+                endpoint, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += seconds
+            hist['count'] += 1
+            if status >= 400:
+                self._state['errors'][endpoint] = self._state['errors'].get(endpoint, 0) + 1
+            if timings is not None:
+                self._add_work(endpoint, timings)
+            self._changed()
+
+    def observe_work(self, endpoint: str, timings: RequestTimings) -> None:
+        """Lucru făcut în afara ciclului cererii (de ex. în timp ce răspunsul e transmis în stream)."""
+        with self._lock:
+            self._add_work(endpoint, timings)
+            self._changed()
+
+    def _add_work(self, endpoint: str, timings: RequestTimings) -> None:
+        self._add_stages(timings.stages)
+        if timings.acts:
+            self._state['acts'][endpoint] = self._state['acts'].get(endpoint, 0) + timings.acts
+        if timings.bytes:
+            self._state['bytes'][endpoint] = self._state['bytes'].get(endpoint, 0) + timings.bytes
+        if timings.budget_exceeded:
+            counts = self._state['budget_exceeded']
+            counts[endpoint] = counts.get(endpoint, 0) + 1
+
+    def observe_stages(self, stages: Dict[str, float]) -> None:
+        """Timpi măsurați după încheierea cererii (de ex. raportul transmis în stream)."""
+        with self._lock:
+            self._add_stages(stages)
+            self._changed()
+
+    def _add_stages(self, stages: Dict[str, float]) -> None:
+        for stage, seconds in stages.items():
+            self._state['stages'][stage] = self._state['stages'].get(stage, 0.0) + seconds
+
+    def flush(self) -> None:
+        """Scrie atomic contoarele procesului, dacă s-au modificat; erorile de disc nu afectează cererile."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._state)
+            path = self._path
+            self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            with self._lock:
+                self._dirty = True
+            print(f"[WARNING] Metricile nu pot fi salvate în {self.directory}: {e}")
+
+    def collect(self) -> dict:
+        """Contoarele tuturor workerilor (inclusiv cei opriți între timp)."""
+        merged = _empty_state()
+        with self._lock:
+            own = self._path
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    _merge_state(merged, json.load(f))
+            except (OSError, ValueError):
+                continue
+        with self._lock:
+            _merge_state(merged, self._state)
+        return merged
+
+    def render_prometheus(self) -> str:
+        state = self.collect()
+        lines = [
+            '# HELP mo_iv_request_duration_seconds Durata cererilor HTTP.',
+            '# TYPE mo_iv_request_duration_seconds histogram',
+        ]
+        for endpoint, hist in sorted(state['requests'].items()):
+            for bound, count in zip(LATENCY_BUCKETS, hist['buckets']):
+                lines.append(f'mo_iv_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+            lines.append(f'mo_iv_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist["count"]}')
+            lines.append(f'mo_iv_request_duration_seconds_sum{{endpoint="{endpoint}"}} {hist["sum"]:.6f}')
+            lines.append(f'mo_iv_request_duration_seconds_count{{endpoint="{endpoint}"}} {hist["count"]}')
+
+        lines += ['# HELP mo_iv_stage_seconds_total Timpul petrecut în fiecare etapă a analizei.',
+                  '# TYPE mo_iv_stage_seconds_total counter']
+        lines += [f'mo_iv_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}'
+                  for stage, seconds in sorted(state['stages'].items())]
+
+        for key, name, help_text in (
+            ('acts', 'mo_iv_acts_processed_total', 'Acte parsate.'),
+            ('bytes', 'mo_iv_bytes_processed_total', 'Bytes de HTML primiți spre analiză.'),
+            ('errors', 'mo_iv_errors_total', 'Cereri terminate cu status >= 400.'),
+            ('budget_exceeded', 'mo_iv_budget_exceeded_total', 'Cereri oprite de bugetul de timp (rezultat parțial sau 503).'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            lines += [f'{name}{{endpoint="{endpoint}"}} {value}' for endpoint, value in sorted(state[key].items())]
+
+        parse_seconds = sum(state['stages'].get(stage, 0.0) for stage in PARSE_STAGES)
+        acts = sum(state['acts'].values())
+        lines += ['# HELP mo_iv_acts_per_second Debitul mediu al parsării (acte / secundă de parsare).',
+                  '# TYPE mo_iv_acts_per_second gauge',
+                  f'mo_iv_acts_per_second {acts / parse_seconds if parse_seconds else 0:.1f}']
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry(METRICS_DIR)
+
+
+def timed_iter(iterable: Iterable[str], stage: str) -> Iterator[str]:
+    """Transmite elementele mai departe și înregistrează timpul petrecut producându-le."""
+    elapsed = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                break
+            elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        METRICS.observe_stages({stage: elapsed})
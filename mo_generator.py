@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Generator de monitoare MO IV sintetice
+Produce HTML în formatul Monitorului Oficial Partea a IV-a, cu număr de acte,
+mix de operațiuni, proporție de acte cu CUI și de companii TOP configurabile.
+Folosit de benchmark.py și de teste; determinist pentru același seed.
+PATHOLOGICAL_HTML produce HTML malformat pentru segmentare.
+
+Utilizare:
+    python mo_generator.py [nr_acte] [fișier.html]
+"""
+
+import random
+import re
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+# Formulări tipice pentru fiecare operațiune; {n}, {data}, {suma}, {persoana},
+# {oras} sunt completate aleator. Fiecare e detectată ca operațiunea ei.
+OPERATION_PHRASES: Dict[str, List[str]] = {
+    "majorare_capital_conversie_creanta": [
+        "Se aprobă majorarea capitalului social cu {suma} lei prin capitalizarea creanței "
+        "asociatului {persoana} rezultate din împrumuturile acordate societății.",
+    ],
+    "dizolvare_lichidare": [
+        "Se aprobă dizolvarea și lichidarea simultană a societății, conform art. 235 din Legea nr. 31/1990.",
+        "Dizolvarea societății fără lichidator, activul fiind repartizat asociaților.",
+    ],
+    "cesiune_cooptare": [
+        "Se aprobă cesiunea a {n} părți sociale către {persoana} și cooptarea acestuia în societate.",
+    ],
+    "majorare_capital": [
+        "Se aprobă majorarea capitalului social de la 200 lei la {suma} lei prin aport în numerar.",
+        "Mărirea capitalului social cu suma de {suma} lei, prin emiterea de noi acțiuni.",
+    ],
+    "reducere_capital": [
+        "Se aprobă reducerea capitalului social de la {suma} lei la 200 lei.",
+    ],
+    "aport_natura": [
+        "Asociatul {persoana} aduce aport în natură un teren situat în {oras}, evaluat la {suma} lei.",
+    ],
+    "cesiune_parti_sociale": [
+        "Act adițional: cesiunea a {n} părți sociale de la {persoana} către un nou asociat.",
+        "Cedentul {persoana} transmite 100% din părțile deținute.",
+    ],
+    "contractare_credit": [
+        "Se aprobă contractarea unui credit în valoare de {suma} lei de la o bancă comercială.",
+    ],
+    "constituire_garantii": [
+        "Se aprobă constituirea unei ipoteci asupra imobilelor din {oras} în favoarea băncii finanțatoare.",
+    ],
+    "repartizare_dividende": [
+        "Se aprobă distribuirea de dividende în sumă de {suma} lei din rezultatul exercițiului.",
+    ],
+    "fuziune_absorbtie": [
+        "Se aprobă proiectul de fuziune prin absorbție a societății {persoana} GRUP de către societate.",
+    ],
+    "fuziune": [
+        "Se aprobă fuziunea cu societatea {persoana} HOLDING, conform proiectului depus.",
+    ],
+    "divizare": [
+        "Se aprobă divizarea parțială a societății, cu transmiterea unei părți din patrimoniu.",
+    ],
+    "dizolvare": [
+        "Se aprobă dizolvarea voluntară a societății începând cu data de {data}.",
+    ],
+    "lichidare": [
+        "Se aprobă bilanțul final de lichidare și repartizarea activului rămas.",
+    ],
+    "transformare_forma": [
+        "Se aprobă transformarea societății din societate cu răspundere limitată în societate pe acțiuni, "
+        "cu schimbarea formei juridice.",
+    ],
+    "schimbare_sediu": [
+        "Se aprobă schimbarea sediului social din {oras} în municipiul București, sector 1.",
+        "Mutarea sediului în {oras}, str. Republicii nr. {n}.",
+    ],
+    "deschidere_punct_lucru": [
+        "Se aprobă înființarea unui punct de lucru în {oras}, str. Unirii nr. {n}.",
+    ],
+    "inchidere_punct_lucru": [
+        "Se aprobă închiderea punctului de lucru din {oras}.",
+    ],
+    "numire_administrator": [
+        "Numirea în funcția de administrator a domnului {persoana} pentru un mandat de 4 ani.",
+    ],
+    "revocare_administrator": [
+        "Se aprobă revocarea din funcția de administrator a domnului {persoana}.",
+    ],
+    "prelungire_mandat": [
+        "Prelungirea mandatului administratorului unic {persoana} până la {data}.",
+    ],
+    "schimbare_reprezentant": [
+        "Se aprobă schimbarea reprezentantului permanent al persoanei juridice.",
+    ],
+    "retragere_asociat": [
+        "Retragerea din societate a asociatului {persoana}, cu plata contravalorii părților.",
+    ],
+    "cooptare_asociat": [
+        "Se aprobă cooptarea doamnei {persoana} în calitate de nou membru.",
+    ],
+    "actualizare_caen": [
+        "Actualizarea obiectului de activitate conform CAEN Rev. 3 prin declarație pe propria răspundere.",
+        "Codurile CAEN se recodifică potrivit Ordinului INS nr. 377/2024.",
+    ],
+    "completare_activitati": [
+        "Completarea obiectului secundar de activitate cu codurile 4120 și 4399.",
+    ],
+    "radiere_activitati": [
+        "Radierea activității secundare 4711 din obiectul de activitate.",
+    ],
+    "modificare_obiect_activitate": [
+        "Se modifică obiectul principal de activitate al societății.",
+    ],
+    "actualizare_date": [
+        "Actualizarea datelor de identificare ale asociatului {persoana}.",
+    ],
+    "modificare_durata": [
+        "Durata de funcționare a societății devine nedeterminată.",
+    ],
+    "schimbare_denumire": [
+        "Se aprobă schimbarea denumirii societății.",
+    ],
+    "hotarare_aga": [
+        "Hotărârea adunării generale a acționarilor privind aprobarea situațiilor financiare anuale.",
+    ],
+    "decizie_asociat": [
+        "Decizie a asociatului unic privind aprobarea bugetului pentru anul următor.",
+    ],
+}
+
+# Mix implicit (ponderi), apropiat de frecvențele din monitoarele reale:
+# multe actualizări CAEN și schimbări administrative, puține operațiuni majore
+DEFAULT_OPERATION_MIX: Dict[str, float] = {
+    "actualizare_caen": 30, "schimbare_sediu": 8, "numire_administrator": 7,
+    "cesiune_parti_sociale": 7, "completare_activitati": 6, "majorare_capital": 4,
+    "revocare_administrator": 3, "prelungire_mandat": 3, "retragere_asociat": 3,
+    "deschidere_punct_lucru": 3, "hotarare_aga": 3, "decizie_asociat": 3,
+    "dizolvare_lichidare": 2, "dizolvare": 2, "lichidare": 2, "actualizare_date": 2,
+    "constituire_garantii": 1.5, "contractare_credit": 1.5, "inchidere_punct_lucru": 1,
+    "radiere_activitati": 1, "modificare_obiect_activitate": 1, "schimbare_denumire": 1,
+    "repartizare_dividende": 1, "aport_natura": 0.5, "reducere_capital": 0.5,
+    "cesiune_cooptare": 0.5, "cooptare_asociat": 0.5, "transformare_forma": 0.5,
+    "modificare_durata": 0.5, "schimbare_reprezentant": 0.5, "fuziune_absorbtie": 0.3,
+    "fuziune": 0.3, "divizare": 0.2, "majorare_capital_conversie_creanta": 0.2,
+}
+
+_SYLLABLES = ['AL', 'BO', 'CA', 'DE', 'FI', 'GA', 'IN', 'LU', 'MA', 'NO', 'PE', 'RA',
+              'SI', 'TO', 'VE', 'ZA', 'TRANS', 'AGRO', 'CON', 'TEH', 'MED', 'SERV']
+_WORDS = ['GRUP', 'IMPEX', 'COM', 'CONSTRUCT', 'LOGISTIC', 'TRADING', 'INVEST',
+          'DISTRIBUTION', 'CONSULTING', 'SOLUTIONS', 'PROD', 'TRANS']
+_SUFFIXES = ['S.R.L.', 'SRL', 'S.A.', 'S.R.L.', 'S.R.L.']
+_PERSONS = ['POPESCU ION', 'IONESCU MARIA', 'POPA VASILE', 'STAN ELENA', 'DUMITRU ANDREI',
+            'CONSTANTIN ANA', 'GHEORGHE MIHAI', 'RUSU IOANA', 'MARIN GABRIEL']
+_CITIES = ['Pitești', 'Cluj-Napoca', 'Iași', 'Timișoara', 'Constanța', 'Brașov',
+           'Craiova', 'Ghimpați, județul Giurgiu', 'Sibiu', 'Oradea']
+_PREAMBLES = [
+    "Hotărârea nr. {n} din {data} a adunării generale a asociaților.",
+    "Decizia nr. {n} din {data} a asociatului unic.",
+    "Act adițional nr. {n} din {data}.",
+    "Extras din hotărârea nr. {n} din {data}.",
+]
+# Operațiunile generice sunt recunoscute chiar după preambul, deci nu îl primesc
+_NO_PREAMBLE = {"hotarare_aga", "decizie_asociat"}
+# Antetele actelor din MO conțin mereu forma juridică
+_LEGAL_FORM = re.compile(r'S\.R\.L\.|SRL|S\.A\.|SA|S\.C\.S\.|SCS', re.IGNORECASE)
+_ORC_NOTICE = ("Oficiul Registrului Comerțului de pe lângă Tribunalul {oras}: certificat de "
+               "înregistrare a mențiunilor nr. {n} din {data}.")
+_CUI_KEY = "753217532"
+
+
+@dataclass
+class SyntheticAct:
+    """Un act generat, cu valorile așteptate la parsare."""
+    denumire: str
+    cui: Optional[str]
+    operatiune: str
+    text: str
+    in_top: bool
+    orc_notice: bool = False
+
+
+def make_cui(rng: random.Random) -> str:
+    """Un CUI aleator cu cifră de control validă."""
+    body = str(rng.randint(100000, 99999999))
+    key = _CUI_KEY[-len(body):]
+    control = sum(int(d) * int(k) for d, k in zip(body, key)) * 10 % 11 % 10
+    return body + str(control)
+
+
+def _fill(template: str, rng: random.Random, data: str) -> str:
+    return template.format(
+        n=rng.randint(1, 999),
+        data=data,
+        suma=f"{rng.randint(1, 9_999) * 1_000:,}".replace(',', '.'),
+        persoana=rng.choice(_PERSONS),
+        oras=rng.choice(_CITIES),
+    )
+
+
+def _company_name(rng: random.Random) -> str:
+    name = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3)))
+    if rng.random() < 0.5:
+        name += ' ' + rng.choice(_WORDS)
+    return f"{name} {rng.choice(_SUFFIXES)}"
+
+
+def generate_acts(count: int, seed: int = 0, data: str = "15.01.2026",
+                  operation_mix: Optional[Mapping[str, float]] = None,
+                  cui_share: float = 0.7, top_share: float = 0.1,
+                  orc_share: float = 0.05,
+                  top_companies: Optional[Mapping[str, dict]] = None) -> Iterator[SyntheticAct]:
+    """
+    Actele unui monitor sintetic.
+    - operation_mix: ponderi pe op_id (implicit DEFAULT_OPERATION_MIX)
+    - cui_share: proporția actelor care menționează CUI-ul
+    - top_share: proporția actelor ale unor companii din `top_companies`
+    - orc_share: proporția notificărilor ORC (ignorate de parser)
+    """
+    rng = random.Random(seed)
+    mix = operation_mix or DEFAULT_OPERATION_MIX
+    unknown = set(mix) - set(OPERATION_PHRASES)
+    if unknown:
+        raise ValueError(f"Operațiuni necunoscute: {', '.join(sorted(unknown))}")
+    op_ids = list(mix)
+    weights = [mix[op] for op in op_ids]
+    top_cuis = []
+    if top_companies and top_share > 0:
+        top_cuis = [cui for cui, info in top_companies.items() if _LEGAL_FORM.search(info['denumire'])]
+
+    for _ in range(count):
+        in_top = bool(top_cuis) and rng.random() < top_share
+        if in_top:
+            cui = rng.choice(top_cuis)
+            denumire = top_companies[cui]['denumire']
+        else:
+            cui = make_cui(rng)
+            while top_companies and cui in top_companies:
+                cui = make_cui(rng)
+            denumire = _company_name(rng)
+        if rng.random() >= cui_share:
+            cui = None
+
+        if rng.random() < orc_share:
+            yield SyntheticAct(denumire, cui, '', _fill(_ORC_NOTICE, rng, data), in_top, orc_notice=True)
+            continue
+
+        op_id = rng.choices(op_ids, weights)[0]
+        parts = [] if op_id in _NO_PREAMBLE else [_fill(rng.choice(_PREAMBLES), rng, data)]
+        parts.append(_fill(rng.choice(OPERATION_PHRASES[op_id]), rng, data))
+        if cui:
+            parts.append(f"CUI {cui}, J{rng.randint(1, 52):02d}/{rng.randint(1, 9999)}/{rng.randint(1991, 2025)}.")
+        yield SyntheticAct(denumire, cui, op_id, ' '.join(parts), in_top)
+
+
+def render_monitor(acts: List[SyntheticAct], nr_monitor: int = 129, data: str = "15.01.2026") -> str:
+    """HTML-ul monitorului, cu antetul fiecărui act în <strong>."""
+    parts = [
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+        f'<title>Monitorul Oficial al României, Partea a IV-a, nr. {nr_monitor}/{data}</title></head>\n'
+        f'<body>\n<p>MONITORUL OFICIAL AL ROMÂNIEI PARTEA a IV-a Nr. {nr_monitor} din {data}</p>\n'
+    ]
+    for act in acts:
+        prefix = '' if act.orc_notice or act.denumire.startswith('SOCIETATEA') else 'Societatea '
+        parts.append(f'<p class="titlu"><strong>{prefix}{act.denumire}</strong></p>\n'
+                     f'<p class="text">{act.text}</p>\n')
+    parts.append('</body></html>\n')
+    return ''.join(parts)
+
+
+def generate_monitor(count: int, nr_monitor: int = 129, data: str = "15.01.2026", **options) -> str:
+    """Un monitor sintetic cu `count` acte; `options` ca la generate_acts."""
+    return render_monitor(list(generate_acts(count, data=data, **options)), nr_monitor, data)
+
+
+# HTML malformat de ~`size` caractere: antete neînchise, '<' fără '>', comentarii
+# neînchise, taguri inline imbricate, forme juridice repetate
+PATHOLOGICAL_HTML: Dict[str, Callable[[int], str]] = {
+    'strong neînchis cu SRL repetat': lambda size: '<strong>' + 'x SRL ' * (size // 6),
+    '<strong> repetat fără închidere': lambda size: '<strong>A SRL ' * (size // 14),
+    "'<' fără '>'": lambda size: '<p' + 'a' * size,
+    "'<' repetat": lambda size: '< <strong>' * (size // 10),
+    'comentariu neînchis': lambda size: '<strong>X SRL</strong><!--' + 'x' * size,
+    'inline imbricat': lambda size: '<strong>' + '<em>' * (size // 10) + 'A SRL' + '</em>' * (size // 10) + '</strong>',
+    '</strong> fără deschidere': lambda size: 'x SRL</strong>' * (size // 14),
+}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    output = sys.argv[2] if len(sys.argv) > 2 else f"monitor_sintetic_{count}.html"
+    from mo_parser_v4 import TOP_COMPANII
+    html = generate_monitor(count, top_companies=TOP_COMPANII)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"[INFO] Monitor sintetic salvat: {output} ({count:,} acte, {len(html.encode('utf-8')):,} bytes)")
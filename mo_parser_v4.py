@@ -13,22 +13,90 @@ Changelog v4:
 import re
 import json
 import os
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+import codecs
+import hashlib
+import heapq
+import mmap
+import struct
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import IO, Iterable, Iterator, List, Dict, Mapping, Optional, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+from html import escape
+from itertools import chain
+from operator import attrgetter, itemgetter
+from time import perf_counter
+
+from act_segmenter import HeaderScanner
+from company_index import load_company_index, normalize_name
+from metrics import current_timings, record_stage, record_volume
+from name_matcher import TrigramIndex
+from time_budget import check_budget
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    print("[WARNING] numpy nu este instalat - raportul și sumarele folosesc liste Python în loc de classify_batch")
 
 # Import pattern-uri relaxate (mai permisive)
 from patterns_relaxed import (
     detect_operation as detect_op_relaxed,
+    detect_operations as detect_ops_relaxed,
+    operations_from_mask,
     OPERATION_NAMES,
     OPERATION_CATEGORIES,
+    PATTERN_CHECK_ORDER,
     NOISE_OPERATIONS,
-    HIGH_INTEREST_OPERATIONS
+    HIGH_INTEREST_OPERATIONS,
+    HIGH_INTEREST_MASK
 )
 
-# Încarcă TOP companii
-TOP_COMPANII = {}
-TOP_COMPANII_BY_NAME = {}
+@dataclass
+class CompanyDatabase:
+    """
+    O versiune a bazei TOP companii. Parsările păstrează versiunea cu care au
+    început, deci o reîncărcare nu schimbă baza în mijlocul unui monitor.
+    """
+    companies: Mapping[str, dict]
+    by_name: Mapping[str, dict]
+    # sha256 scurt al JSON-ului; intră în cheile cache-ului de parsare
+    version: str = ""
+    path: str = ""
+    # Mărimea și mtime_ns ale JSON-ului din care a fost încărcată
+    source: Tuple[int, int] = (0, 0)
+    loaded_at: float = 0.0
+    _fuzzy_index: Optional[TrigramIndex] = field(default=None, repr=False, compare=False)
+
+    def fuzzy_index(self) -> Optional[TrigramIndex]:
+        """Indexul de trigrame peste denumiri, construit la prima folosire."""
+        if self._fuzzy_index is None and self.companies:
+            self._fuzzy_index = TrigramIndex((cui, info['denumire']) for cui, info in self.companies.items())
+        return self._fuzzy_index
+
+
+def load_company_database(path: str) -> CompanyDatabase:
+    """Încarcă baza TOP din JSON, prin indexul binar (reconstruit dacă JSON-ul s-a schimbat)."""
+    stat = os.stat(path)
+    try:
+        # Index binar mapat în memorie, partajat între workeri
+        companies = load_company_index(path)
+        by_name = companies.by_name
+        version = companies.version
+    except OSError as e:
+        print(f"[WARNING] Indexul binar nu poate fi folosit ({e}) - se încarcă JSON-ul")
+        with open(path, 'rb') as f:
+            raw = f.read()
+        companies = json.loads(raw.decode('utf-8'))
+        version = hashlib.sha256(raw).hexdigest()[:16]
+        by_name = {}
+        for cui, info in companies.items():
+            by_name[normalize_name(info['denumire'])] = {'cui': cui, **info}
+    return CompanyDatabase(companies, by_name, version, path, (stat.st_size, stat.st_mtime_ns), time.time())
+
 
 # Căutăm fișierul JSON în mai multe locații
 possible_paths = [
@@ -43,17 +111,62 @@ for path in possible_paths:
         json_path = path
         break
 
+# Versiunea activă a bazei TOP; TOP_COMPANII* sunt păstrate pentru codul care le importă
+COMPANY_DB = CompanyDatabase({}, {})
 if json_path:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        TOP_COMPANII = json.load(f)
-    for cui, info in TOP_COMPANII.items():
-        name_norm = info['denumire'].upper().strip()
-        for suffix in [' S.R.L.', ' SRL', ' S.A.', ' SA', ' S.C.S.', ' SCS']:
-            name_norm = name_norm.replace(suffix, '')
-        TOP_COMPANII_BY_NAME[name_norm.strip()] = {'cui': cui, **info}
-    print(f"[INFO] Încărcat {len(TOP_COMPANII):,} companii TOP din {json_path}")
+    COMPANY_DB = load_company_database(json_path)
+    print(f"[INFO] Încărcat {len(COMPANY_DB.companies):,} companii TOP din {json_path}")
 else:
     print("[WARNING] Nu s-a găsit top_companii.json - funcționalitatea TOP va fi dezactivată")
+TOP_COMPANII = COMPANY_DB.companies
+TOP_COMPANII_BY_NAME = COMPANY_DB.by_name
+TOP_COMPANII_VERSION = COMPANY_DB.version
+
+_reload_lock = threading.Lock()
+
+
+def company_db() -> CompanyDatabase:
+    """Versiunea activă a bazei TOP."""
+    return COMPANY_DB
+
+
+def companies_changed() -> bool:
+    """top_companii.json a fost modificat de la încărcarea versiunii active."""
+    if not json_path:
+        return False
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return False
+    return (stat.st_size, stat.st_mtime_ns) != COMPANY_DB.source
+
+
+def reload_companies(force: bool = False) -> bool:
+    """
+    Reîncarcă top_companii.json dacă s-a schimbat (sau dacă `force`). Indexul
+    binar și cel de trigrame sunt construite înainte de comutare, iar noua
+    versiune devine activă printr-o singură atribuire; parsările în curs
+    termină pe versiunea veche. Returnează True dacă versiunea s-a schimbat.
+    """
+    global COMPANY_DB, TOP_COMPANII, TOP_COMPANII_BY_NAME, TOP_COMPANII_VERSION
+    if not json_path:
+        return False
+    with _reload_lock:
+        current = COMPANY_DB
+        if not force and not companies_changed():
+            return False
+        try:
+            db = load_company_database(json_path)
+            db.fuzzy_index()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Baza TOP nu a putut fi reîncărcată ({e}) - rămâne versiunea {current.version}")
+            return False
+        COMPANY_DB = db
+        TOP_COMPANII, TOP_COMPANII_BY_NAME, TOP_COMPANII_VERSION = db.companies, db.by_name, db.version
+    if db.version == current.version:
+        return False
+    print(f"[INFO] Baza TOP reîncărcată: {len(db.companies):,} companii, versiunea {db.version}")
+    return True
 
 def detect_operation(text: str) -> Tuple[str, str, str]:
     """
@@ -69,30 +182,180 @@ def detect_operation(text: str) -> Tuple[str, str, str]:
     return "nedeterminat", "Operațiune nedeterminată", "Altele"
 
 
-@dataclass
+def detect_operations(text: str) -> Tuple[int, str, str, str]:
+    """
+    Toate operațiunile din text, într-o singură trecere.
+    Returnează (masca operațiunilor, operation_id, operation_name, category)
+    pentru operațiunea principală, aceeași ca la detect_operation.
+    """
+    ops, op_id, op_name, category = detect_ops_relaxed(text)
+    
+    if op_id:
+        return ops, op_id, op_name, category
+    
+    return 0, "nedeterminat", "Operațiune nedeterminată", "Altele"
+
+
+class MonitorText:
+    """
+    Textele unor acte consecutive din monitor, concatenate UTF-8 într-un
+    singur buffer. Actele păstrează doar pozițiile textului lor; textul e
+    decodat la cerere. Un buffer plin e închis și următoarele acte încep
+    altul, ca parcurgerea în flux să nu țină în memorie textele tuturor actelor.
+    """
+    __slots__ = ('data',)
+    BLOCK_BYTES = 256 * 1024
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def add(self, text: str) -> Tuple[int, int]:
+        start = len(self.data)
+        self.data += text.encode('utf-8')
+        return start, len(self.data)
+
+    def get(self, start: int, end: int) -> str:
+        return bytes(self.data[start:end]).decode('utf-8')
+
+    def full(self) -> bool:
+        return len(self.data) >= self.BLOCK_BYTES
+
+    def freeze(self) -> None:
+        """Buffer final, fără rezerva de creștere a bytearray-ului."""
+        self.data = bytes(self.data)
+
+
+# Câmpurile publice ale actului, în ordinea constructorului
+ACT_FIELDS = (
+    'nr_act', 'denumire', 'cui', 'tip_operatiune', 'tip_operatiune_id', 'categorie_operatiune',
+    'text_complet', 'nr_monitor', 'in_top', 'rank', 'ca', 'categorie_ca', 'is_noise',
+    'is_high_interest', 'nr_orc', 'euid', 'capital_social', 'date_mentionate', 'sursa_top',
+    'scor_top', 'operatiuni_mask',
+)
+
+# Câmpurile numerice ale actului, împachetate într-un singur bytes:
+# nr_act, nr_monitor, rank, început / sfârșit text, ca, operatiuni_mask, scor_top, flags
+_PACKED_FORMATS = ('I', 'I', 'I', 'I', 'I', 'Q', 'Q', 'd', 'B')
+_PACKED = struct.Struct('<' + ''.join(_PACKED_FORMATS))
+_NR_ACT, _NR_MONITOR, _RANK, _TEXT_START, _TEXT_END, _CA, _OPS, _SCOR, _FLAGS = range(9)
+_IN_TOP, _IS_NOISE, _IS_HIGH_INTEREST = 1, 2, 4
+
+
+def _packed_field(index: int, doc: str) -> property:
+    # Citirea unui singur câmp, fără despachetarea celorlalte
+    unpack_from = struct.Struct('<' + _PACKED_FORMATS[index]).unpack_from
+    offset = struct.calcsize('<' + ''.join(_PACKED_FORMATS[:index]))
+
+    def get(self):
+        return unpack_from(self._packed, offset)[0]
+
+    def set(self, value):
+        values = list(_PACKED.unpack(self._packed))
+        values[index] = value
+        self._packed = _PACKED.pack(*values)
+    return property(get, set, doc=doc)
+
+
+def _flag_field(bit: int, doc: str) -> property:
+    def get(self):
+        return bool(self._packed[-1] & bit)
+
+    def set(self, value):
+        values = list(_PACKED.unpack(self._packed))
+        values[_FLAGS] = values[_FLAGS] | bit if value else values[_FLAGS] & ~bit
+        self._packed = _PACKED.pack(*values)
+    return property(get, set, doc=doc)
+
+
 class Act:
-    nr_act: int
-    denumire: str
-    cui: Optional[str] = None
-    tip_operatiune: str = ""
-    tip_operatiune_id: str = ""
-    categorie_operatiune: str = ""
-    text_complet: str = ""
-    nr_monitor: int = 0
-    in_top: bool = False
-    rank: int = 0
-    ca: int = 0
-    categorie_ca: str = ""
-    is_noise: bool = False
-    is_high_interest: bool = False
-
-
-def normalize_name(name: str) -> str:
-    name = name.upper().strip()
-    for suffix in [' - S.R.L.', ' -S.R.L.', ' S.R.L.', ' SRL', 
-                   ' - S.A.', ' -S.A.', ' S.A.', ' SA', ' S.C.S.', ' SCS']:
-        name = name.replace(suffix, '')
-    return name.strip()
+    """
+    Un act din monitor, în formă compactă: __slots__, câmpurile numerice și
+    flag-urile împachetate, iar textul ca poziții în MonitorText-ul monitorului
+    (decodat doar când e citit). Atributele publice sunt cele din ACT_FIELDS.
+    """
+    __slots__ = ('denumire', 'cui', 'tip_operatiune', 'tip_operatiune_id', 'categorie_operatiune',
+                 'categorie_ca', 'nr_orc', 'euid', 'capital_social', 'date_mentionate', 'sursa_top',
+                 '_text', '_packed')
+
+    def __init__(self, nr_act: int, denumire: str, cui: Optional[str] = None, tip_operatiune: str = "",
+                 tip_operatiune_id: str = "", categorie_operatiune: str = "", text_complet: str = "",
+                 nr_monitor: int = 0, in_top: bool = False, rank: int = 0, ca: int = 0,
+                 categorie_ca: str = "", is_noise: bool = False, is_high_interest: bool = False,
+                 nr_orc: Optional[str] = None, euid: Optional[str] = None,
+                 capital_social: Iterable[int] = (), date_mentionate: Iterable[str] = (),
+                 sursa_top: str = "", scor_top: float = 0.0, operatiuni_mask: int = 0,
+                 texts: Optional[MonitorText] = None):
+        self.denumire = denumire
+        self.cui = cui
+        self.tip_operatiune = tip_operatiune
+        self.tip_operatiune_id = tip_operatiune_id
+        self.categorie_operatiune = categorie_operatiune
+        self.categorie_ca = categorie_ca
+        self.nr_orc = nr_orc
+        self.euid = euid
+        self.capital_social = tuple(capital_social)
+        # Datele se repetă de la un act la altul (data publicării), deci sunt partajate
+        self.date_mentionate = tuple(sys.intern(d) for d in date_mentionate)
+        self.sursa_top = sursa_top   # 'cui', 'denumire' sau 'fuzzy'
+        flags = (_IN_TOP if in_top else 0) | (_IS_NOISE if is_noise else 0) | \
+            (_IS_HIGH_INTEREST if is_high_interest else 0)
+        # Cu `texts`, textul e adăugat în bufferul comun al monitorului
+        if texts is not None:
+            self._text = texts
+            text_start, text_end = texts.add(text_complet)
+        else:
+            self._text = text_complet
+            text_start = text_end = 0
+        self._packed = _PACKED.pack(nr_act, nr_monitor, rank, text_start, text_end,
+                                    ca, operatiuni_mask, scor_top, flags)
+
+    nr_act = _packed_field(_NR_ACT, "Numărul actului în monitor")
+    nr_monitor = _packed_field(_NR_MONITOR, "Numărul monitorului")
+    rank = _packed_field(_RANK, "Locul în TOP (0 = nu e în TOP)")
+    ca = _packed_field(_CA, "Cifra de afaceri (lei)")
+    operatiuni_mask = _packed_field(_OPS, "Toate operațiunile din act (patterns_relaxed.OPERATION_BITS)")
+    scor_top = _packed_field(_SCOR, "Scorul potrivirii cu TOP")
+    in_top = _flag_field(_IN_TOP, "Compania e în TOP")
+    is_noise = _flag_field(_IS_NOISE, "Operațiune de zgomot")
+    is_high_interest = _flag_field(_IS_HIGH_INTEREST, "Operațiune de interes major")
+
+    @property
+    def text_complet(self) -> str:
+        """Textul actului (fără tag-uri, cel mult 2000 de caractere)."""
+        if isinstance(self._text, MonitorText):
+            values = _PACKED.unpack(self._packed)
+            return self._text.get(values[_TEXT_START], values[_TEXT_END])
+        return self._text
+
+    @text_complet.setter
+    def text_complet(self, value: str) -> None:
+        self._text = value
+
+    def to_dict(self) -> dict:
+        """Câmpurile publice (listele ca liste), ca dataclasses.asdict."""
+        result = {name: getattr(self, name) for name in ACT_FIELDS}
+        result['capital_social'] = list(self.capital_social)
+        result['date_mentionate'] = list(self.date_mentionate)
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Act):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Act(nr_act={self.nr_act}, nr_monitor={self.nr_monitor}, denumire={self.denumire!r}, " \
+               f"tip_operatiune_id={self.tip_operatiune_id!r})"
+
+    @property
+    def operatiuni_ids(self) -> List[str]:
+        """Toate operațiunile actului, cea principală prima."""
+        return list(_operation_ids(self.operatiuni_mask, self.tip_operatiune_id))
+
+    @property
+    def operatiuni(self) -> List[str]:
+        """Denumirile tuturor operațiunilor actului, cea principală prima."""
+        return [OPERATION_NAMES.get(op_id, self.tip_operatiune) for op_id in self.operatiuni_ids]
 
 
 def get_ca_category(ca: int) -> Tuple[str, int]:
@@ -105,73 +368,444 @@ def get_ca_category(ca: int) -> Tuple[str, int]:
     else: return ("SUB 50M", 7)
 
 
+# Codurile coloanelor din classify_batch; 0 = nedeterminat / necunoscut
+OP_CODES = {op_id: code for code, op_id in enumerate(["nedeterminat"] + PATTERN_CHECK_ORDER)}
+OP_CATEGORY_CODES = {name: code for code, name in enumerate(["Altele"] + sorted(set(OPERATION_CATEGORIES.values()) - {"Altele"}))}
+# Codurile categoriilor CA sunt cele din get_ca_category; 0 = compania nu e în TOP
+CA_CATEGORY_CODES = {"GIGANT": 1, "MARI": 2, "MEDII-MARI": 3, "MEDII": 4, "MEDII-MICI": 5, "MICI DIN TOP": 6, "SUB 50M": 7}
+
+
+@dataclass
+class ActBatch:
+    """
+    Coloanele unui lot de acte (classify_batch), aliniate cu lista de acte:
+    măștile și grupările se calculează pe vectori în loc de parcurgeri repetate ale listei.
+    """
+    op_code: 'np.ndarray'
+    op_category_code: 'np.ndarray'
+    in_top: 'np.ndarray'
+    rank: 'np.ndarray'
+    ca: 'np.ndarray'
+    ca_category_code: 'np.ndarray'
+    is_noise: 'np.ndarray'
+    is_high_interest: 'np.ndarray'
+    nr_monitor: 'np.ndarray'
+
+    def by_rank(self, mask: 'np.ndarray') -> 'np.ndarray':
+        """Pozițiile selectate de mască, ordonate după rang (stabil, ca sorted())."""
+        positions = np.flatnonzero(mask)
+        return positions[np.argsort(self.rank[positions], kind='stable')]
+
+    def by_monitor(self, mask: 'np.ndarray') -> Dict[int, 'np.ndarray']:
+        """Pozițiile selectate de mască, grupate pe monitoare (în ordinea numerelor)."""
+        positions = np.flatnonzero(mask)
+        positions = positions[np.argsort(self.nr_monitor[positions], kind='stable')]
+        monitors, starts = np.unique(self.nr_monitor[positions], return_index=True)
+        return {int(nr): group for nr, group in zip(monitors, np.split(positions, starts[1:]))}
+
+
+if np is not None:
+    # Aceeași structură ca _PACKED, ca toate câmpurile numerice să fie citite dintr-o dată
+    _PACKED_DTYPE = np.dtype([
+        ('nr_act', '<u4'), ('nr_monitor', '<u4'), ('rank', '<u4'), ('text_start', '<u4'),
+        ('text_end', '<u4'), ('ca', '<u8'), ('operatiuni_mask', '<u8'), ('scor_top', '<f8'), ('flags', 'u1'),
+    ])
+    assert _PACKED_DTYPE.itemsize == _PACKED.size
+    _OP_CATEGORY_OF_CODE = np.array(
+        [OP_CATEGORY_CODES.get(OPERATION_CATEGORIES.get(op_id, "Altele"), 0) for op_id in OP_CODES], dtype=np.uint8)
+
+
+def classify_batch(acts: List[Act]) -> ActBatch:
+    """Clasificarea unui lot de acte, pe coloane (necesită numpy)."""
+    if np is None:
+        raise RuntimeError("classify_batch necesită numpy")
+    count = len(acts)
+    packed = np.frombuffer(b''.join([act._packed for act in acts]), dtype=_PACKED_DTYPE, count=count)
+    op_code = np.fromiter((OP_CODES.get(act.tip_operatiune_id, 0) for act in acts), dtype=np.uint8, count=count)
+    ca_category_code = np.fromiter((CA_CATEGORY_CODES.get(act.categorie_ca, 0) for act in acts),
+                                   dtype=np.uint8, count=count)
+    flags = packed['flags']
+    return ActBatch(
+        op_code=op_code,
+        op_category_code=_OP_CATEGORY_OF_CODE[op_code],
+        in_top=(flags & _IN_TOP) != 0,
+        rank=packed['rank'],
+        ca=packed['ca'],
+        ca_category_code=ca_category_code,
+        is_noise=(flags & _IS_NOISE) != 0,
+        is_high_interest=(flags & _IS_HIGH_INTEREST) != 0,
+        nr_monitor=packed['nr_monitor'],
+    )
+
+
+def count_flags(acts: List[Act]) -> Dict[str, int]:
+    """Numărul actelor din TOP, al celor de interes major din TOP și al celor de zgomot."""
+    if np is None:
+        return {
+            'top': sum(1 for a in acts if a.in_top),
+            'high_interest_top': sum(1 for a in acts if a.in_top and a.is_high_interest),
+            'noise': sum(1 for a in acts if a.is_noise),
+        }
+    flags = np.frombuffer(b''.join([act._packed for act in acts]), dtype=_PACKED_DTYPE, count=len(acts))['flags']
+    in_top = (flags & _IN_TOP) != 0
+    return {
+        'top': int(in_top.sum()),
+        'high_interest_top': int((in_top & ((flags & _IS_HIGH_INTEREST) != 0)).sum()),
+        'noise': int(((flags & _IS_NOISE) != 0).sum()),
+    }
+
+
+@lru_cache(maxsize=4096)
+def _operation_ids(ops: int, op_id: str) -> Tuple[str, ...]:
+    """Act.operatiuni_ids pentru o mască și o operațiune principală (combinațiile se repetă mult)."""
+    if not ops:
+        return (op_id,) if op_id else ()
+    return (op_id,) + tuple(other for other in operations_from_mask(ops) if other != op_id)
+
+
+# Câmpurile numerice din _PACKED (numele din _PACKED_DTYPE și poziția) și bitul flag-urilor, pentru act_columns
+_PACKED_COLUMNS = {'nr_act': _NR_ACT, 'nr_monitor': _NR_MONITOR, 'rank': _RANK, 'ca': _CA,
+                   'operatiuni_mask': _OPS, 'scor_top': _SCOR}
+_FLAG_COLUMNS = {'in_top': _IN_TOP, 'is_noise': _IS_NOISE, 'is_high_interest': _IS_HIGH_INTEREST}
+
+
+def act_columns(acts: List[Act], fields: Iterable[str]) -> Dict[str, list]:
+    """
+    Câmpurile `fields` (din ACT_FIELDS, plus 'operatiuni' = operatiuni_ids) ale
+    actelor, pe coloane aliniate cu `acts`. Câmpurile numerice sunt citite
+    dintr-o dată din înregistrările _PACKED (cu numpy, ca în classify_batch),
+    iar textul e decodat doar dacă e cerut; listele rămân tupluri.
+    """
+    data = b''.join(map(attrgetter('_packed'), acts))
+    if np is not None:
+        packed = np.frombuffer(data, dtype=_PACKED_DTYPE, count=len(acts))
+
+        def packed_column(name: str) -> list:
+            return packed[name].tolist()
+
+        def flag_column(bit: int) -> list:
+            return ((packed['flags'] & bit) != 0).tolist()
+    else:
+        rows = list(zip(*_PACKED.iter_unpack(data))) or [()] * len(_PACKED_FORMATS)
+
+        def packed_column(name: str) -> list:
+            return list(rows[_PACKED_COLUMNS[name]])
+
+        def flag_column(bit: int) -> list:
+            return [flags & bit != 0 for flags in rows[_FLAGS]]
+
+    columns = {}
+    for name in fields:
+        if name in _PACKED_COLUMNS:
+            columns[name] = packed_column(name)
+        elif name in _FLAG_COLUMNS:
+            columns[name] = flag_column(_FLAG_COLUMNS[name])
+        elif name == 'operatiuni':
+            columns[name] = list(map(_operation_ids, packed_column('operatiuni_mask'),
+                                     map(attrgetter('tip_operatiune_id'), acts)))
+        else:
+            columns[name] = list(map(attrgetter(name), acts))
+    return columns
+
+
+# Identificatorii din textul unui act, extrași într-o singură trecere:
+# CUI, nr. de ordine ORC (J40/1234/2010 sau formatul nou J2010001234400),
+# EUID (ROONRC.J40/1234/2010), capitalul social și datele calendaristice.
+_AMOUNT = r'\d{1,3}(?:\.\d{3})+|\d+'
+IDENTIFIER_PATTERN = re.compile(rf"""
+    (?:cod\ unic\ de\ înregistrare|CUI|C\.U\.I\.)[:\s]+(?:RO)?(?P<cui>\d{{6,10}})
+  | (?P<euid>ROONRC\.(?P<euid_orc>J\d{{1,2}}/\d{{1,8}}/\d{{4}}|J\d{{13}}))
+  | (?P<orc>\bJ\d{{1,2}}/\d{{1,8}}/\d{{4}}|\bJ\d{{13}}\b)
+  | capital(?:ul|ului)?\s+social[^0-9;]{{0,60}}?(?P<capital>{_AMOUNT})(?:,\d+)?\s*lei
+        (?:\s+la\s+(?P<capital_nou>{_AMOUNT})(?:,\d+)?\s*lei)?
+  | (?P<data>\b\d{{1,2}}\.\d{{1,2}}\.\d{{4}}\b)
+""", re.IGNORECASE | re.VERBOSE)
+
+_CUI_KEY = "753217532"
+
+
+@dataclass
+class Identifiers:
+    cui: Optional[str] = None
+    nr_orc: Optional[str] = None
+    euid: Optional[str] = None
+    capital_social: List[int] = field(default_factory=list)
+    date: List[str] = field(default_factory=list)
+
+
+def is_valid_cui(cui: str) -> bool:
+    """Verifică cifra de control a unui CUI (cheia 753217532)."""
+    if not cui.isdigit() or not 2 <= len(cui) <= 10:
+        return False
+    body = cui[:-1].zfill(9)
+    control = sum(int(d) * int(k) for d, k in zip(body, _CUI_KEY)) * 10 % 11
+    return control % 10 == int(cui[-1])
+
+
+def extract_identifiers(text: str) -> Identifiers:
+    """
+    Extrage identificatorii actului într-o singură trecere prin text.
+    Se păstrează primul CUI cu cifra de control validă.
+    """
+    ids = Identifiers()
+    for m in IDENTIFIER_PATTERN.finditer(text):
+        kind = m.lastgroup
+        if kind == 'cui':
+            if ids.cui is None and is_valid_cui(m.group('cui')):
+                ids.cui = m.group('cui')
+        elif kind == 'euid':
+            if ids.euid is None:
+                ids.euid = m.group('euid').upper()
+            if ids.nr_orc is None:
+                ids.nr_orc = m.group('euid_orc').upper()
+        elif kind == 'orc':
+            if ids.nr_orc is None:
+                ids.nr_orc = m.group('orc').upper()
+        elif kind in ('capital', 'capital_nou'):
+            for group in ('capital', 'capital_nou'):
+                if m.group(group):
+                    ids.capital_social.append(int(m.group(group).replace('.', '')))
+        elif kind == 'data':
+            if m.group('data') not in ids.date:
+                ids.date.append(m.group('data'))
+    return ids
+
+
 def extract_cui(text: str) -> Optional[str]:
-    patterns = [
-        r'cod unic de înregistrare[:\s]+(\d{6,10})',
-        r'CUI[:\s]+(?:RO)?(\d{6,10})',
-        r'C\.U\.I\.[:\s]+(?:RO)?(\d{6,10})',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    """Primul CUI valid din text (vezi extract_identifiers)."""
+    return extract_identifiers(text).cui
+
+# Antetul unui act: denumirea societății, în <strong>, cu formă juridică.
+# Actele sunt segmentate de act_segmenter.HeaderScanner (timp liniar, antete
+# cu taguri inline imbricate); expresia rămâne ca referință pentru verificări.
+COMPANY_PATTERN = re.compile(
+    r'<strong>(?:Societatea\s+)?([^<]+(?:S\.R\.L\.|SRL|S\.A\.|SA|S\.C\.S\.|SCS)[^<]*)</strong>',
+    re.IGNORECASE)
+# Tag-uri și spații consecutive, înlocuite cu un singur spațiu; un '<' fără
+# pereche oprește tagul la următorul '<', deci nu se revine peste text
+TAGS_AND_SPACES = re.compile(r'(?:<[^<>]++>|\s)+')
+WHITESPACE = re.compile(r'\s+')
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# Din buffer-ele mapate, paginile deja segmentate sunt eliberate în blocuri de atât
+MMAP_RELEASE_BYTES = 4 * 1024 * 1024
+
+# Conținut binar parcurs direct, fără decodarea întregului monitor
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def _iter_chunks(html_or_stream: Union[str, IO]) -> Iterator[str]:
+    """Textul monitorului în bucăți; fluxurile binare sunt decodate UTF-8 incremental."""
+    if isinstance(html_or_stream, str):
+        yield html_or_stream
+        return
+    decoder = None
+    while True:
+        chunk = html_or_stream.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(chunk)
+        yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+def get_fuzzy_index() -> Optional[TrigramIndex]:
+    """Indexul de trigrame peste denumirile versiunii active a bazei TOP."""
+    return COMPANY_DB.fuzzy_index()
+
+
+def match_top(company_name: str, cui: Optional[str],
+              db: Optional[CompanyDatabase] = None) -> Tuple[Optional[dict], str, float]:
+    """
+    Caută compania în TOP (versiunea `db`, implicit cea activă): după CUI, după
+    denumirea exactă, iar pentru actele fără CUI după denumirea aproximativă.
+    Returnează (info, sursa, scor).
+    """
+    if db is None:
+        db = COMPANY_DB
+    if cui and cui in db.companies:
+        return db.companies[cui], 'cui', 1.0
+    name_norm = normalize_name(company_name)
+    if name_norm in db.by_name:
+        return db.by_name[name_norm], 'denumire', 1.0
+    if cui is None:
+        fuzzy_index = db.fuzzy_index()
+        match = fuzzy_index.best_match(company_name) if fuzzy_index else None
         if match:
-            return match.group(1)
-    return None
+            match_cui, scor = match
+            return db.companies[match_cui], 'fuzzy', scor
+    return None, '', 0.0
+
+
+def _build_act(company_name: str, raw_text: str, nr_act: int, nr_monitor: int,
+               texts: MonitorText, db: CompanyDatabase) -> Optional[Act]:
+    """
+    Construiește actul din HTML-ul dintre două antete; None pentru notificări ORC.
+    Textul actului e adăugat în `texts`, bufferul comun al monitorului, iar
+    compania e căutată în versiunea `db` a bazei TOP. Înaintea fiecărui act e
+    verificat bugetul de timp al cererii (vezi time_budget).
+    """
+    check_budget()
+    text_complet = TAGS_AND_SPACES.sub(' ', raw_text).strip()
+
+    # Skip notificări ORC (sunt doar confirmări)
+    if 'oficiul registrului comer' in text_complet[:100].lower():
+        return None
+
+    t0 = perf_counter()
+    ids = extract_identifiers(text_complet)
+    cui = ids.cui
+    t1 = perf_counter()
+    ops, op_id, op_name, op_category = detect_operations(text_complet)
+    record_stage('identificatori', t1 - t0)
+    record_stage('detectie', perf_counter() - t1)
+
+    act = Act(
+        nr_act=nr_act,
+        denumire=company_name,
+        cui=cui,
+        tip_operatiune=op_name,
+        tip_operatiune_id=op_id,
+        categorie_operatiune=op_category,
+        text_complet=text_complet[:2000],
+        nr_monitor=nr_monitor,
+        is_noise=op_id in NOISE_OPERATIONS,
+        is_high_interest=bool(ops & HIGH_INTEREST_MASK),
+        nr_orc=ids.nr_orc,
+        euid=ids.euid,
+        capital_social=ids.capital_social,
+        date_mentionate=ids.date,
+        operatiuni_mask=ops,
+        texts=texts
+    )
+
+    # Verificăm TOP
+    t0 = perf_counter()
+    info, sursa, scor = match_top(company_name, cui, db)
+    record_stage('top', perf_counter() - t0)
+    if info:
+        act.in_top = True
+        act.rank = info['rank']
+        act.ca = info['ca']
+        act.categorie_ca, _ = get_ca_category(info['ca'])
+        act.sursa_top = sursa
+        act.scor_top = scor
+
+    return act
+
+
+def _iter_acts_buffer(buffer, nr_monitor: int) -> Iterator[Act]:
+    """
+    Segmentează un monitor aflat în bytes / mmap: antetele sunt căutate în
+    bytes, iar UTF-8 e decodat doar pentru denumirea și textul actului curent.
+    """
+    # Paginile mapate citite rămân în RSS-ul procesului până la unmap;
+    # cele de dinaintea actului curent nu mai sunt necesare
+    release = isinstance(buffer, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED')
+    released = 0
+    db = COMPANY_DB
+    texts = MonitorText()
+    company_name = None
+    act_start = 0
+    nr_act = 0
+    for header_start, header_end, name in HeaderScanner(binary=True).scan(buffer, final=True):
+        if release and act_start - released >= MMAP_RELEASE_BYTES:
+            end = act_start - act_start % mmap.PAGESIZE
+            buffer.madvise(mmap.MADV_DONTNEED, released, end - released)
+            released = end
+        if company_name is not None:
+            raw_text = bytes(buffer[act_start:header_start]).decode('utf-8')
+            act = _build_act(company_name, raw_text, nr_act + 1, nr_monitor, texts, db)
+            if act:
+                nr_act += 1
+                yield act
+            if texts.full():
+                texts.freeze()
+                texts = MonitorText()
+        company_name = WHITESPACE.sub(' ', name.decode('utf-8').strip())
+        act_start = header_end
+
+    if company_name is not None:
+        act = _build_act(company_name, bytes(buffer[act_start:]).decode('utf-8'), nr_act + 1, nr_monitor, texts, db)
+        if act:
+            yield act
+    texts.freeze()
+
+
+def iter_acts(html_or_stream: Union[str, bytes, IO], nr_monitor: int) -> Iterator[Act]:
+    """
+    Parcurge un monitor (str, bytes / mmap sau flux text/binar) și produce
+    actele pe măsură ce sunt găsite. Bufferul păstrează doar actul curent,
+    nu tot monitorul.
+    """
+    if isinstance(html_or_stream, BUFFER_TYPES):
+        yield from _iter_acts_buffer(html_or_stream, nr_monitor)
+        return
+
+    # Tot monitorul e comparat cu aceeași versiune a bazei TOP, chiar dacă între timp e reîncărcată
+    db = COMPANY_DB
+    texts = MonitorText()
+    scanner = HeaderScanner()
+    buf = ''
+    act_start = None    # începutul textului actului curent în buf
+    company_name = None
+    nr_act = 0
+
+    # None la sfârșit: ultima scanare, în care tagurile rămase incomplete sunt text
+    for chunk in chain(_iter_chunks(html_or_stream), [None]):
+        final = chunk is None
+        if not final:
+            buf += chunk
+        for header_start, header_end, name in scanner.scan(buf, final):
+            if company_name is not None:
+                act = _build_act(company_name, buf[act_start:header_start], nr_act + 1, nr_monitor, texts, db)
+                if act:
+                    nr_act += 1
+                    yield act
+                if texts.full():
+                    texts.freeze()
+                    texts = MonitorText()
+            company_name = WHITESPACE.sub(' ', name.strip())
+            act_start = header_end
+
+        # Se păstrează doar actul curent și antetul încă deschis
+        keep_from = scanner.pos if act_start is None else act_start
+        if scanner.header_start is not None:
+            keep_from = min(keep_from, scanner.header_start)
+        if keep_from and not final:
+            buf = buf[keep_from:]
+            scanner.shift(keep_from)
+            if act_start is not None:
+                act_start -= keep_from
 
+    if company_name is not None:
+        act = _build_act(company_name, buf[act_start:], nr_act + 1, nr_monitor, texts, db)
+        if act:
+            yield act
+    texts.freeze()
 
-def parse_monitor(html: str, nr_monitor: int) -> List[Act]:
+
+def parse_monitor(html: Union[str, bytes, IO], nr_monitor: int) -> List[Act]:
     """Parsează un monitor și returnează lista de acte."""
-    acts = []
-    company_pattern = r'<strong>(?:Societatea\s+)?([^<]+(?:S\.R\.L\.|SRL|S\.A\.|SA|S\.C\.S\.|SCS)[^<]*)</strong>'
-    matches = list(re.finditer(company_pattern, html, re.IGNORECASE))
-    
-    for i, match in enumerate(matches):
-        company_name = match.group(1).strip()
-        company_name = re.sub(r'\s+', ' ', company_name)
-        
-        start_pos = match.end()
-        end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(html)
-        
-        text_complet = html[start_pos:end_pos]
-        text_complet = re.sub(r'<[^>]+>', ' ', text_complet)
-        text_complet = re.sub(r'\s+', ' ', text_complet).strip()
-        
-        # Skip notificări ORC (sunt doar confirmări)
-        if 'oficiul registrului comer' in text_complet.lower()[:100]:
-            continue
-        
-        cui = extract_cui(text_complet)
-        op_id, op_name, op_category = detect_operation(text_complet)
-        
-        act = Act(
-            nr_act=len(acts) + 1,
-            denumire=company_name,
-            cui=cui,
-            tip_operatiune=op_name,
-            tip_operatiune_id=op_id,
-            categorie_operatiune=op_category,
-            text_complet=text_complet[:2000],
-            nr_monitor=nr_monitor,
-            is_noise=op_id in NOISE_OPERATIONS,
-            is_high_interest=op_id in HIGH_INTEREST_OPERATIONS
-        )
-        
-        # Verificăm TOP
-        name_norm = normalize_name(company_name)
-        if cui and cui in TOP_COMPANII:
-            info = TOP_COMPANII[cui]
-            act.in_top = True
-            act.rank = info['rank']
-            act.ca = info['ca']
-            act.categorie_ca, _ = get_ca_category(info['ca'])
-        elif name_norm in TOP_COMPANII_BY_NAME:
-            info = TOP_COMPANII_BY_NAME[name_norm]
-            act.in_top = True
-            act.rank = info['rank']
-            act.ca = info['ca']
-            act.categorie_ca, _ = get_ca_category(info['ca'])
-        
-        acts.append(act)
-    
+    timings = current_timings()
+    if timings is None:
+        return list(iter_acts(html, nr_monitor))
+
+    # Segmentarea e ce rămâne din timpul total după etapele măsurate per act
+    measured = ('identificatori', 'detectie', 'top')
+    before = sum(timings.stages.get(stage, 0.0) for stage in measured)
+    start = perf_counter()
+    acts = list(iter_acts(html, nr_monitor))
+    elapsed = perf_counter() - start
+    after = sum(timings.stages.get(stage, 0.0) for stage in measured)
+    record_stage('segmentare', elapsed - (after - before))
+    record_volume(acts=len(acts))
     return acts
 
 
@@ -184,37 +818,275 @@ def format_ca(ca: int) -> str:
         return f"{ca:,} lei"
 
 
-def generate_html_report(all_acts: List[Act], monitors_info: Dict[int, str]) -> str:
-    """Generează raportul HTML."""
-    
-    # Separăm actele
+def report_sections(all_acts: List[Act]) -> dict:
+    """
+    Actele pe secțiunile raportului: numărul actelor TOP și al celor relevante,
+    actele de interes major din TOP și TOP pe categorii CA (ordonate după rang),
+    actele relevante grupate pe monitoare.
+    """
+    if np is not None:
+        batch = classify_batch(all_acts)
+        relevant = ~batch.is_noise
+        top = batch.in_top & relevant
+        ca_categories = {
+            name: [all_acts[i] for i in batch.by_rank(top & (batch.ca_category_code == code))]
+            for name, code in CA_CATEGORY_CODES.items() if name != "SUB 50M"
+        }
+        return {
+            'top': int(top.sum()),
+            'relevant': int(relevant.sum()),
+            'high_interest_top': [all_acts[i] for i in batch.by_rank(top & batch.is_high_interest)],
+            'ca_categories': ca_categories,
+            'acts_by_monitor': {nr: [all_acts[i] for i in group] for nr, group in batch.by_monitor(relevant).items()},
+        }
+
     top_acts = [a for a in all_acts if a.in_top and not a.is_noise]
     relevant_acts = [a for a in all_acts if not a.is_noise]
-    noise_acts = [a for a in all_acts if a.is_noise]
-    high_interest_top = [a for a in top_acts if a.is_high_interest]
-    
-    # Grupăm TOP pe categorii CA
-    ca_categories = {
-        "GIGANT": [], "MARI": [], "MEDII-MARI": [],
-        "MEDII": [], "MEDII-MICI": [], "MICI DIN TOP": [],
-    }
+    ca_categories = {name: [] for name in CA_CATEGORY_CODES if name != "SUB 50M"}
     for act in top_acts:
         if act.categorie_ca in ca_categories:
             ca_categories[act.categorie_ca].append(act)
     for cat in ca_categories:
         ca_categories[cat].sort(key=lambda x: x.rank)
-    
-    # Statistici
-    total_acts = len(all_acts)
-    total_relevant = len(relevant_acts)
-    total_top = len(top_acts)
-    total_high_interest = len(high_interest_top)
-    
-    monitors_sorted = sorted(monitors_info.keys())
-    first_mo = monitors_sorted[0] if monitors_sorted else 0
-    last_mo = monitors_sorted[-1] if monitors_sorted else 0
-    
-    html = f'''<!DOCTYPE html>
+    acts_by_monitor = {}
+    for act in relevant_acts:
+        acts_by_monitor.setdefault(act.nr_monitor, []).append(act)
+    return {
+        'top': len(top_acts),
+        'relevant': len(relevant_acts),
+        'high_interest_top': sorted((a for a in top_acts if a.is_high_interest), key=lambda x: x.rank),
+        'ca_categories': ca_categories,
+        'acts_by_monitor': acts_by_monitor,
+    }
+
+
+# Culoarea și intervalul fiecărei categorii CA din secțiunea A
+_CA_INFO = {
+    "GIGANT": ("gigant", "> 10 mld lei"),
+    "MARI": ("mari", "1-10 mld lei"),
+    "MEDII-MARI": ("medii-mari", "500M - 1 mld lei"),
+    "MEDII": ("medii", "200M - 500M lei"),
+    "MEDII-MICI": ("medii-mici", "100M - 200M lei"),
+    "MICI DIN TOP": ("mici", "50M - 100M lei"),
+}
+
+_OP_CSS = {
+    "Capital și finanțare": "capital",
+    "Structură societate": "structura",
+    "Sediu și puncte de lucru": "sediu",
+    "Administrație și management": "admin",
+    "Administrație": "admin",
+    "Obiect de activitate": "activitate",
+}
+
+# Versiunea formatului MonitorReport; o stare salvată cu altă versiune nu mai e citită
+REPORT_STATE_VERSION = 2
+
+
+def _high_interest_card(act: Act) -> str:
+    css = act.categorie_ca.lower().replace(' ', '-').replace('din-top', '')
+    op_spans = []
+    for op_id, op in zip(act.operatiuni_ids, act.operatiuni):
+        # Doar operațiunile de interes major sunt marcate "high"; celelalte au culoarea categoriei
+        if op_id in HIGH_INTEREST_OPERATIONS:
+            op_css = "high"
+        else:
+            op_css = _OP_CSS.get(OPERATION_CATEGORIES.get(op_id, act.categorie_operatiune), "")
+        op_spans.append(f'<span class="card-op {op_css}">{op}</span>')
+    ops_html = ' '.join(op_spans)
+    return f'''
+        <div class="card {css} high-interest">
+            <div class="card-header">
+                <span class="card-name">{act.denumire}</span>
+                <span class="card-mo">MO {act.nr_monitor}</span>
+            </div>
+            <div class="card-meta">Rank #{act.rank} | CA: {format_ca(act.ca)} | {act.categorie_ca}</div>
+            {ops_html}
+        </div>
+'''
+
+
+def _top_card(act: Act, css: str) -> str:
+    hi_class = " high-interest" if act.is_high_interest else ""
+    op_spans = []
+    for op_id, op in zip(act.operatiuni_ids, act.operatiuni):
+        op_css = _OP_CSS.get(OPERATION_CATEGORIES.get(op_id, act.categorie_operatiune), "")
+        op_spans.append(f'<span class="card-op {op_css}">{op}</span>')
+    ops_html = ' '.join(op_spans)
+    return f'''
+            <div class="card {css}{hi_class}">
+                <div class="card-header">
+                    <span class="card-name">{act.denumire}</span>
+                    <span class="card-mo">MO {act.nr_monitor}</span>
+                </div>
+                <div class="card-meta">Rank #{act.rank} | CA: {format_ca(act.ca)}</div>
+                {ops_html}
+            </div>
+'''
+
+
+def _monitor_group(nr_mo: int, data_mo: str, acts_list: List[Act]) -> str:
+    items = [f'''
+        <div class="monitor-group">
+            <div class="monitor-header" onclick="toggleMonitor(this)">
+                <span><span class="expand-icon">▶</span> MO IV nr. {nr_mo} din {data_mo}</span>
+                <span class="monitor-count">{len(acts_list)} acte</span>
+            </div>
+            <div class="monitor-list">
+''']
+    for act in acts_list:
+        css_class = ''
+        if act.is_high_interest and act.in_top:
+            css_class = ' high'
+        elif act.in_top:
+            css_class = ' top'
+        marker = ' 🔴' if act.is_high_interest else (' ⭐' if act.in_top else '')
+        items.append(f'''
+                <div class="monitor-item{css_class}">
+                    <span class="name">{act.denumire}{marker}</span>
+                    <span class="op">{', '.join(act.operatiuni)}</span>
+                </div>
+''')
+    items.append('</div></div>')
+    return ''.join(items)
+
+
+@dataclass
+class MonitorReport:
+    """
+    Partea unui monitor din raport: contoarele și fragmentele HTML ale actelor
+    lui pe secțiuni, deja generate. Cardurile din secțiunile ordonate după
+    rang sunt perechi [rang, html]; un monitor fără acte relevante are `listing` gol.
+    """
+    nr_monitor: int
+    data_mo: str
+    an: int = 0
+    total: int = 0
+    relevant: int = 0
+    top: int = 0
+    high_interest_top: List[Tuple[int, str]] = field(default_factory=list)
+    ca_categories: Dict[str, List[Tuple[int, str]]] = field(default_factory=dict)
+    listing: str = ''
+
+    def to_dict(self) -> dict:
+        return {'version': REPORT_STATE_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MonitorReport':
+        data = dict(data)
+        if data.pop('version', None) != REPORT_STATE_VERSION:
+            raise ValueError(f"Starea monitorului {data.get('nr_monitor')} are alt format decât "
+                             f"versiunea {REPORT_STATE_VERSION}")
+        return cls(**data)
+
+
+def monitor_year(data_mo: str) -> int:
+    """Anul monitorului din data lui ('15.01.2026' -> 2026); 0 dacă data lipsește."""
+    year = data_mo.rpartition('.')[2]
+    return int(year) if year.isdigit() else 0
+
+
+def monitor_report(nr_monitor: int, data_mo: str, acts: List[Act], an: Optional[int] = None) -> MonitorReport:
+    """
+    Partea din raport a actelor unui monitor (toate cu același nr_monitor).
+    `an` e anul monitorului; implicit, cel din `data_mo`.
+    """
+    sections = report_sections(acts)
+    ca_categories = {}
+    for cat_name, acts_list in sections['ca_categories'].items():
+        if acts_list:
+            css = _CA_INFO[cat_name][0]
+            ca_categories[cat_name] = [(act.rank, _top_card(act, css)) for act in acts_list]
+    relevant_acts = sections['acts_by_monitor'].get(nr_monitor, [])
+    return MonitorReport(
+        nr_monitor=nr_monitor,
+        data_mo=data_mo,
+        an=monitor_year(data_mo) if an is None else an,
+        total=len(acts),
+        relevant=sections['relevant'],
+        top=sections['top'],
+        high_interest_top=[(act.rank, _high_interest_card(act)) for act in sections['high_interest_top']],
+        ca_categories=ca_categories,
+        listing=_monitor_group(nr_monitor, data_mo, relevant_acts) if relevant_acts else '',
+    )
+
+
+def _by_rank(parts: List[List[Tuple[int, str]]]) -> Iterable[Tuple[int, str]]:
+    """Cardurile mai multor monitoare, interclasate după rang (la rang egal, în ordinea monitoarelor)."""
+    parts = [part for part in parts if part]
+    if len(parts) == 1:
+        return parts[0]
+    return heapq.merge(*parts, key=itemgetter(0))
+
+
+class ReportState:
+    """
+    Starea serializabilă a unui raport: MonitorReport pentru fiecare monitor,
+    în ordinea adăugării. add_monitor() generează doar partea monitorului nou,
+    deci costul nu depinde de câte monitoare au fost adăugate înainte; raportul
+    e compus din fragmentele deja generate, fără actele monitoarelor anterioare.
+    Monitoarele sunt identificate prin (an, nr_monitor), deci același număr din
+    ani diferiți are părți separate; un monitor adăugat din nou își înlocuiește partea.
+    """
+
+    def __init__(self, monitors: Iterable[MonitorReport] = ()):
+        self.monitors: Dict[Tuple[int, int], MonitorReport] = {}
+        for report in monitors:
+            self.add(report)
+
+    def add(self, report: MonitorReport) -> None:
+        key = (report.an, report.nr_monitor)
+        self.monitors.pop(key, None)
+        self.monitors[key] = report
+
+    def add_monitor(self, nr_monitor: int, data_mo: str, acts: List[Act], an: Optional[int] = None) -> MonitorReport:
+        report = monitor_report(nr_monitor, data_mo, acts, an)
+        self.add(report)
+        return report
+
+    def counters(self) -> Dict[str, int]:
+        """Contoarele din sumarul raportului."""
+        parts = self.monitors.values()
+        total = sum(part.total for part in parts)
+        relevant = sum(part.relevant for part in parts)
+        return {
+            'acts': total,
+            'relevant': relevant,
+            'top': sum(part.top for part in parts),
+            'high_interest_top': sum(len(part.high_interest_top) for part in parts),
+            'noise': total - relevant,
+            'monitors': len(self.monitors),
+        }
+
+    def to_dict(self) -> dict:
+        return {'version': REPORT_STATE_VERSION, 'monitors': [part.to_dict() for part in self.monitors.values()]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ReportState':
+        if data.get('version') != REPORT_STATE_VERSION:
+            raise ValueError(f"Starea raportului are alt format decât versiunea {REPORT_STATE_VERSION}")
+        return cls(MonitorReport.from_dict(part) for part in data['monitors'])
+
+    def iter_html(self, notice: Optional[str] = None) -> Iterator[str]:
+        """
+        Generează raportul HTML bucată cu bucată, pentru a fi transmis pe măsură ce e produs.
+        `notice` (text simplu) e afișat sub sumar, de exemplu pentru un raport parțial.
+        """
+        counters = self.counters()
+        parts = list(self.monitors.values())
+        
+        # Statistici
+        total_relevant = counters['relevant']
+        total_top = counters['top']
+        total_high_interest = counters['high_interest_top']
+        total_noise = counters['noise']
+        
+        # Cronologic, după (an, nr_monitor)
+        monitors_sorted = sorted(self.monitors.keys())
+        first_mo = monitors_sorted[0][1] if monitors_sorted else 0
+        last_mo = monitors_sorted[-1][1] if monitors_sorted else 0
+        
+        yield f'''<!DOCTYPE html>
 <html lang="ro">
 <head>
     <meta charset="UTF-8">
@@ -300,73 +1172,49 @@ def generate_html_report(all_acts: List[Act], monitors_info: Dict[int, str]) ->
         <div class="sumar-item highlight"><div class="number">{total_high_interest}</div><div class="label">Interes major</div></div>
         <div class="sumar-item"><div class="number">{total_top}</div><div class="label">Companii TOP</div></div>
         <div class="sumar-item"><div class="number">{total_relevant}</div><div class="label">Acte relevante</div></div>
-        <div class="sumar-item"><div class="number">{len(monitors_info)}</div><div class="label">Monitoare</div></div>
-        <div class="sumar-item"><div class="number">{len(noise_acts)}</div><div class="label">Zgomot filtrat</div></div>
+        <div class="sumar-item"><div class="number">{counters['monitors']}</div><div class="label">Monitoare</div></div>
+        <div class="sumar-item"><div class="number">{total_noise}</div><div class="label">Zgomot filtrat</div></div>
     </div>
     
     <div style="background: #fef3c7; border-left: 4px solid #f59e0b; padding: 12px 20px; margin: 0; font-size: 13px; color: #92400e;">
         ⚠️ <strong>Atenție:</strong> Filtrare &amp; etichetare realizată automat, verificați documentele originale!
     </div>
 '''
-    
-    # Secțiunea de interes major (dacă există)
-    if high_interest_top:
-        html += f'''
+        if notice:
+            yield f'''
+    <div style="background: #fee2e2; border-left: 4px solid #dc2626; padding: 12px 20px; margin: 0; font-size: 13px; color: #991b1b;">
+        ⏱️ <strong>Raport parțial:</strong> {escape(notice)}
+    </div>
+'''
+        
+        # Secțiunea de interes major (dacă există)
+        if total_high_interest:
+            yield f'''
     <div class="section">
         <div class="section-header">
             <h2>🔴 Operațiuni de interes major</h2>
-            <span class="badge alert">{len(high_interest_top)} acte</span>
+            <span class="badge alert">{total_high_interest} acte</span>
         </div>
 '''
-        for act in sorted(high_interest_top, key=lambda x: x.rank):
-            css = act.categorie_ca.lower().replace(' ', '-').replace('din-top', '')
-            op_css = "high"
-            html += f'''
-        <div class="card {css} high-interest">
-            <div class="card-header">
-                <span class="card-name">{act.denumire}</span>
-                <span class="card-mo">MO {act.nr_monitor}</span>
-            </div>
-            <div class="card-meta">Rank #{act.rank} | CA: {format_ca(act.ca)} | {act.categorie_ca}</div>
-            <span class="card-op {op_css}">{act.tip_operatiune}</span>
-        </div>
-'''
-        html += '</div>'
-    
-    # Secțiunea A: Companii din TOP (doar dacă există)
-    if total_top > 0:
-        html += f'''
+            for _, card in _by_rank([part.high_interest_top for part in parts]):
+                yield card
+            yield '</div>'
+        
+        # Secțiunea A: Companii din TOP (doar dacă există)
+        if total_top > 0:
+            yield f'''
     <div class="section">
         <div class="section-header">
             <h2>Secțiunea A: Companii din TOP România</h2>
             <span class="badge">{total_top} companii</span>
         </div>
 '''
-    
-        ca_info = {
-            "GIGANT": ("gigant", "> 10 mld lei"),
-            "MARI": ("mari", "1-10 mld lei"),
-            "MEDII-MARI": ("medii-mari", "500M - 1 mld lei"),
-            "MEDII": ("medii", "200M - 500M lei"),
-            "MEDII-MICI": ("medii-mici", "100M - 200M lei"),
-            "MICI DIN TOP": ("mici", "50M - 100M lei"),
-        }
-        
-        op_css_map = {
-            "Capital și finanțare": "capital",
-            "Structură societate": "structura",
-            "Sediu și puncte de lucru": "sediu",
-            "Administrație și management": "admin",
-            "Administrație": "admin",
-            "Obiect de activitate": "activitate",
-        }
-        
-        # Afișăm doar categoriile care au rezultate
-        for cat_name, acts_list in ca_categories.items():
-            if not acts_list:  # Skip categoriile goale
-                continue
-            css, ca_range = ca_info[cat_name]
-            html += f'''
+            # Afișăm doar categoriile care au rezultate
+            for cat_name, (css, ca_range) in _CA_INFO.items():
+                cards = [part.ca_categories[cat_name] for part in parts if cat_name in part.ca_categories]
+                if not cards:  # Skip categoriile goale
+                    continue
+                yield f'''
         <div class="ca-category">
             <div class="ca-header">
                 <div class="ca-dot {css}"></div>
@@ -374,68 +1222,29 @@ def generate_html_report(all_acts: List[Act], monitors_info: Dict[int, str]) ->
                 <span class="ca-range">({ca_range})</span>
             </div>
 '''
-            for act in acts_list:
-                op_css = op_css_map.get(act.categorie_operatiune, "")
-                hi_class = " high-interest" if act.is_high_interest else ""
-                html += f'''
-            <div class="card {css}{hi_class}">
-                <div class="card-header">
-                    <span class="card-name">{act.denumire}</span>
-                    <span class="card-mo">MO {act.nr_monitor}</span>
-                </div>
-                <div class="card-meta">Rank #{act.rank} | CA: {format_ca(act.ca)}</div>
-                <span class="card-op {op_css}">{act.tip_operatiune}</span>
-            </div>
-'''
-            html += '</div>'
+                for _, card in _by_rank(cards):
+                    yield card
+                yield '</div>'
+            
+            yield '</div>'
         
-        html += '</div>'
-    
-    # Secțiunea D: Listă completă (doar acte relevante)
-    html += f'''
+        # Secțiunea D: Listă completă (doar acte relevante)
+        yield f'''
     <div class="section">
         <div class="section-header">
             <h2>Secțiunea D: Listă completă companii identificate și tipul operațiunii comunicate, per monitor</h2>
             <span class="badge">{total_relevant} acte relevante</span>
         </div>
         <p style="font-size: 12px; color: #64748b; margin-bottom: 15px;">
-            Exclus: {len(noise_acts)} notificări ORC și actualizări CAEN
+            Exclus: {total_noise} notificări ORC și actualizări CAEN
         </p>
 '''
-    
-    acts_by_monitor = {}
-    for act in relevant_acts:
-        if act.nr_monitor not in acts_by_monitor:
-            acts_by_monitor[act.nr_monitor] = []
-        acts_by_monitor[act.nr_monitor].append(act)
-    
-    for nr_mo in sorted(acts_by_monitor.keys()):
-        acts_list = acts_by_monitor[nr_mo]
-        data_mo = monitors_info.get(nr_mo, "")
-        html += f'''
-        <div class="monitor-group">
-            <div class="monitor-header" onclick="toggleMonitor(this)">
-                <span><span class="expand-icon">▶</span> MO IV nr. {nr_mo} din {data_mo}</span>
-                <span class="monitor-count">{len(acts_list)} acte</span>
-            </div>
-            <div class="monitor-list">
-'''
-        for act in acts_list:
-            css_class = ''
-            if act.is_high_interest and act.in_top:
-                css_class = ' high'
-            elif act.in_top:
-                css_class = ' top'
-            marker = ' 🔴' if act.is_high_interest else (' ⭐' if act.in_top else '')
-            html += f'''
-                <div class="monitor-item{css_class}">
-                    <span class="name">{act.denumire}{marker}</span>
-                    <span class="op">{act.tip_operatiune}</span>
-                </div>
-'''
-        html += '</div></div>'
-    
-    html += '''
+        for key in monitors_sorted:
+            listing = self.monitors[key].listing
+            if listing:
+                yield listing
+        
+        yield '''
     </div>
     <div class="footer">MO IV Analyzer v4.0 | Pattern-uri din analiza 2.093 acte | Dezvoltare: Adrian Seceleanu</div>
 </div>
@@ -446,8 +1255,34 @@ function toggleMonitor(h) {
 }
 </script>
 </body></html>'''
-    
-    return html
+
+
+def report_state(all_acts: List[Act], monitors_info: Dict[int, str]) -> ReportState:
+    """Starea raportului pentru actele date, cu monitoarele în ordinea primului lor act."""
+    by_monitor: Dict[int, List[Act]] = {}
+    for act in all_acts:
+        by_monitor.setdefault(act.nr_monitor, []).append(act)
+    state = ReportState()
+    for nr_monitor, acts in by_monitor.items():
+        state.add_monitor(nr_monitor, monitors_info.get(nr_monitor, ""), acts)
+    for nr_monitor, data_mo in monitors_info.items():
+        if nr_monitor not in by_monitor:
+            state.add_monitor(nr_monitor, data_mo, [])
+    return state
+
+
+def iter_html_report(all_acts: List[Act], monitors_info: Dict[int, str],
+                     notice: Optional[str] = None) -> Iterator[str]:
+    """
+    Generează raportul HTML bucată cu bucată, pentru a fi transmis pe măsură ce e produs.
+    `notice` (text simplu) e afișat sub sumar, de exemplu pentru un raport parțial.
+    """
+    return report_state(all_acts, monitors_info).iter_html(notice)
+
+
+def generate_html_report(all_acts: List[Act], monitors_info: Dict[int, str]) -> str:
+    """Generează raportul HTML."""
+    return ''.join(iter_html_report(all_acts, monitors_info))
 
 
 if __name__ == "__main__":
@@ -469,16 +1304,15 @@ if __name__ == "__main__":
         all_acts.extend(acts)
         monitors_info[nr] = data
         
-        top_count = sum(1 for a in acts if a.in_top)
-        high_count = sum(1 for a in acts if a.is_high_interest and a.in_top)
-        noise_count = sum(1 for a in acts if a.is_noise)
-        print(f"  -> {len(acts)} acte, {top_count} TOP, {high_count} interes major, {noise_count} zgomot")
+        counts = count_flags(acts)
+        print(f"  -> {len(acts)} acte, {counts['top']} TOP, {counts['high_interest_top']} interes major, {counts['noise']} zgomot")
     
+    counts = count_flags(all_acts)
     print(f"\n{'='*50}")
     print(f"Total: {len(all_acts)} acte")
-    print(f"Din TOP: {sum(1 for a in all_acts if a.in_top)}")
-    print(f"Interes major (TOP): {sum(1 for a in all_acts if a.is_high_interest and a.in_top)}")
-    print(f"Zgomot filtrat: {sum(1 for a in all_acts if a.is_noise)}")
+    print(f"Din TOP: {counts['top']}")
+    print(f"Interes major (TOP): {counts['high_interest_top']}")
+    print(f"Zgomot filtrat: {counts['noise']}")
     
     # Statistici operațiuni
     from collections import Counter
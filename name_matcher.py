@@ -0,0 +1,90 @@
+"""
+Potrivire aproximativă a denumirilor cu TOP companii
+Index inversat de trigrame peste toate denumirile, construit o singură dată
+"""
+
+import math
+import os
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from company_index import normalize_name
+
+# Scorul minim (Jaccard pe trigrame, 0-1) pentru a accepta o potrivire aproximativă
+FUZZY_THRESHOLD = float(os.environ.get('FUZZY_NAME_THRESHOLD', '0.85'))
+
+# Câți candidați se scorează cel mult la o căutare (listele de trigrame
+# sunt citite de la cele mai rare), ca timpul să nu depindă de mărimea indexului
+MAX_POSTINGS = 500
+
+_LEGAL_FORMS = {'SRL', 'SA', 'SCS', 'SNC', 'SC', 'SOCIETATEA'}
+_SPLIT_FORMS = re.compile(r'\b(S) (R) (L)\b|\b(S) (A)\b|\b(S) (C) (S)\b')
+
+
+def fuzzy_key(name: str) -> str:
+    """
+    Cheia normalize_name (company_index) fără formele juridice rămase în
+    interiorul denumirii ("SC ... SRL", "SOCIETATEA ..."), cuvintele separate prin spațiu.
+    """
+    key = _SPLIT_FORMS.sub(lambda m: ''.join(g for g in m.groups() if g), normalize_name(name))
+    return ' '.join(w for w in key.split() if w not in _LEGAL_FORMS)
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Trigramele fiecărui cuvânt (cu margini), deci independente de ordinea cuvintelor."""
+    grams = set()
+    for word in key.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Index inversat trigramă -> companii, pentru căutarea celei mai apropiate denumiri."""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """`entries`: perechi (cui, denumire)."""
+        self.cuis: List[str] = []
+        self.grams: List[FrozenSet[str]] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for cui, denumire in entries:
+            grams = trigrams(fuzzy_key(denumire))
+            if not grams:
+                continue
+            i = len(self.cuis)
+            self.cuis.append(cui)
+            self.grams.append(grams)
+            for gram in grams:
+                postings[gram].append(i)
+        self.postings = dict(postings)
+
+    def best_match(self, name: str, threshold: float = FUZZY_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """
+        Cea mai apropiată companie: (cui, scor) sau None sub prag.
+        Costul e limitat de MAX_POSTINGS, nu de mărimea indexului.
+        """
+        query = trigrams(fuzzy_key(name))
+        if not query:
+            return None
+
+        # O denumire cu scor >= prag are în comun cu interogarea cel puțin `need`
+        # trigrame, deci conține măcar una dintre cele mai rare len - need + 1
+        need = math.ceil(threshold * len(query) - 1e-9) if threshold > 0 else 1
+        lists = sorted((self.postings.get(g, ()) for g in query), key=len)
+        candidates = set()
+        for ids in lists[:max(len(query) - need + 1, 1)]:
+            if candidates and len(candidates) + len(ids) > MAX_POSTINGS:
+                break
+            candidates.update(ids)
+
+        best = None
+        best_score = threshold
+        for i in sorted(candidates):
+            grams = self.grams[i]
+            common = len(query & grams)
+            score = common / (len(query) + len(grams) - common)
+            if score >= best_score and (best is None or score > best[1]):
+                best = (self.cuis[i], score)
+                best_score = score
+        return best
@@ -0,0 +1,203 @@
+"""
+Cache pentru rezultatele parsării monitoarelor
+Cheia este sha256 peste conținutul monitorului și amprenta versiunii
+(codul parserului, pattern-urile, baza TOP), deci orice modificare a
+acestora invalidează automat intrările vechi.
+
+Două niveluri:
+- LRU în memoria procesului, limitat în bytes (PARSE_CACHE_MB)
+- opțional, SQLite pe disc (PARSE_CACHE_DB), partajat de toți workerii
+La o ratare în ambele, actele unui monitor deja salvat în arhiva de acte
+(act_store, aceeași cheie) sunt citite de acolo în loc de reparsare.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import List, Optional, Union
+
+import mo_parser_v4
+import name_matcher
+from act_store import ACT_STORE
+from metrics import record_stage
+from mo_parser_v4 import Act, parse_monitor
+
+# Memoria maximă a nivelului LRU (MB); 0 dezactivează cache-ul în memorie
+PARSE_CACHE_MB = float(os.environ.get('PARSE_CACHE_MB', '64'))
+# Fișierul SQLite al nivelului pe disc; gol = fără nivel pe disc
+PARSE_CACHE_DB = os.environ.get('PARSE_CACHE_DB', '')
+# Câte monitoare păstrează cel mult nivelul pe disc
+PARSE_CACHE_DB_MAX_ENTRIES = int(os.environ.get('PARSE_CACHE_DB_MAX_ENTRIES', '2000'))
+
+# Modulele de care depinde rezultatul parsării: mo_parser_v4 și toate modulele
+# locale importate de el (un modul nou importat de parser trebuie adăugat aici)
+_SOURCE_FILES = ('patterns_relaxed.py', 'mo_parser_v4.py', 'act_segmenter.py', 'name_matcher.py',
+                 'company_index.py', 'metrics.py', 'time_budget.py')
+_code_fingerprint = None
+
+
+def code_fingerprint() -> str:
+    """Hash peste sursele parserului, calculat o singură dată per proces."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        base = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for name in _SOURCE_FILES:
+            with open(os.path.join(base, name), 'rb') as f:
+                h.update(f.read())
+        _code_fingerprint = h.hexdigest()[:16]
+    return _code_fingerprint
+
+
+def version_fingerprint() -> str:
+    """Amprenta a tot ce influențează rezultatul: cod, baza TOP, pragul fuzzy."""
+    return f"{code_fingerprint()}:{mo_parser_v4.COMPANY_DB.version}:{name_matcher.FUZZY_THRESHOLD}"
+
+
+class ParseCache:
+    """Actele parsate per monitor, serializate compact (pickle + zlib)."""
+
+    def __init__(self, max_bytes: int, db_path: str = '', db_max_entries: int = 2000):
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+
+    def key(self, content: bytes) -> str:
+        h = hashlib.sha256(version_fingerprint().encode('utf-8'))
+        h.update(content)
+        return h.hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Conexiunea SQLite a procesului curent (după fork se deschide alta)."""
+        if not self.db_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS parse_cache ('
+                       'key TEXT PRIMARY KEY, data BLOB NOT NULL, used REAL NOT NULL)')
+            db.execute('CREATE INDEX IF NOT EXISTS parse_cache_used ON parse_cache(used)')
+            self._db = db
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        """Pune blob-ul în LRU, eliminând cele mai vechi intrări peste limită."""
+        if len(blob) > self.max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _get_blob(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return blob
+            try:
+                db = self._connection()
+                row = db.execute('SELECT data FROM parse_cache WHERE key = ?', (key,)).fetchone() if db else None
+                if row:
+                    db.execute('UPDATE parse_cache SET used = ? WHERE key = ?', (time.time(), key))
+                    db.commit()
+            except sqlite3.Error as e:
+                print(f"[WARNING] Cache parsare pe disc indisponibil: {e}")
+                row = None
+            if row:
+                blob = row[0]
+                self._remember(key, blob)
+                self.disk_hits += 1
+                return blob
+            self.misses += 1
+            return None
+
+    def _put_blob(self, key: str, blob: bytes) -> None:
+        with self._lock:
+            self._remember(key, blob)
+            try:
+                db = self._connection()
+                if db:
+                    db.execute('INSERT OR REPLACE INTO parse_cache (key, data, used) VALUES (?, ?, ?)',
+                               (key, blob, time.time()))
+                    db.execute('DELETE FROM parse_cache WHERE key IN (SELECT key FROM parse_cache '
+                               'ORDER BY used DESC LIMIT -1 OFFSET ?)', (self.db_max_entries,))
+                    db.commit()
+            except sqlite3.Error as e:
+                print(f"[WARNING] Cache parsare pe disc indisponibil: {e}")
+
+    def get(self, key: str, nr_monitor: int) -> Optional[List[Act]]:
+        """Actele din cache sau din arhivă (copii noi, cu numărul de monitor cerut) sau None."""
+        blob = self._get_blob(key)
+        if blob is not None:
+            acts = pickle.loads(zlib.decompress(blob))
+        else:
+            acts = ACT_STORE.acts_by_content(key) if ACT_STORE is not None else None
+            if acts is None:
+                return None
+            with self._lock:
+                self.misses -= 1
+                self.store_hits += 1
+            self.put(key, acts)
+        for act in acts:
+            act.nr_monitor = nr_monitor
+        return acts
+
+    def put(self, key: str, acts: List[Act]) -> None:
+        self._put_blob(key, zlib.compress(pickle.dumps(acts, pickle.HIGHEST_PROTOCOL), 1))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.store_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.disk_hits + self.store_hits) / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._memory),
+            'bytes': self._memory_bytes,
+            'disk': bool(self.db_path),
+            'version': version_fingerprint(),
+        }
+
+
+PARSE_CACHE = ParseCache(int(PARSE_CACHE_MB * 1024 * 1024), PARSE_CACHE_DB, PARSE_CACHE_DB_MAX_ENTRIES)
+
+
+def cached_parse_monitor(html: Union[str, bytes], nr_monitor: int, content: Optional[bytes] = None) -> List[Act]:
+    """
+    parse_monitor cu cache; `html` poate fi și bytes / fișier mapat. `content`
+    sunt bytes-ii originali ai monitorului, dacă există deja (altfel se
+    folosește HTML-ul codificat UTF-8).
+    """
+    start = time.perf_counter()
+    key = PARSE_CACHE.key(content if content is not None else html.encode('utf-8'))
+    acts = PARSE_CACHE.get(key, nr_monitor)
+    record_stage('cache', time.perf_counter() - start)
+    if acts is None:
+        acts = parse_monitor(html, nr_monitor)
+        PARSE_CACHE.put(key, acts)
+    return acts
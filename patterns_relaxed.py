@@ -3,9 +3,15 @@ Pattern-uri relaxate pentru operațiuni MO IV
 Combină structura din analiza 2.093 acte cu matching mai permisiv
 """
 
-import re
+from time import perf_counter_ns
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+    print("[WARNING] pyahocorasick nu este instalat - detecția folosește căutări simple în text")
+
 
 # Ordinea de verificare (de la specific la general)
 PATTERN_CHECK_ORDER: List[str] = [
@@ -54,8 +60,15 @@ PATTERN_CHECK_ORDER: List[str] = [
     "actualizare_date",
     "modificare_durata",
     "schimbare_denumire",
+    
+    # PRIORITATE 8: Fallback
+    "hotarare_aga",
+    "decizie_asociat",
 ]
 
+# Bitul fiecărei operațiuni în masca returnată de detect_operations
+OPERATION_BITS: Dict[str, int] = {op_id: 1 << i for i, op_id in enumerate(PATTERN_CHECK_ORDER)}
+
 
 OPERATION_NAMES: Dict[str, str] = {
     "majorare_capital_conversie_creanta": "Majorare capital prin conversie creanță",
@@ -144,221 +157,314 @@ HIGH_INTEREST_OPERATIONS = {
     "repartizare_dividende", "dizolvare_lichidare",
 }
 
+NOISE_MASK = sum(OPERATION_BITS[op_id] for op_id in NOISE_OPERATIONS)
+HIGH_INTEREST_MASK = sum(OPERATION_BITS[op_id] for op_id in HIGH_INTEREST_OPERATIONS)
 
-def detect_operation(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    """
-    Detectează operațiunea din text folosind keyword matching simplu.
-    Returnează (op_id, op_name, category) sau (None, None, None)
-    """
-    text_lower = text.lower()
-    
+# La detecția tuturor operațiunilor, o operațiune combinată sau specifică
+# le ascunde pe cele generale pe care le conține deja
+SUBSUMED_OPERATIONS: Dict[str, Tuple[str, ...]] = {
+    "majorare_capital_conversie_creanta": ("majorare_capital",),
+    "dizolvare_lichidare": ("dizolvare", "lichidare"),
+    "cesiune_cooptare": ("cesiune_parti_sociale", "cooptare_asociat"),
+    "fuziune_absorbtie": ("fuziune",),
+    "completare_activitati": ("modificare_obiect_activitate",),
+    "radiere_activitati": ("modificare_obiect_activitate",),
+    "actualizare_caen": ("modificare_obiect_activitate", "actualizare_date"),
+}
+
+# Hotărârea AGA / decizia asociatului rămân doar dacă nu s-a găsit altceva
+# (și atunci doar cea principală)
+FALLBACK_OPERATIONS = {"hotarare_aga", "decizie_asociat"}
+
+
+# Regulile de detecție, în ordinea în care sunt evaluate (prima regulă
+# îndeplinită câștigă). O regulă este (op_id, clauze): toate clauzele trebuie
+# îndeplinite, iar o clauză este îndeplinită dacă oricare dintre cuvintele-cheie
+# ei apare în textul (lowercase) al actului. Un cuvânt-cheie care începe cu
+# spațiu trebuie să apară la început de cuvânt (' gaj' nu se potrivește în
+# „angajează”), deci nici la începutul textului, nici după punctuație nu e nevoie de spațiu.
+Rule = Tuple[str, Tuple[Tuple[str, ...], ...]]
+
+
+def _at_word_start(text: str, start: int) -> bool:
+    return start == 0 or not text[start - 1].isalnum()
+
+
+def keyword_in(kw: str, text_lower: str) -> bool:
+    """`kw` apare în text (la început de cuvânt, dacă începe cu spațiu)."""
+    if kw[0] != ' ':
+        return kw in text_lower
+    word = kw[1:]
+    start = text_lower.find(word)
+    while start != -1:
+        if _at_word_start(text_lower, start):
+            return True
+        start = text_lower.find(word, start + 1)
+    return False
+
+DETECTION_RULES: List[Rule] = [
     # 1. CONVERSIE CREANȚĂ (foarte specific)
-    if 'capital' in text_lower and ('conversie' in text_lower or 'capitalizare' in text_lower):
-        if 'creanț' in text_lower or 'creant' in text_lower or 'împrumut' in text_lower or 'imprumut' in text_lower:
-            return ("majorare_capital_conversie_creanta", 
-                    OPERATION_NAMES["majorare_capital_conversie_creanta"],
-                    OPERATION_CATEGORIES["majorare_capital_conversie_creanta"])
-    
+    ("majorare_capital_conversie_creanta", (
+        ("capital",), ("conversie", "capitalizare"),
+        ("creanț", "creant", "împrumut", "imprumut"))),
+
     # 2. DIZOLVARE ȘI LICHIDARE (combinat)
-    if ('dizolv' in text_lower and 'lichid' in text_lower) or 'fără lichidator' in text_lower:
-        return ("dizolvare_lichidare",
-                OPERATION_NAMES["dizolvare_lichidare"],
-                OPERATION_CATEGORIES["dizolvare_lichidare"])
-    
+    ("dizolvare_lichidare", (("dizolv",), ("lichidar", "lichidat"))),
+    ("dizolvare_lichidare", (("fără lichidator",),)),
+
     # 3. CESIUNE + COOPTARE
-    if 'cesiune' in text_lower and 'cooptar' in text_lower:
-        return ("cesiune_cooptare",
-                OPERATION_NAMES["cesiune_cooptare"],
-                OPERATION_CATEGORIES["cesiune_cooptare"])
-    
+    ("cesiune_cooptare", (("cesiune",), ("cooptar",))),
+
     # 4. MAJORARE CAPITAL
-    if 'capital' in text_lower and ('majorar' in text_lower or 'mărir' in text_lower or 'marir' in text_lower):
-        return ("majorare_capital",
-                OPERATION_NAMES["majorare_capital"],
-                OPERATION_CATEGORIES["majorare_capital"])
-    
+    ("majorare_capital", (("capital",), ("majorar", "mărir", "marir"))),
+
     # 5. REDUCERE CAPITAL
-    if 'capital' in text_lower and ('reducere' in text_lower or 'diminuar' in text_lower):
-        return ("reducere_capital",
-                OPERATION_NAMES["reducere_capital"],
-                OPERATION_CATEGORIES["reducere_capital"])
-    
+    ("reducere_capital", (("capital",), ("reducere", "diminuar"))),
+
     # 6. APORT ÎN NATURĂ
-    if 'aport' in text_lower and ('natur' in text_lower or 'teren' in text_lower or 'imobil' in text_lower):
-        return ("aport_natura",
-                OPERATION_NAMES["aport_natura"],
-                OPERATION_CATEGORIES["aport_natura"])
-    
+    ("aport_natura", ((" aport",), (" natur", "teren", "imobil"))),
+
     # 7. CESIUNE PĂRȚI SOCIALE
-    if 'cesiune' in text_lower or 'cesiona' in text_lower or 'cedent' in text_lower:
-        if 'părți' in text_lower or 'parti' in text_lower or 'sociale' in text_lower or '100%' in text_lower:
-            return ("cesiune_parti_sociale",
-                    OPERATION_NAMES["cesiune_parti_sociale"],
-                    OPERATION_CATEGORIES["cesiune_parti_sociale"])
-    
+    ("cesiune_parti_sociale", (
+        ("cesiune", "cesiona", "cedent"), ("părți", "parti", "sociale", "100%"))),
+
     # 8. CONTRACTARE CREDIT
-    if 'credit' in text_lower and ('contract' in text_lower or 'obține' in text_lower or 'obtine' in text_lower):
-        return ("contractare_credit",
-                OPERATION_NAMES["contractare_credit"],
-                OPERATION_CATEGORIES["contractare_credit"])
-    
+    ("contractare_credit", (("credit",), ("contract", "obține", "obtine"))),
+
     # 9. GARANȚII
-    if 'garanți' in text_lower or 'garanti' in text_lower or 'ipotec' in text_lower or 'gaj' in text_lower:
-        return ("constituire_garantii",
-                OPERATION_NAMES["constituire_garantii"],
-                OPERATION_CATEGORIES["constituire_garantii"])
-    
+    ("constituire_garantii", (("garanți", "garanti", "ipotec", " gaj"),)),
+
     # 10. DIVIDENDE
-    if 'dividend' in text_lower or ('repartiz' in text_lower and 'profit' in text_lower):
-        return ("repartizare_dividende",
-                OPERATION_NAMES["repartizare_dividende"],
-                OPERATION_CATEGORIES["repartizare_dividende"])
-    
+    ("repartizare_dividende", (("dividend",),)),
+    ("repartizare_dividende", (("repartiz",), ("profit",))),
+
     # 11. FUZIUNE PRIN ABSORBȚIE
-    if 'fuziune' in text_lower and ('absorbți' in text_lower or 'absorbt' in text_lower):
-        return ("fuziune_absorbtie",
-                OPERATION_NAMES["fuziune_absorbtie"],
-                OPERATION_CATEGORIES["fuziune_absorbtie"])
-    
+    ("fuziune_absorbtie", (("fuziune",), ("absorbți", "absorbt"))),
+
     # 12. FUZIUNE (simplă)
-    if 'fuziune' in text_lower:
-        return ("fuziune",
-                OPERATION_NAMES["fuziune"],
-                OPERATION_CATEGORIES["fuziune"])
-    
+    ("fuziune", (("fuziune",),)),
+
     # 13. DIVIZARE
-    if 'divizare' in text_lower or 'diviza' in text_lower:
-        return ("divizare",
-                OPERATION_NAMES["divizare"],
-                OPERATION_CATEGORIES["divizare"])
-    
+    ("divizare", (("divizare", "diviza"),)),
+
     # 14. DIZOLVARE (singură)
-    if 'dizolv' in text_lower:
-        return ("dizolvare",
-                OPERATION_NAMES["dizolvare"],
-                OPERATION_CATEGORIES["dizolvare"])
-    
+    ("dizolvare", (("dizolv",),)),
+
     # 15. LICHIDARE (singură)
-    if 'lichid' in text_lower:
-        return ("lichidare",
-                OPERATION_NAMES["lichidare"],
-                OPERATION_CATEGORIES["lichidare"])
-    
+    ("lichidare", (("lichidar", "lichidat"),)),
+
     # 16. TRANSFORMARE FORMĂ JURIDICĂ
-    if 'transform' in text_lower and ('formă' in text_lower or 'forma' in text_lower or 'juridic' in text_lower):
-        return ("transformare_forma",
-                OPERATION_NAMES["transformare_forma"],
-                OPERATION_CATEGORIES["transformare_forma"])
-    
-    # 17. SCHIMBARE SEDIU
-    if 'sediu' in text_lower:
-        # Verificăm să nu fie doar mențiune
-        if any(kw in text_lower for kw in ['schimbar', 'mutar', 'muta', 'transfer', 'nou sediu', 'noul sediu']):
-            return ("schimbare_sediu",
-                    OPERATION_NAMES["schimbare_sediu"],
-                    OPERATION_CATEGORIES["schimbare_sediu"])
-    
-    # 18. PUNCT DE LUCRU - DESCHIDERE
-    if 'punct' in text_lower and 'lucru' in text_lower:
-        if any(kw in text_lower for kw in ['deschid', 'înființ', 'infiint', 'înregistr']):
-            return ("deschidere_punct_lucru",
-                    OPERATION_NAMES["deschidere_punct_lucru"],
-                    OPERATION_CATEGORIES["deschidere_punct_lucru"])
-        if any(kw in text_lower for kw in ['închid', 'inchid', 'radier', 'desființ']):
-            return ("inchidere_punct_lucru",
-                    OPERATION_NAMES["inchidere_punct_lucru"],
-                    OPERATION_CATEGORIES["inchidere_punct_lucru"])
-    
+    ("transformare_forma", (("transform",), (" formă", " forma", "juridic"))),
+
+    # 17. SCHIMBARE SEDIU (nu doar mențiune a sediului)
+    ("schimbare_sediu", (
+        ("sediu",),
+        ("schimbar", "mutar", " muta", "transfer", "nou sediu", "noul sediu"))),
+
+    # 18. PUNCT DE LUCRU - DESCHIDERE / ÎNCHIDERE
+    ("deschidere_punct_lucru", (
+        ("punct",), ("lucru",), ("deschid", "înființ", "infiint", "înregistr"))),
+    ("inchidere_punct_lucru", (
+        ("punct",), ("lucru",), ("închid", "inchid", "radier", "desființ"))),
+
     # 19. RETRAGERE ASOCIAT
-    if 'retragere' in text_lower or 'retras' in text_lower:
-        if 'asociat' in text_lower or 'societate' in text_lower:
-            return ("retragere_asociat",
-                    OPERATION_NAMES["retragere_asociat"],
-                    OPERATION_CATEGORIES["retragere_asociat"])
-    
+    ("retragere_asociat", (("retragere", "retras"), ("asociat", "societate"))),
+
     # 20. COOPTARE ASOCIAT
-    if 'cooptar' in text_lower:
-        return ("cooptare_asociat",
-                OPERATION_NAMES["cooptare_asociat"],
-                OPERATION_CATEGORIES["cooptare_asociat"])
-    
-    # 21. ADMINISTRATOR - NUMIRE
-    if 'administrator' in text_lower:
-        if any(kw in text_lower for kw in ['numir', 'numit', 'desemn']):
-            if any(kw in text_lower for kw in ['revocar', 'înlocui', 'inlocui']):
-                return ("revocare_administrator",
-                        OPERATION_NAMES["revocare_administrator"],
-                        OPERATION_CATEGORIES["revocare_administrator"])
-            return ("numire_administrator",
-                    OPERATION_NAMES["numire_administrator"],
-                    OPERATION_CATEGORIES["numire_administrator"])
-        if any(kw in text_lower for kw in ['revocar', 'încetar', 'incetar', 'demisie']):
-            return ("revocare_administrator",
-                    OPERATION_NAMES["revocare_administrator"],
-                    OPERATION_CATEGORIES["revocare_administrator"])
-        if any(kw in text_lower for kw in ['prelungir', 'reînnoi', 'reinnoi']):
-            return ("prelungire_mandat",
-                    OPERATION_NAMES["prelungire_mandat"],
-                    OPERATION_CATEGORIES["prelungire_mandat"])
-    
+    ("cooptare_asociat", (("cooptar",),)),
+
+    # 21. ADMINISTRATOR - NUMIRE (cu înlocuire = revocare) / REVOCARE / PRELUNGIRE
+    ("revocare_administrator", (
+        ("administrator",), (" numir", " numit", "desemn"),
+        ("revocar", "înlocui", "inlocui"))),
+    ("numire_administrator", (("administrator",), (" numir", " numit", "desemn"))),
+    ("revocare_administrator", (
+        ("administrator",), ("revocar", "încetar", "incetar", "demisie"))),
+    ("prelungire_mandat", (
+        ("administrator",), ("prelungir", "reînnoi", "reinnoi"))),
+
     # 22. SCHIMBARE REPREZENTANT
-    if 'reprezentant' in text_lower and ('schimbar' in text_lower or 'înlocui' in text_lower):
-        return ("schimbare_reprezentant",
-                OPERATION_NAMES["schimbare_reprezentant"],
-                OPERATION_CATEGORIES["schimbare_reprezentant"])
-    
+    ("schimbare_reprezentant", (("reprezentant",), ("schimbar", "înlocui"))),
+
     # 23. CAEN / ACTUALIZARE
-    if 'caen' in text_lower:
-        if 'rev' in text_lower or 'actuali' in text_lower or 'recodific' in text_lower or 'declar' in text_lower:
-            return ("actualizare_caen",
-                    OPERATION_NAMES["actualizare_caen"],
-                    OPERATION_CATEGORIES["actualizare_caen"])
-    
-    # 24. COMPLETARE ACTIVITĂȚI
-    if 'activit' in text_lower:
-        if 'completar' in text_lower or 'adăugar' in text_lower or 'adaug' in text_lower or 'extind' in text_lower:
-            return ("completare_activitati",
-                    OPERATION_NAMES["completare_activitati"],
-                    OPERATION_CATEGORIES["completare_activitati"])
-        if 'radier' in text_lower or 'elimina' in text_lower or 'renunț' in text_lower or 'renunt' in text_lower:
-            return ("radiere_activitati",
-                    OPERATION_NAMES["radiere_activitati"],
-                    OPERATION_CATEGORIES["radiere_activitati"])
-    
+    ("actualizare_caen", (("caen",), (" rev", "actuali", "recodific", "declar"))),
+
+    # 24. COMPLETARE / RADIERE ACTIVITĂȚI
+    ("completare_activitati", (
+        ("activit",), ("completar", "adăugar", "adaug", "extind"))),
+    ("radiere_activitati", (
+        ("activit",), ("radier", "elimina", "renunț", "renunt"))),
+
     # 25. OBIECT DE ACTIVITATE (generic)
-    if 'obiect' in text_lower and 'activitate' in text_lower:
-        return ("modificare_obiect_activitate",
-                OPERATION_NAMES["modificare_obiect_activitate"],
-                OPERATION_CATEGORIES["modificare_obiect_activitate"])
-    
+    ("modificare_obiect_activitate", (("obiect",), ("activitate",))),
+
     # 26. ACTUALIZARE DATE
-    if 'actuali' in text_lower and ('date' in text_lower or 'identificare' in text_lower or 'c.i.' in text_lower):
-        return ("actualizare_date",
-                OPERATION_NAMES["actualizare_date"],
-                OPERATION_CATEGORIES["actualizare_date"])
-    
+    ("actualizare_date", (("actuali",), (" date", "identificare", "c.i."))),
+
     # 27. DURATĂ SOCIETATE
-    if 'durată' in text_lower or 'durata' in text_lower:
-        if 'nedeterminat' in text_lower or 'modificar' in text_lower:
-            return ("modificare_durata",
-                    OPERATION_NAMES["modificare_durata"],
-                    OPERATION_CATEGORIES["modificare_durata"])
-    
+    ("modificare_durata", (("durată", "durata"), ("nedeterminat", "modificar"))),
+
     # 28. SCHIMBARE DENUMIRE
-    if 'denumir' in text_lower and ('schimbar' in text_lower or 'noua' in text_lower):
-        return ("schimbare_denumire",
-                OPERATION_NAMES["schimbare_denumire"],
-                OPERATION_CATEGORIES["schimbare_denumire"])
-    
-    # 29. FALLBACK: Hotărâre AGA / Decizie asociat (când nu se detectează altceva specific)
-    if 'adunării generale' in text_lower or 'adunarea generală' in text_lower or 'a.g.a' in text_lower:
-        return ("hotarare_aga", "Hotărâre AGA", "Alte operațiuni")
-    
-    if 'decizie' in text_lower or 'hotărâre' in text_lower or 'hotarare' in text_lower:
-        if 'asociat' in text_lower:
-            return ("decizie_asociat", "Decizie asociat", "Alte operațiuni")
-        return ("hotarare_aga", "Hotărâre AGA", "Alte operațiuni")
-    
+    ("schimbare_denumire", (("denumir",), ("schimbar", "noua"))),
+
+    # 29. FALLBACK: Hotărâre AGA / Decizie asociat
+    ("hotarare_aga", (("adunării generale", "adunarea generală", "a.g.a"),)),
+    ("decizie_asociat", (("decizie", "hotărâre", "hotarare"), ("asociat",))),
+    ("hotarare_aga", (("decizie", "hotărâre", "hotarare"),)),
+]
+
+
+class CompiledRules:
+    """
+    Regulile de detecție compilate peste un singur automat Aho-Corasick.
+
+    Textul actului este parcurs o singură dată și rezultă un bitset cu
+    cuvintele-cheie găsite; regulile sunt apoi evaluate ca măști pe biți,
+    fără alte căutări în text.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        keywords: List[str] = []
+        for _, clauses in rules:
+            for clause in clauses:
+                for kw in clause:
+                    if kw not in keywords:
+                        keywords.append(kw)
+        self.keywords = keywords
+        self.bit = {kw: 1 << i for i, kw in enumerate(keywords)}
+        self.rule_masks = [
+            (op_id, tuple(sum(self.bit[kw] for kw in clause) for clause in clauses))
+            for op_id, clauses in rules
+        ]
+        self.rule_op_masks = [
+            (OPERATION_BITS[op_id], op_id, masks) for op_id, masks in self.rule_masks
+        ]
+        self.subsumed = [
+            (OPERATION_BITS[op_id], sum(OPERATION_BITS[hidden] for hidden in hidden_ops))
+            for op_id, hidden_ops in SUBSUMED_OPERATIONS.items()
+        ]
+        self.fallback_mask = sum(OPERATION_BITS[op_id] for op_id in FALLBACK_OPERATIONS)
+
+        self.automaton = None
+        if ahocorasick is not None:
+            # Cuvântul fără spațiu -> (bitul lui, bitul variantei de la început de cuvânt, lungimea)
+            words: Dict[str, List[int]] = {}
+            for kw in keywords:
+                entry = words.setdefault(kw.lstrip(' '), [0, 0, len(kw.lstrip(' '))])
+                entry[1 if kw[0] == ' ' else 0] |= self.bit[kw]
+            self.automaton = ahocorasick.Automaton()
+            for word, entry in words.items():
+                self.automaton.add_word(word, tuple(entry))
+            self.automaton.make_automaton()
+
+    def scan(self, text_lower: str) -> int:
+        """Returnează bitset-ul cuvintelor-cheie prezente în text."""
+        found = 0
+        if self.automaton is not None:
+            for end, (bit, word_start_bit, length) in self.automaton.iter(text_lower):
+                found |= bit
+                if word_start_bit and _at_word_start(text_lower, end - length + 1):
+                    found |= word_start_bit
+        else:
+            for kw in self.keywords:
+                if keyword_in(kw, text_lower):
+                    found |= self.bit[kw]
+        return found
+
+    def first_match(self, found: int) -> Optional[str]:
+        """Prima regulă (în ordine) îndeplinită de bitset-ul `found`."""
+        for op_id, masks in self.rule_masks:
+            for mask in masks:
+                if not found & mask:
+                    break
+            else:
+                return op_id
+        return None
+
+    def all_matches(self, found: int) -> Tuple[int, Optional[str]]:
+        """
+        Toate regulile îndeplinite de `found`: masca operațiunilor (fără cele
+        ascunse de SUBSUMED_OPERATIONS și FALLBACK_OPERATIONS) și prima
+        operațiune, aceeași ca first_match.
+        """
+        ops = 0
+        primary = None
+        for op_bit, op_id, masks in self.rule_op_masks:
+            if ops & op_bit:
+                continue
+            for mask in masks:
+                if not found & mask:
+                    break
+            else:
+                ops |= op_bit
+                if primary is None:
+                    primary = op_id
+        for op_bit, hidden in self.subsumed:
+            if ops & op_bit:
+                ops &= ~hidden
+        if ops & ~self.fallback_mask:
+            ops &= ~self.fallback_mask
+        elif primary is not None:
+            ops = OPERATION_BITS[primary]
+        return ops, primary
+
+
+COMPILED_RULES = CompiledRules(DETECTION_RULES)
+
+# Profilare opt-in (vezi rule_profiler.py): obiect cu metoda
+# record(rules, found, scan_ns), apelată pentru fiecare text detectat
+PROFILER = None
+
+
+def _scan(text: str) -> int:
+    """Bitset-ul cuvintelor-cheie din text, raportat profilerului dacă e activ."""
+    if PROFILER is None:
+        return COMPILED_RULES.scan(text.lower())
+    start = perf_counter_ns()
+    found = COMPILED_RULES.scan(text.lower())
+    PROFILER.record(COMPILED_RULES, found, perf_counter_ns() - start)
+    return found
+
+
+def detect_operation(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Detectează operațiunea din text: o singură trecere prin automatul de
+    cuvinte-cheie, apoi prima regulă îndeplinită din DETECTION_RULES.
+    Returnează (op_id, op_name, category) sau (None, None, None)
+    """
+    op_id = COMPILED_RULES.first_match(_scan(text))
+    if op_id is None:
+        return (None, None, None)
+    return (op_id, OPERATION_NAMES[op_id], OPERATION_CATEGORIES[op_id])
+
+
+def detect_operations(text: str) -> Tuple[int, Optional[str], Optional[str], Optional[str]]:
+    """
+    Toate operațiunile din text, evaluate în aceeași trecere prin automat.
+    Returnează (masca OPERATION_BITS, op_id, op_name, category), unde op_id
+    este operațiunea principală, cea returnată de detect_operation.
+    """
+    ops, op_id = COMPILED_RULES.all_matches(_scan(text))
+    if op_id is None:
+        return (0, None, None, None)
+    return (ops, op_id, OPERATION_NAMES[op_id], OPERATION_CATEGORIES[op_id])
+
+
+def operations_from_mask(ops: int) -> List[str]:
+    """Operațiunile din mască, în ordinea PATTERN_CHECK_ORDER."""
+    return [op_id for op_id, bit in OPERATION_BITS.items() if ops & bit]
+
+
+def detect_operation_reference(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Evaluare directă a acelorași reguli, cu câte o căutare `in` pe text pentru
+    fiecare cuvânt-cheie. Folosită ca referință la verificări și benchmark.
+    """
+    text_lower = text.lower()
+    for op_id, clauses in DETECTION_RULES:
+        if all(any(keyword_in(kw, text_lower) for kw in clause) for clause in clauses):
+            return (op_id, OPERATION_NAMES[op_id], OPERATION_CATEGORIES[op_id])
     return (None, None, None)
 
 
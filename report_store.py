@@ -0,0 +1,113 @@
+"""
+Rapoartele incrementale
+Monitoarele unei zile apar pe rând (de exemplu nr. 129-132 din 15.01.2026).
+Fiecare raport are un director în REPORTS_DIR cu partea fiecărui monitor
+(MonitorReport, câte un fișier JSON <an>-<nr>.json): adăugarea unui monitor scrie doar
+fișierul lui, iar raportul e compus din fragmentele salvate, fără reparsarea
+monitoarelor anterioare. Starea e pe disc, deci e comună tuturor workerilor.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from mo_parser_v4 import MonitorReport, ReportState
+
+# Directorul rapoartelor incrementale, comun tuturor workerilor
+REPORTS_DIR = os.environ.get('REPORTS_DIR', os.path.join(tempfile.gettempdir(), 'mo-iv-reports'))
+# După câte secunde fără monitoare noi e șters un raport
+REPORT_TTL = int(os.environ.get('REPORT_TTL', '172800'))
+
+_REPORT_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+_MONITOR_FILE = re.compile(r'^(\d+)-(\d+)\.json$')
+
+
+class ReportStore:
+    """Rapoartele din `directory`, fiecare într-un subdirector numit după id (ales de client)."""
+
+    def __init__(self, directory: str, ttl: int):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, report_id: str, name: str = '') -> Optional[str]:
+        if not _REPORT_ID.match(report_id):
+            return None
+        return os.path.join(self.directory, report_id, name)
+
+    def valid_id(self, report_id: str) -> bool:
+        return self._path(report_id) is not None
+
+    def add(self, report_id: str, report: MonitorReport) -> None:
+        """Salvează (sau înlocuiește) partea unui monitor; celelalte fișiere nu sunt citite."""
+        report_dir = self._path(report_id)
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f'{report.an}-{report.nr_monitor}.json')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        # Vârsta raportului, pentru expire()
+        os.utime(report_dir)
+
+    def _keys(self, report_id: str) -> List[Tuple[int, int]]:
+        """(an, nr_monitor) pentru monitoarele raportului, cronologic (listă goală dacă nu există)."""
+        report_dir = self._path(report_id)
+        if report_dir is None or not os.path.isdir(report_dir):
+            return []
+        return sorted((int(match.group(1)), int(match.group(2)))
+                      for match in map(_MONITOR_FILE.match, os.listdir(report_dir)) if match)
+
+    def monitors(self, report_id: str) -> List[int]:
+        """Numerele monitoarelor raportului, cronologic (listă goală dacă nu există)."""
+        return [nr_monitor for _, nr_monitor in self._keys(report_id)]
+
+    def load(self, report_id: str) -> Optional[ReportState]:
+        """
+        Starea raportului, cu monitoarele cronologic, sau None dacă nu există.
+        ValueError dacă vreun monitor a fost salvat în alt format.
+        """
+        keys = self._keys(report_id)
+        if not keys:
+            return None
+        parts = []
+        for year, nr_monitor in keys:
+            try:
+                with open(self._path(report_id, f'{year}-{nr_monitor}.json'), 'r', encoding='utf-8') as f:
+                    parts.append(MonitorReport.from_dict(json.load(f)))
+            except FileNotFoundError:
+                # Raport șters între timp
+                continue
+        return ReportState(parts) if parts else None
+
+    def delete(self, report_id: str) -> bool:
+        report_dir = self._path(report_id)
+        if report_dir is None or not os.path.isdir(report_dir):
+            return False
+        shutil.rmtree(report_dir, ignore_errors=True)
+        return True
+
+    def expire(self) -> int:
+        """Șterge rapoartele în care nu a fost adăugat niciun monitor de mai mult de `ttl` secunde."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for report_id in os.listdir(self.directory):
+            report_dir = self._path(report_id)
+            if report_dir is None:
+                continue
+            try:
+                expired = os.path.getmtime(report_dir) < cutoff
+            except OSError:
+                continue
+            if expired:
+                shutil.rmtree(report_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+REPORTS = ReportStore(REPORTS_DIR, REPORT_TTL)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Profilarea regulilor de detecție din patterns_relaxed
+Pe un corpus de monitoare (fișiere HTML sau monitoare sintetice) măsoară, pentru
+fiecare regulă din DETECTION_RULES: de câte ori e evaluată și de câte ori câștigă,
+câte clauze verifică și cât timp consumă, la ce adâncime se oprește căutarea și
+ce proporție din acte rămân "nedeterminat". Propune apoi ordinea regulilor cu
+cel mai mic cost așteptat pe corpus dintre ordinile care dau aceeași operațiune
+principală pe orice text (constrângerile sunt deduse din clauzele regulilor,
+vezi precedence; corpusul decide doar costul).
+
+Costul e cel al evaluării în ordine (detect_operation / first_match); parserul
+evaluează oricum toate regulile pentru operațiunile secundare, iar acolo ordinea
+decide doar operațiunea principală.
+
+Utilizare:
+    python rule_profiler.py [monitor.html ...] [--synthetic N] [--json profil.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import patterns_relaxed
+from patterns_relaxed import COMPILED_RULES, CompiledRules
+
+
+class RuleProfile:
+    """
+    Ce colectează patterns_relaxed.PROFILER: bitset-urile de cuvinte-cheie ale
+    actelor (din ele se recalculează orice statistică pentru orice ordine a
+    regulilor) și timpul măsurat al scanării și al fiecărei reguli.
+    """
+
+    def __init__(self, rule_count: int):
+        self.acts = 0
+        self.scan_ns = 0
+        self.time_ns = [0] * rule_count
+        self.found: Counter = Counter()
+
+    def record(self, rules: CompiledRules, found: int, scan_ns: int) -> None:
+        self.acts += 1
+        self.scan_ns += scan_ns
+        self.found[found] += 1
+        for index, (_, masks) in enumerate(rules.rule_masks):
+            start = perf_counter_ns()
+            for mask in masks:
+                if not found & mask:
+                    matched = False
+                    break
+            else:
+                matched = True
+            self.time_ns[index] += perf_counter_ns() - start
+            if matched:
+                break
+
+
+def start_profiling() -> RuleProfile:
+    """Activează profilarea detectorului pentru procesul curent."""
+    profile = RuleProfile(len(COMPILED_RULES.rule_masks))
+    patterns_relaxed.PROFILER = profile
+    return profile
+
+
+def stop_profiling() -> None:
+    patterns_relaxed.PROFILER = None
+
+
+def evaluate(masks: Tuple[int, ...], found: int) -> Tuple[bool, int]:
+    """(regula e îndeplinită, câte clauze au fost verificate)."""
+    for checked, mask in enumerate(masks, 1):
+        if not found & mask:
+            return False, checked
+    return True, len(masks)
+
+
+def simulate(rules: CompiledRules, order: Sequence[int], found: Counter) -> dict:
+    """
+    Evaluarea în ordinea `order` (indici în DETECTION_RULES) peste corpus:
+    evaluări, câștiguri și clauze verificate per regulă, adâncimea opririi
+    și operațiunea rezultată pentru fiecare bitset.
+    """
+    count = len(rules.rule_masks)
+    stats = {
+        'evaluations': [0] * count,
+        'hits': [0] * count,
+        'checks': [0] * count,
+        'depth': Counter(),
+        'results': {},
+    }
+    for bits, acts in found.items():
+        winner = None
+        depth = 0
+        for depth, index in enumerate(order, 1):
+            matched, checks = evaluate(rules.rule_masks[index][1], bits)
+            stats['evaluations'][index] += acts
+            stats['checks'][index] += checks * acts
+            if matched:
+                winner = index
+                stats['hits'][index] += acts
+                break
+        stats['depth'][depth] += acts
+        stats['results'][bits] = rules.rule_masks[winner][0] if winner is not None else None
+    stats['cost'] = sum(stats['checks'])
+    return stats
+
+
+def _implies(kw: str, other: str) -> bool:
+    """Orice text care conține cuvântul-cheie `kw` îl conține și pe `other`."""
+    word, other_word = kw.lstrip(' '), other.lstrip(' ')
+    if other[0] != ' ':
+        return other_word in word
+    # `other` cere început de cuvânt: e garantat doar dacă și `kw` îl cere și începe la fel
+    return kw[0] == ' ' and word.startswith(other_word)
+
+
+def _covers(clauses: Sequence[Tuple[str, ...]], required: Sequence[Tuple[str, ...]]) -> bool:
+    """Orice text care îndeplinește toate clauzele `required` le îndeplinește și pe `clauses`."""
+    return all(
+        any(all(any(_implies(kw, other) for other in clause) for kw in given) for given in required)
+        for clause in clauses
+    )
+
+
+def precedence(rules: CompiledRules) -> Set[Tuple[int, int]]:
+    """
+    Perechile (a, b), a înaintea lui b în DETECTION_RULES, care trebuie să rămână
+    în această ordine: au operațiuni diferite și există texte pe care sunt
+    îndeplinite amândouă. Regulile sunt conjuncții de clauze fără negații, deci
+    orice două reguli pot fi îndeplinite împreună; perechea e liberă doar dacă
+    o regulă de dinaintea lui a e îndeplinită pe orice text care le îndeplinește
+    pe a și pe b (atunci niciuna dintre ele nu câștigă pe acele texte).
+    Constrângerile sunt deduse din clauze, nu din corpus, deci ordinea propusă
+    dă aceeași operațiune principală pe orice text.
+    """
+    clauses = [tuple(clause) for _, clause in rules.rules]
+    edges = set()
+    for b, (op_b, _) in enumerate(rules.rules):
+        for a in range(b):
+            if rules.rules[a][0] == op_b:
+                continue
+            both = clauses[a] + clauses[b]
+            if not any(_covers(clauses[c], both) for c in range(a)):
+                edges.add((a, b))
+    return edges
+
+
+def suggest_order(rules: CompiledRules, found: Counter) -> List[int]:
+    """
+    Ordinea propusă: dintre regulile ale căror predecesoare (vezi precedence)
+    sunt deja așezate, următoarea e cea cu cele mai multe acte rezolvate pe
+    clauză verificată; la egalitate rămâne ordinea actuală.
+    """
+    count = len(rules.rule_masks)
+    current = simulate(rules, range(count), found)
+    edges = precedence(rules)
+    before: Dict[int, Set[int]] = {index: set() for index in range(count)}
+    for a, b in edges:
+        before[b].add(a)
+
+    def priority(index: int) -> Tuple[float, int]:
+        evaluations = current['evaluations'][index]
+        checks = current['checks'][index] / evaluations if evaluations else len(rules.rule_masks[index][1])
+        return (-current['hits'][index] / checks, index)
+
+    order: List[int] = []
+    placed: Set[int] = set()
+    while len(order) < count:
+        ready = [index for index in range(count) if index not in placed and before[index] <= placed]
+        best = min(ready, key=priority)
+        order.append(best)
+        placed.add(best)
+    return order
+
+
+def profile_report(profile: RuleProfile, rules: CompiledRules = COMPILED_RULES) -> dict:
+    """Statisticile ordinii actuale și ale celei propuse (costul e măsurat pe corpus)."""
+    count = len(rules.rule_masks)
+    current = simulate(rules, range(count), profile.found)
+    order = suggest_order(rules, profile.found)
+    suggested = simulate(rules, order, profile.found)
+    if suggested['cost'] >= current['cost']:
+        order, suggested = list(range(count)), current
+    acts = max(profile.acts, 1)
+    undetermined = sum(n for bits, n in profile.found.items() if current['results'][bits] is None)
+    return {
+        'acts': profile.acts,
+        'distinct_bitsets': len(profile.found),
+        'undetermined': undetermined,
+        'undetermined_share': undetermined / acts,
+        'mean_depth': sum(depth * n for depth, n in current['depth'].items()) / acts,
+        'scan_ns_per_act': profile.scan_ns / acts,
+        'rules_ns_per_act': sum(profile.time_ns) / acts,
+        'rules': [
+            {
+                'index': index,
+                'op_id': rules.rule_masks[index][0],
+                'evaluations': current['evaluations'][index],
+                'hits': current['hits'][index],
+                'checks': current['checks'][index],
+                'time_ns': profile.time_ns[index],
+            }
+            for index in range(count)
+        ],
+        'checks_per_act': current['cost'] / acts,
+        'suggested_order': order,
+        'suggested_checks_per_act': suggested['cost'] / acts,
+        'suggested_same_results': suggested['results'] == current['results'],
+    }
+
+
+def print_report(report: dict) -> None:
+    acts = max(report['acts'], 1)
+    print(f"{'#':>3} {'operațiune':<38} {'evaluări':>9} {'câștiguri':>10} {'%':>6} {'clauze/ev':>9} {'ns/ev':>7} {'timp %':>7}")
+    total_ns = sum(rule['time_ns'] for rule in report['rules']) or 1
+    for rule in report['rules']:
+        evaluations = rule['evaluations'] or 1
+        print(f"{rule['index']:>3} {rule['op_id']:<38} {rule['evaluations']:>9,} {rule['hits']:>10,} "
+              f"{100 * rule['hits'] / acts:>5.1f}% {rule['checks'] / evaluations:>9.2f} "
+              f"{rule['time_ns'] / evaluations:>7.0f} {100 * rule['time_ns'] / total_ns:>6.1f}%")
+    print()
+    print(f"Acte: {report['acts']:,} ({report['distinct_bitsets']:,} combinații distincte de cuvinte-cheie)")
+    print(f"Nedeterminat: {report['undetermined']:,} ({100 * report['undetermined_share']:.1f}%)")
+    print(f"Adâncime medie: {report['mean_depth']:.2f} reguli evaluate / act")
+    print(f"Timp per act: scanare {report['scan_ns_per_act']:,.0f} ns, reguli {report['rules_ns_per_act']:,.0f} ns")
+    print(f"Cost: {report['checks_per_act']:.2f} clauze verificate / act în ordinea actuală, "
+          f"{report['suggested_checks_per_act']:.2f} în ordinea propusă")
+    if report['suggested_order'] == sorted(report['suggested_order']):
+        print("Nicio ordine care păstrează operațiunea pe orice text nu e mai ieftină pe acest corpus.")
+        return
+    same = 'da' if report['suggested_same_results'] else 'NU'
+    print(f"Ordinea propusă pentru DETECTION_RULES (aceleași operațiuni pe orice text; verificat pe corpus: {same}):")
+    rules = report['rules']
+    for position, index in enumerate(report['suggested_order'], 1):
+        print(f"  {position:>2}. [{index:>2}] {rules[index]['op_id']}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Profilarea regulilor din patterns_relaxed")
+    parser.add_argument('monitors', nargs='*', help='monitoare HTML pentru corpus')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='adaugă un monitor sintetic cu atâtea acte (implicit 5000 fără fișiere)')
+    parser.add_argument('--json', help='salvează raportul în acest fișier')
+    args = parser.parse_args(argv)
+
+    from mo_parser_v4 import iter_acts
+    from upload_spool import close_upload, map_file
+
+    synthetic = args.synthetic or (0 if args.monitors else 5000)
+    profile = start_profiling()
+    try:
+        for nr, path in enumerate(args.monitors, 1):
+            content = map_file(path)
+            try:
+                for _ in iter_acts(content, nr):
+                    pass
+            finally:
+                close_upload(content)
+        if synthetic:
+            from mo_generator import generate_monitor
+            for _ in iter_acts(generate_monitor(synthetic, seed=synthetic), 0):
+                pass
+    finally:
+        stop_profiling()
+
+    report = profile_report(profile)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"[INFO] Raport salvat: {os.path.abspath(args.json)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
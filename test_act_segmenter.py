@@ -0,0 +1,80 @@
+"""
+Teste pentru act_segmenter
+Pe monitoare bine formate antetele găsite de HeaderScanner sunt cele ale
+expresiei regulate vechi (COMPANY_PATTERN); pe HTML malformat
+(mo_generator.PATHOLOGICAL_HTML) timpul segmentării și al parsării crește
+liniar cu mărimea documentului.
+
+Rulare:
+    python -m unittest test_act_segmenter
+"""
+
+import io
+import re
+import time
+import unittest
+
+from act_segmenter import HeaderScanner
+from mo_generator import PATHOLOGICAL_HTML, generate_monitor
+from mo_parser_v4 import COMPANY_PATTERN, parse_monitor
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Mărimile comparate: la timp liniar raportul timpilor e ~4, la timp pătratic ~16
+_SMALL = 128 * 1024
+_LARGE = 4 * _SMALL
+_MAX_RATIO = 8
+
+
+def _best_time(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class HeaderAgreementTest(unittest.TestCase):
+    def test_matches_company_pattern_on_well_formed_monitors(self):
+        for seed in range(5):
+            html = generate_monitor(500, seed=seed)
+            with self.subTest(seed=seed):
+                reference = [(m.start(), m.end(), _WHITESPACE.sub(' ', m.group(1).strip()))
+                             for m in COMPANY_PATTERN.finditer(html)]
+                found = [(start, end, _WHITESPACE.sub(' ', name.strip()))
+                         for start, end, name in HeaderScanner().scan(html, final=True)]
+                self.assertTrue(reference)
+                self.assertEqual(found, reference)
+
+    def test_stream_matches_buffer(self):
+        # Parsarea în flux scanează pe bucăți (HeaderScanner.shift); actele sunt aceleași
+        data = generate_monitor(300, seed=1).encode('utf-8')
+        expected = [act.to_dict() for act in parse_monitor(data, 129)]
+        self.assertEqual([act.to_dict() for act in parse_monitor(io.BytesIO(data), 129)], expected)
+
+
+class PathologicalInputTest(unittest.TestCase):
+    """Timpul pentru o intrare de _LARGE caractere față de una de _SMALL, pentru fiecare caz."""
+
+    def assertLinear(self, func, make):
+        small, large = make(_SMALL), make(_LARGE)
+        ratio = _best_time(lambda: func(large)) / max(_best_time(lambda: func(small)), 1e-6)
+        self.assertLess(ratio, _MAX_RATIO, f'timpul crește de {ratio:.1f} ori pentru o intrare de 4 ori mai mare')
+
+    def test_all_cases_present(self):
+        self.assertEqual(len(PATHOLOGICAL_HTML), 7)
+
+    def test_segmentation_is_linear(self):
+        for case, make in PATHOLOGICAL_HTML.items():
+            with self.subTest(case=case):
+                self.assertLinear(lambda html: sum(1 for _ in HeaderScanner().scan(html, final=True)), make)
+
+    def test_parsing_is_linear(self):
+        for case, make in PATHOLOGICAL_HTML.items():
+            with self.subTest(case=case):
+                self.assertLinear(lambda html: parse_monitor(html, 1), make)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Bugetul de timp al cererii curente
+Analiza verifică bugetul între acte și între monitoare (check_budget) și se
+oprește cu BudgetExceeded când termenul a trecut, înainte ca gunicorn să
+omoare workerul. Termenul e un moment pe ceasul monoton al sistemului, deci
+poate fi transmis și proceselor din pool-ul de parsare.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class BudgetExceeded(Exception):
+    """Bugetul de timp al cererii s-a terminat."""
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+
+@contextmanager
+def deadline_at(deadline: Optional[float]) -> Iterator[Optional[float]]:
+    """Analiza din bloc se oprește la `deadline` (time.monotonic()); None = fără limită."""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def time_budget(seconds: float):
+    """Ca deadline_at, cu termenul peste `seconds` secunde (0 sau negativ = fără limită)."""
+    return deadline_at(time.monotonic() + seconds if seconds > 0 else None)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def budget_left() -> Optional[float]:
+    """Secundele rămase (cel puțin 0), sau None fără buget."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+
+def check_budget() -> None:
+    """Ridică BudgetExceeded dacă termenul cererii curente a trecut; fără buget nu face nimic."""
+    deadline = _deadline.get()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise BudgetExceeded('Bugetul de timp al cererii a fost depășit')
@@ -0,0 +1,72 @@
+"""
+Uploaduri cu memorie limitată
+Fișierele mai mari de UPLOAD_SPOOL_KB sunt copiate pe disc în blocuri și
+mapate în memorie (mmap). Parserul segmentează direct peste buffer-ul mapat
+și decodează doar actul curent, deci memoria workerului nu mai crește cu
+mărimea fișierului; paginile mapate sunt citite din page cache la nevoie.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+from typing import IO, Union
+
+# Pragul (KB) peste care uploadurile sunt scrise pe disc și mapate
+UPLOAD_SPOOL_KB = int(os.environ.get('UPLOAD_SPOOL_KB', '1024'))
+
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+class MappedFile(mmap.mmap):
+    """
+    Fișier mapat read-only. `path` permite proceselor din pool să-l mapeze
+    și ele, în loc să primească tot conținutul serializat.
+    """
+    path = ''
+    temporary = False
+
+
+def map_file(path: str) -> Union[bytes, MappedFile]:
+    """Conținutul fișierului, mapat (fișierele goale nu pot fi mapate)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        mapped = MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+    mapped.path = path
+    return mapped
+
+
+def spool_upload(stream: IO[bytes], threshold: int = UPLOAD_SPOOL_KB * 1024) -> Union[bytes, MappedFile]:
+    """
+    Conținutul unui upload: bytes dacă încape sub prag, altfel un fișier
+    temporar mapat, șters de close_upload.
+    """
+    head = stream.read(threshold + 1)
+    if len(head) <= threshold:
+        return head
+    fd, path = tempfile.mkstemp(prefix='mo-iv-upload-', suffix='.html')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(head)
+            del head
+            shutil.copyfileobj(stream, f, SPOOL_CHUNK_SIZE)
+        mapped = map_file(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    if isinstance(mapped, MappedFile):
+        mapped.temporary = True
+    return mapped
+
+
+def close_upload(content: Union[bytes, MappedFile]) -> None:
+    """Închide maparea; fișierele temporare create de spool_upload sunt șterse."""
+    if not isinstance(content, MappedFile) or content.closed:
+        return
+    content.close()
+    if content.temporary:
+        try:
+            os.unlink(content.path)
+        except OSError:
+            pass